@@ -7,6 +7,7 @@ from typing import Literal, Optional, Union
 import numpy as np
 import xarray as xr
 from pydantic import Field, field_validator
+from scipy.spatial import cKDTree
 
 from rompy.core.data import DataGrid
 from rompy.core.grid import RegularGrid
@@ -16,13 +17,15 @@ from rompy.utils import load_entry_points
 logger = logging.getLogger(__name__)
 
 
-def find_minimum_distance(points: list[tuple[float, float]]) -> float:
+def find_minimum_distance(
+    points: Union[list[tuple[float, float]], np.ndarray],
+) -> float:
     """Find the minimum distance between a set of points.
 
     Parameters
     ----------
-    points: list[tuple[float, float]]
-        List of points as (x, y) tuples.
+    points: list[tuple[float, float]] | np.ndarray
+        List of points as (x, y) tuples or array of shape (npoints, 2).
 
     Returns
     -------
@@ -30,48 +33,13 @@ def find_minimum_distance(points: list[tuple[float, float]]) -> float:
         Minimum distance between all points.
 
     """
-
-    def calculate_distance(x1, y1, x2, y2):
-        return np.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
-
-    n = len(points)
-    if n <= 1:
+    if not isinstance(points, np.ndarray):
+        points = np.array(points, dtype="float64").reshape(-1, 2)
+    if points.shape[0] <= 1:
         return float("inf")
-
-    # Sort points by x-coordinate
-    points.sort()
-
-    # Recursive step
-    if n == 2:
-        return calculate_distance(*points[0], *points[1])
-
-    mid = n // 2
-    left_points = points[:mid]
-    right_points = points[mid:]
-
-    # Divide and conquer
-    left_min = find_minimum_distance(left_points)
-    right_min = find_minimum_distance(right_points)
-
-    min_distance = min(left_min, right_min)
-
-    # Find the closest pair across the dividing line
-    strip = []
-    for point in points:
-        if abs(point[0] - points[mid][0]) < min_distance:
-            strip.append(point)
-
-    strip_min = min_distance
-    strip_len = len(strip)
-    for i in range(strip_len - 1):
-        j = i + 1
-        while j < strip_len and (strip[j][1] - strip[i][1]) < strip_min:
-            distance = calculate_distance(*strip[i], *strip[j])
-            if distance < strip_min:
-                strip_min = distance
-            j += 1
-
-    return min(min_distance, strip_min)
+    # The nearest neighbour of each point other than itself
+    distances, _ = cKDTree(points).query(points, k=2)
+    return float(distances[:, 1].min())
 
 
 class DataBoundary(DataGrid):
@@ -259,7 +227,7 @@ class BoundaryWaveStation(DataBoundary):
         x0, y0, x1, y1 = grid.bbox(buffer=buffer)
         ds = self.ds.spec.sel([x0, x1], [y0, y1], method="bbox")
         # Return the closest distance between adjacent points in cropped dataset
-        points = list(zip(ds.lon.values, ds.lat.values))
+        points = np.column_stack([ds.lon.values, ds.lat.values])
         return find_minimum_distance(points)
 
     def _set_spacing(self, grid) -> float:
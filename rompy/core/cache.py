@@ -0,0 +1,282 @@
+"""
+Caches for model inputs.
+
+Derived files such as constant-valued gr3 files only depend on the content of the
+source files they are generated from and on the parameters of their generator. The
+:class:`FileCache` stores them under a key built from those inputs so they can be
+linked or copied into a staging directory instead of being generated again.
+
+The :class:`DatasetCache` keeps source datasets open in memory so data objects
+opening the same source several times during a run share one handle.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+import numpy as np
+
+from rompy.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Hashes of files already read keyed on (path, size, mtime)
+_FILE_HASHES: dict[tuple, str] = {}
+
+
+def file_hash(path: Union[str, Path], blocksize: int = 1 << 20) -> str:
+    """Return the sha256 digest of the content of a file.
+
+    The digest is memoised on the resolved path, size and modification time so
+    repeated calls for an unchanged file don't read it again.
+
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    token = (str(path), stat.st_size, stat.st_mtime_ns)
+    if token not in _FILE_HASHES:
+        hasher = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(blocksize), b""):
+                hasher.update(block)
+        _FILE_HASHES[token] = hasher.hexdigest()
+    return _FILE_HASHES[token]
+
+
+def array_hash(*arrays) -> str:
+    """Return the sha256 digest of the shapes and float values of arrays."""
+    hasher = hashlib.sha256()
+    for array in arrays:
+        array = np.ascontiguousarray(array, dtype=float)
+        hasher.update(str(array.shape).encode())
+        hasher.update(array.tobytes())
+    return hasher.hexdigest()
+
+
+def cache_key(*parts) -> str:
+    """Return a deterministic key from json serialisable parts."""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class FileCache:
+    """Directory of cached files with a size cap and least recently used eviction.
+
+    Parameters
+    ----------
+    cache_dir : str | Path
+        Directory where cached files are stored, created if it doesn't exist.
+    max_size : float, optional
+        Maximum total size of the cached files in bytes, the least recently used
+        files are evicted when a new file takes the cache above this size.
+    link : bool
+        Hard-link cached files into the destination instead of copying them. Falls
+        back to copying if the destination is on a different filesystem.
+
+    """
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path],
+        max_size: Optional[float] = None,
+        link: bool = True,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_size = max_size
+        self.link = link
+
+    def path(self, key: str, name: str) -> Path:
+        """Path of the cached file for a key."""
+        return self.cache_dir / f"{key}-{name}"
+
+    def _place(self, src: Path, dest: Path):
+        """Link or copy src to dest replacing any existing file."""
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if dest.is_symlink() or dest.exists():
+            dest.unlink()
+        if self.link:
+            try:
+                os.link(src, dest)
+                return
+            except OSError:
+                pass
+        shutil.copyfile(src, dest)
+
+    def fetch(self, key: str, dest: Union[str, Path]) -> Optional[Path]:
+        """Place the cached file for a key at dest.
+
+        Parameters
+        ----------
+        key : str
+            Cache key of the file.
+        dest : str | Path
+            Destination path of the file.
+
+        Returns
+        -------
+        Path | None
+            The destination path on a cache hit, None on a miss.
+
+        """
+        dest = Path(dest)
+        cached = self.path(key, dest.name)
+        if not cached.is_file():
+            logger.debug(f"Cache miss for {dest.name} ({key[:12]})")
+            return None
+        logger.info(f"Cache hit for {dest.name} ({key[:12]})")
+        self._place(cached, dest)
+        # Update the modification time used to rank entries for eviction
+        os.utime(cached)
+        return dest
+
+    def store(self, key: str, src: Union[str, Path]) -> Path:
+        """Copy a generated file into the cache.
+
+        The file is copied rather than linked so changes made to it after it has
+        been stored don't alter the cached version.
+
+        """
+        src = Path(src)
+        cached = self.path(key, src.name)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = cached.with_name(f".{cached.name}.{uuid.uuid4().hex}")
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, cached)
+        logger.debug(f"Stored {src.name} in cache ({key[:12]})")
+        self.evict()
+        return cached
+
+    def evict(self):
+        """Remove the least recently used files until the cache fits max_size."""
+        if self.max_size is None or not self.cache_dir.is_dir():
+            return
+        entries = []
+        for path in self.cache_dir.iterdir():
+            if path.is_file() and not path.name.startswith("."):
+                stat = path.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            logger.debug(f"Evicting {path.name} from cache")
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self):
+        """Remove all cached files."""
+        if self.cache_dir.is_dir():
+            for path in self.cache_dir.iterdir():
+                if path.is_file():
+                    path.unlink()
+
+
+class DatasetCache:
+    """In-memory cache of open datasets with least recently used eviction.
+
+    Each entry holds the dataset handle returned by an opener together with views
+    built from it, such as the dataset after selecting variables and applying
+    filters. Views are evicted with their handle, which is closed on eviction.
+
+    Parameters
+    ----------
+    max_open : int
+        Maximum number of dataset handles kept open, caching is disabled if 0.
+    max_views : int
+        Maximum number of views kept for each handle.
+
+    """
+
+    def __init__(self, max_open: int = 16, max_views: int = 8):
+        self.max_open = max_open
+        self.max_views = max_views
+        self._entries: OrderedDict[str, tuple[Any, OrderedDict]] = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _entry(self, key: str, opener: Callable[[], Any]) -> tuple[Any, OrderedDict]:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        # Open outside the lock so slow sources don't block other threads
+        handle = opener()
+        with self._lock:
+            if key in self._entries:
+                _close(handle)
+                return self._entries[key]
+            logger.debug(f"Opened dataset handle {key[:12]}")
+            entry = self._entries[key] = (handle, OrderedDict())
+            self.evict()
+            return entry
+
+    def get(
+        self,
+        key: str,
+        opener: Callable[[], Any],
+        view: Optional[str] = None,
+        build: Optional[Callable[[Any], Any]] = None,
+    ) -> Any:
+        """Return the cached dataset handle or one of its views.
+
+        Parameters
+        ----------
+        key : str
+            Key of the dataset handle.
+        opener : Callable
+            Function returning the dataset handle on a cache miss.
+        view : str, optional
+            Key of the view of the handle to return, the handle if None.
+        build : Callable, optional
+            Function building the view from the handle on a cache miss.
+
+        """
+        if self.max_open <= 0:
+            handle = opener()
+            return handle if view is None else build(handle)
+        handle, views = self._entry(key, opener)
+        if view is None:
+            return handle
+        with self._lock:
+            if view in views:
+                views.move_to_end(view)
+                return views[view]
+        result = build(handle)
+        with self._lock:
+            views[view] = result
+            while len(views) > self.max_views:
+                views.popitem(last=False)
+        return result
+
+    def evict(self):
+        """Close the least recently used handles until max_open are left."""
+        with self._lock:
+            while len(self._entries) > max(self.max_open, 0):
+                key, (handle, _) = self._entries.popitem(last=False)
+                logger.debug(f"Evicting dataset handle {key[:12]}")
+                _close(handle)
+
+    def clear(self):
+        """Close and remove all cached handles."""
+        with self._lock:
+            while self._entries:
+                _, (handle, _) = self._entries.popitem(last=False)
+                _close(handle)
+
+
+def _close(handle: Any):
+    """Close a dataset handle if it can be closed."""
+    close = getattr(handle, "close", None)
+    if callable(close):
+        try:
+            close()
+        except Exception as err:
+            logger.debug(f"Failed to close dataset handle: {err}")
@@ -15,6 +15,7 @@ from pydantic import Field, PrivateAttr
 
 from rompy.core.filters import Filter
 from rompy.core.grid import BaseGrid, RegularGrid
+from rompy.core.manifest import incremental
 from rompy.core.time import TimeRange
 from rompy.core.types import DatasetCoords, RompyBaseModel, Slice
 from rompy.utils import load_entry_points
@@ -34,6 +35,13 @@ class DataBase(ABC, RompyBaseModel):
         description="Unique identifier for this data source"
     )
 
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs):
+        """Record the get calls of subclasses during incremental generation."""
+        super().__pydantic_init_subclass__(**kwargs)
+        if "get" in cls.__dict__:
+            cls.get = incremental(cls.__dict__["get"])
+
     @abstractmethod
     def get(self, destdir: Union[str, Path], *args, **kwargs) -> Path:
         """Abstract method to get the data."""
@@ -0,0 +1,195 @@
+"""
+Restricted expressions for derived variables.
+
+Expressions such as ``"np.sqrt(ds.u**2 + ds.v**2)"`` are parsed once into a tree of
+arithmetic operations, NumPy ufunc calls and references to dataset variables. Any
+other Python construct is rejected so expressions from configuration files cannot
+run arbitrary code. The compiled :class:`Expression` is cached on the expression
+string and evaluated block by block with :func:`xarray.apply_ufunc`, chunk-wise and
+lazily on dask arrays, so chained operations never allocate full-size temporaries.
+"""
+
+import ast
+import operator
+from functools import lru_cache
+from typing import Callable
+
+import numpy as np
+import xarray as xr
+
+# Number of elements evaluated at once on in-memory arrays
+BLOCK_SIZE = 1 << 16
+
+BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+
+UNARY_OPERATORS = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+# Names the numpy module can be referred to with
+NUMPY_NAMES = ("np", "numpy")
+
+# Name the dataset can be referred to with, e.g. ds.u or ds["u"]
+DATASET_NAME = "ds"
+
+
+class Expression:
+    """Compiled derived variable expression.
+
+    Parameters
+    ----------
+    expr: str
+        Expression made of numbers, variables referred to as ``ds.name``,
+        ``ds["name"]`` or ``name``, the operators ``+ - * / // % **`` and calls to
+        NumPy ufuncs such as ``np.sqrt`` or ``np.arctan2``.
+
+    Raises
+    ------
+    ValueError
+        If the expression is not valid or uses anything else.
+
+    """
+
+    def __init__(self, expr: str):
+        self.expr = expr
+        try:
+            tree = ast.parse(expr.strip(), mode="eval")
+        except SyntaxError as e:
+            raise ValueError(f"Invalid derived expression '{expr}': {e}") from e
+        self.variables: list[str] = []
+        self._fn = self._compile(tree.body)
+
+    def __repr__(self):
+        return f"Expression({self.expr!r})"
+
+    def _compile(self, node) -> Callable:
+        """Translate an AST node into a function of the variable arrays."""
+        if isinstance(node, ast.Constant):
+            if isinstance(node.value, bool) or not isinstance(
+                node.value, (int, float)
+            ):
+                raise self._error(node)
+            value = node.value
+            return lambda arrays: value
+        if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPERATORS:
+            op = BINARY_OPERATORS[type(node.op)]
+            left, right = self._compile(node.left), self._compile(node.right)
+            return lambda arrays: op(left(arrays), right(arrays))
+        if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPERATORS:
+            op = UNARY_OPERATORS[type(node.op)]
+            operand = self._compile(node.operand)
+            return lambda arrays: op(operand(arrays))
+        if isinstance(node, ast.Call):
+            ufunc = self._numpy_attribute(node.func)
+            if not isinstance(ufunc, np.ufunc) or node.keywords:
+                raise self._error(node)
+            if len(node.args) != ufunc.nin:
+                raise ValueError(
+                    f"{ufunc.__name__} takes {ufunc.nin} arguments in derived "
+                    f"expression '{self.expr}'"
+                )
+            args = [self._compile(arg) for arg in node.args]
+            return lambda arrays: ufunc(*[arg(arrays) for arg in args])
+        if isinstance(node, ast.Attribute):
+            value = self._numpy_attribute(node)
+            if isinstance(value, float):
+                return lambda arrays: value
+        name = self._variable_name(node)
+        if name is None:
+            raise self._error(node)
+        if name not in self.variables:
+            self.variables.append(name)
+        index = self.variables.index(name)
+        return lambda arrays: arrays[index]
+
+    def _numpy_attribute(self, node):
+        """Return the numpy attribute referred to by np.<name>, None otherwise."""
+        if (
+            isinstance(node, ast.Attribute)
+            and isinstance(node.value, ast.Name)
+            and node.value.id in NUMPY_NAMES
+        ):
+            return getattr(np, node.attr, None)
+        return None
+
+    def _variable_name(self, node):
+        """Return the variable name referred to by ds.name, ds["name"] or name."""
+        if isinstance(node, ast.Name):
+            if node.id in NUMPY_NAMES + (DATASET_NAME,):
+                return None
+            return node.id
+        if not isinstance(node, (ast.Attribute, ast.Subscript)):
+            return None
+        if not (isinstance(node.value, ast.Name) and node.value.id == DATASET_NAME):
+            return None
+        if isinstance(node, ast.Attribute):
+            return node.attr
+        if (
+            isinstance(node, ast.Subscript)
+            and isinstance(node.slice, ast.Constant)
+            and isinstance(node.slice.value, str)
+        ):
+            return node.slice.value
+        return None
+
+    def _error(self, node) -> ValueError:
+        return ValueError(
+            f"Unsupported '{ast.unparse(node)}' in derived expression '{self.expr}', "
+            "only numbers, dataset variables, arithmetic operators and numpy ufuncs "
+            "are allowed"
+        )
+
+    def _evaluate(self, *arrays) -> np.ndarray:
+        """Evaluate on numpy arrays in blocks along the first axis."""
+        arrays = np.broadcast_arrays(*arrays)
+        shape = arrays[0].shape
+        dtype = self.result_type(*arrays)
+        if len(shape) == 0:
+            return np.asarray(self._fn(arrays), dtype=dtype)
+        out = np.empty(shape, dtype=dtype)
+        step = max(1, BLOCK_SIZE // max(1, int(np.prod(shape[1:]))))
+        for i in range(0, shape[0], step):
+            out[i : i + step] = self._fn([array[i : i + step] for array in arrays])
+        return out
+
+    def result_type(self, *arrays) -> np.dtype:
+        """Data type of the result for inputs of the dtypes of arrays."""
+        empty = [np.empty((0,), dtype=array.dtype) for array in arrays]
+        return np.asarray(self._fn(empty)).dtype
+
+    def __call__(self, ds: xr.Dataset) -> xr.DataArray:
+        """Evaluate the expression on the variables of the dataset.
+
+        Variables backed by dask arrays are evaluated lazily chunk by chunk.
+
+        """
+        missing = [name for name in self.variables if name not in ds]
+        if missing:
+            raise ValueError(
+                f"Variables {missing} of derived expression '{self.expr}' not in "
+                f"dataset, available variables are {list(ds.variables)}"
+            )
+        arrays = [ds[name] for name in self.variables]
+        if not arrays:
+            return xr.DataArray(self._fn([]))
+        return xr.apply_ufunc(
+            self._evaluate,
+            *arrays,
+            dask="parallelized",
+            output_dtypes=[self.result_type(*arrays)],
+        )
+
+
+@lru_cache(maxsize=256)
+def compile_expression(expr: str) -> Expression:
+    """Return the compiled expression, parsed once for each expression string."""
+    return Expression(expr)
@@ -6,13 +6,19 @@
 # The full license is in the LICENSE file, distributed with this software.
 # -----------------------------------------------------------------------------
 
+import logging
+from functools import lru_cache
 from typing import Optional
 
+import numpy as np
+import pandas as pd
 import xarray as xr
 from pydantic import field_validator
 
+from .expression import compile_expression
 from .types import RompyBaseModel, Slice
 
+logger = logging.getLogger(__name__)
 
 # pydantic class to apply all the filters to the dataset
 class Filter(RompyBaseModel):
@@ -32,6 +38,12 @@ class Filter(RompyBaseModel):
                 v[key] = Slice.from_dict(value)
         return v
 
+    @field_validator("derived")
+    def compile_derived(cls, v):
+        for expr in (v or {}).get("derived_variables", {}).values():
+            compile_expression(expr)
+        return v
+
     def __call__(self, ds):
         filters = get_filter_fns()
         for fn in filters:
@@ -56,8 +68,10 @@ def derived_filter(ds, derived_variables):
         Input dataset to add derived variables to.
     derived_variables: dict
         Mapping {`derived_variable_name`: `derived_variable_definition`} where
-        `derived_variable_definition` is a string to be evaluated defining some
-        transformation based on existing variables in the input dataset `ds`.
+        `derived_variable_definition` is an expression defining some transformation
+        based on existing variables in the input dataset `ds`. Expressions may only
+        use numbers, variables, arithmetic operators and numpy ufuncs, they are
+        compiled once by :func:`rompy.core.expression.compile_expression`.
 
     Returns
     -------
@@ -72,18 +86,64 @@ def derived_filter(ds, derived_variables):
 
     """
     for var, expr in derived_variables.items():
-        ds[var] = eval(expr)
+        ds[var] = compile_expression(expr)(ds)
     return ds
 
 
 def sort_filter(ds, coords: list = []):
-    coords = list[coords] if isinstance(coords, str) else coords
+    coords = [coords] if isinstance(coords, str) else coords
     for c in coords:
         if c in ds:
-            ds = ds.sortby(c)
+            ds = sortby(ds, c)
     return ds
 
 
+def sortby(ds, name: str):
+    """Sort dataset in ascending order of a coordinate.
+
+    Same result as `ds.sortby(name)` without the full reindex when it is not needed:
+    coordinates already in ascending order are returned untouched, strictly
+    decreasing ones are reversed with a `::-1` slice and only unsorted ones are
+    reordered with a permutation that is cached for the coordinate values.
+
+    Parameters
+    ----------
+    ds: xr.Dataset | xr.DataArray
+        Input dataset to sort.
+    name: str
+        Name of the coordinate to sort by.
+
+    Returns
+    -------
+    ds: xr.Dataset | xr.DataArray
+
+    """
+    coord = ds[name]
+    if coord.ndim != 1:
+        return ds.sortby(name)
+    dim = coord.dims[0]
+    if name in ds.indexes:
+        index = ds.indexes[name]
+    else:
+        index = pd.Index(coord.values)
+    if index.is_monotonic_increasing:
+        return ds
+    if index.is_monotonic_decreasing and index.is_unique:
+        return ds.isel({dim: slice(None, None, -1)})
+    values = np.ascontiguousarray(index.values)
+    if values.dtype.hasobject:
+        return ds.sortby(name)
+    return ds.isel({dim: _sort_permutation(values.tobytes(), values.dtype.str)})
+
+
+@lru_cache(maxsize=64)
+def _sort_permutation(buffer: bytes, dtype: str) -> np.ndarray:
+    """Stable permutation sorting the values in buffer, cached for reuse."""
+    permutation = np.argsort(np.frombuffer(buffer, dtype=dtype), kind="stable")
+    permutation.flags.writeable = False
+    return permutation
+
+
 def subset_filter(ds, data_vars=None) -> xr.Dataset:
     """
     Subset data variables from dataset.
@@ -129,11 +189,110 @@ def crop_filter(ds, **data_slice) -> xr.Dataset:
         ds = ds.sel(this_crop)
         for k in data_slice.keys():
             if (k not in ds.sizes.keys()) and (k in ds.coords.keys()):
-                ds = ds.where(ds[k] > float(data_slice[k].start), drop=True)
-                ds = ds.where(ds[k] < float(data_slice[k].stop), drop=True)
+                ds = _crop_coordinate(ds, k, data_slice[k])
+    return ds
+
+
+def _crop_coordinate(ds, name, data_slice) -> xr.Dataset:
+    """Crop dataset along the dimensions of a non-dimension coordinate.
+
+    Only the coordinate values are read to build the integer indexers, along each
+    dimension the positions where any coordinate value is inside the open interval
+    (start, stop) are kept. Remaining values of a multi-dimensional coordinate that
+    are outside the interval are masked.
+
+    """
+    lower = -np.inf if data_slice.start is None else float(data_slice.start)
+    upper = np.inf if data_slice.stop is None else float(data_slice.stop)
+    coord = ds[name]
+    values = coord.values
+    mask = (values > lower) & (values < upper)
+    indexers = {}
+    for axis, dim in enumerate(coord.dims):
+        others = tuple(i for i in range(mask.ndim) if i != axis)
+        indexers[dim] = np.flatnonzero(mask.any(axis=others))
+    ds = ds.isel(indexers)
+    if coord.ndim > 1:
+        ds = ds.where((ds[name] > lower) & (ds[name] < upper))
     return ds
 
 
+def _crop_indexer(index, data_slice, ascending=False) -> Optional[slice]:
+    """Integer slice equivalent to cropping a monotonic index.
+
+    With ascending=True a decreasing index is cropped as if it had been sorted in
+    ascending order first. None is returned for non-monotonic indexes.
+
+    """
+    start, stop = data_slice.start, data_slice.stop
+    if index.is_monotonic_increasing:
+        return index.slice_indexer(start, stop)
+    if not index.is_monotonic_decreasing:
+        return None
+    if not ascending:
+        return index.slice_indexer(start, stop)
+    positions = np.arange(index.size)[::-1][index[::-1].slice_indexer(start, stop)]
+    if positions.size == 0:
+        return slice(0, 0)
+    return slice(positions.min(), positions.max() + 1)
+
+
+def plan_filters(ds, filters: Filter) -> tuple[xr.Dataset, Filter]:
+    """Push the subset and crop filters ahead of the other filters.
+
+    The subset and crops are applied straight to the lazily opened dataset so the
+    sort and the remaining filters only touch the data that is kept. Crops along
+    dimensions become integer slices computed from the index alone, crops along
+    non-dimension coordinates become boolean-mask selections. Crops that cannot be
+    moved before the sort without changing the result are left in place.
+
+    Parameters
+    ----------
+    ds: xr.Dataset
+        Dataset as returned by the source.
+    filters: Filter
+        Filters to apply to the dataset.
+
+    Returns
+    -------
+    ds: xr.Dataset
+        Dataset with the subset and crops that could be pushed down applied.
+    filters: Filter
+        Filters that remain to be applied to the dataset.
+
+    """
+    if not isinstance(ds, xr.Dataset):
+        return ds, filters
+    nbytes = ds.nbytes
+    sort = (filters.sort or {}).get("coords", [])
+    sort = [sort] if isinstance(sort, str) else sort
+    sort = [c for c in sort if c in ds]
+    if filters.subset:
+        ds = subset_filter(ds, **filters.subset)
+    indexers = {}
+    crop = {}
+    for k, data_slice in (filters.crop or {}).items():
+        if k in ds.coords and k not in ds.dims:
+            # Masks commute with the sort so these are always pushed down
+            ds = _crop_coordinate(ds, k, data_slice)
+            continue
+        indexer = None
+        if k in ds.indexes:
+            sorted_along = {c for c in sort if k in ds[c].dims}
+            if not sorted_along - {k}:
+                indexer = _crop_indexer(ds.indexes[k], data_slice, k in sorted_along)
+        if indexer is None:
+            crop[k] = data_slice
+        else:
+            indexers[k] = indexer
+    ds = ds.isel(indexers)
+    pushed = sorted(set(filters.crop or {}) - set(crop))
+    logger.debug(
+        f"Filter pushdown avoided {nbytes - ds.nbytes} bytes, pushed crops: {pushed}"
+    )
+    return ds, filters.model_copy(update={"subset": {}, "crop": crop})
+
+
 def timenorm_filter(ds, interval="hour", reftime=None) -> xr.Dataset:
     """Normalize time to lead time in hours
 
@@ -199,14 +358,18 @@ def get_filter_fns() -> dict:
     }
 
 
-def _open_preprocess(url, chunks, filters, xarray_kwargs):
-    import xarray as xr
-
-    ds = xr.open_dataset(url, chunks=chunks, **xarray_kwargs)
+def _apply_filters(ds, filters):
+    """Apply filters given as {filter name or function: params} to a dataset."""
     filter_fns = get_filter_fns()
     for fn, params in filters.items():
         if isinstance(fn, str):
             fn = filter_fns[fn]
         ds = fn(ds, **params)
-
     return ds
+
+
+def _open_preprocess(url, chunks, filters, xarray_kwargs):
+    import xarray as xr
+
+    ds = xr.open_dataset(url, chunks=chunks, **xarray_kwargs)
+    return _apply_filters(ds, filters)
@@ -5,7 +5,8 @@ import cartopy.crs as ccrs
 import cartopy.feature as cfeature
 import matplotlib.pyplot as plt
 import numpy as np
-from pydantic import Field, model_validator
+import shapely
+from pydantic import Field, PrivateAttr, model_validator
 from shapely.geometry import MultiPoint, Polygon
 
 from rompy.core.types import Bbox, RompyBaseModel
@@ -65,7 +66,7 @@ class BaseGrid(RompyBaseModel):
         return bbox
 
     def _get_convex_hull(self, tolerance=0.2) -> Polygon:
-        xys = list(zip(self.x.flatten(), self.y.flatten()))
+        xys = np.column_stack([self.x.ravel(), self.y.ravel()])
         polygon = MultiPoint(xys).convex_hull
         polygon = polygon.simplify(tolerance=tolerance)
         return polygon
@@ -113,9 +114,9 @@ class BaseGrid(RompyBaseModel):
             if perimeter < spacing:
                 raise ValueError(f"Spacing = {spacing} > grid perimeter = {perimeter}")
             npts = int(np.ceil(perimeter / spacing))
-            points = [polygon.boundary.interpolate(i * spacing) for i in range(npts)]
-            xpts = [point.x for point in points]
-            ypts = [point.y for point in points]
+            distances = np.arange(npts) * spacing
+            points = shapely.line_interpolate_point(polygon.boundary, distances)
+            xpts, ypts = shapely.get_coordinates(points).T
         return np.array(xpts), np.array(ypts)
 
     def _figsize(self, x0, x1, y0, y1, fscale):
@@ -217,6 +218,7 @@ class RegularGrid(BaseGrid):
     ny: Optional[int] = Field(
         default=None, description="Number of grid points in the y direction"
     )
+    _cgrid: Optional[tuple] = PrivateAttr(default=None)
 
     @model_validator(mode="after")
     def generate(self) -> "RegularGrid":
@@ -229,14 +231,62 @@ class RegularGrid(BaseGrid):
 
     @property
     def x(self) -> np.ndarray:
-        x, y = self._gen_reg_cgrid()
+        x, y = self._cached_cgrid()
         return x
 
     @property
     def y(self) -> np.ndarray:
-        x, y = self._gen_reg_cgrid()
+        x, y = self._cached_cgrid()
         return y
 
+    @property
+    def _grid_key(self) -> tuple:
+        return (self.x0, self.y0, self.dx, self.dy, self.nx, self.ny, self.rot)
+
+    def _cached_cgrid(self) -> tuple:
+        """Grid coordinates generated once until any of the grid parameters change.
+
+        The cached arrays are read-only so they cannot be modified in place.
+
+        """
+        key = self._grid_key
+        if self._cgrid is None or self._cgrid[0] != key:
+            x, y = self._gen_reg_cgrid()
+            x.flags.writeable = False
+            y.flags.writeable = False
+            self._cgrid = (key, x, y)
+        return self._cgrid[1:]
+
+    def _corners(self) -> tuple:
+        """Coordinates of the grid corners computed without generating the grid."""
+        i = np.arange(0.0, self.dx * self.nx, self.dx)
+        j = np.arange(0.0, self.dy * self.ny, self.dy)
+        ii = np.array([i[0], i[-1], i[-1], i[0]])
+        jj = np.array([j[0], j[0], j[-1], j[-1]])
+        return self._rotate(ii, jj)
+
+    @property
+    def minx(self) -> float:
+        return self._corners()[0].min()
+
+    @property
+    def maxx(self) -> float:
+        return self._corners()[0].max()
+
+    @property
+    def miny(self) -> float:
+        return self._corners()[1].min()
+
+    @property
+    def maxy(self) -> float:
+        return self._corners()[1].max()
+
+    def _get_convex_hull(self, tolerance=0.2) -> Polygon:
+        """Convex hull of a regular grid defined by its corners."""
+        polygon = MultiPoint(np.column_stack(self._corners())).convex_hull
+        polygon = polygon.simplify(tolerance=tolerance)
+        return polygon
+
     def _attrs_from_xy(self):
         """Generate regular grid attributes from x, y coordinates."""
         self.ny, self.nx = self.x.shape
@@ -256,12 +306,8 @@ class RegularGrid(BaseGrid):
     def ylen(self):
         return self.dy * (self.ny - 1)
 
-    def _gen_reg_cgrid(self):
-        # Grid at origin
-        i = np.arange(0.0, self.dx * self.nx, self.dx)
-        j = np.arange(0.0, self.dy * self.ny, self.dy)
-        ii, jj = np.meshgrid(i, j)
-
+    def _rotate(self, ii: np.ndarray, jj: np.ndarray) -> tuple:
+        """Rotate and translate coordinates from the grid origin."""
         # Rotation
         alpha = -self.rot * np.pi / 180.0
         R = np.array([[np.cos(alpha), -np.sin(alpha)], [np.sin(alpha), np.cos(alpha)]])
@@ -275,6 +321,13 @@ class RegularGrid(BaseGrid):
         y = np.reshape(y, ii.shape)
         return x, y
 
+    def _gen_reg_cgrid(self):
+        # Grid at origin
+        i = np.arange(0.0, self.dx * self.nx, self.dx)
+        j = np.arange(0.0, self.dy * self.ny, self.dy)
+        ii, jj = np.meshgrid(i, j)
+        return self._rotate(ii, jj)
+
     def __eq__(self, other) -> bool:
         return (
             (self.nx == other.nx)
@@ -0,0 +1,310 @@
+"""
+Manifest of data products for incremental generation.
+
+When a model run is generated with ``incremental=True`` every call to the ``get``
+method of a data object is recorded in a manifest file in the staging directory
+together with a fingerprint of its inputs: the serialised data object and call
+arguments (grid, time window), and the size and modification time or etag of the
+source files they refer to. A later generation calling ``get`` with the same
+fingerprint reuses the files already in the staging directory, as long as they have
+not been modified since, instead of extracting the data again.
+
+The fingerprint also includes the rompy version and :data:`MANIFEST_VERSION` so
+files written by older writers are not reused after an upgrade.
+
+The files of an entry are those returned by ``get`` plus those created or modified
+in the destination directory while it ran. When several ``get`` calls run
+concurrently in the same directory, e.g. ``SCHISMData`` with ``workers > 1``, an
+entry may also list files written by the other calls, possibly with a partial size.
+Such entries are invalidated more often than needed but are never reused for files
+that have changed.
+"""
+
+import functools
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+from pydantic import BaseModel
+
+from rompy import __version__
+from rompy.core.cache import cache_key
+from rompy.logging import get_logger
+
+logger = get_logger(__name__)
+
+MANIFEST_NAME = ".rompy_manifest.json"
+
+# Bump when the output of data writers changes without a rompy version change
+MANIFEST_VERSION = 1
+
+# Manifest of the generation in progress, None outside incremental generation
+_ACTIVE: Optional["Manifest"] = None
+
+# Set while a recorded get is running so nested get calls are not recorded
+_LOCAL = threading.local()
+
+
+class Unencodable(TypeError):
+    """Raised for values that cannot be recorded in the manifest."""
+
+
+def _encode(value) -> Any:
+    """Encode a value into json with tags to restore paths and tuples."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, Path):
+        return {"__path__": str(value)}
+    if isinstance(value, tuple):
+        return {"__tuple__": [_encode(v) for v in value]}
+    if isinstance(value, list):
+        return [_encode(v) for v in value]
+    if isinstance(value, dict) and all(isinstance(k, str) for k in value):
+        return {"__dict__": {k: _encode(v) for k, v in value.items()}}
+    raise Unencodable(f"Cannot record {type(value).__name__} in the manifest")
+
+
+def _decode(value) -> Any:
+    """Decode a value encoded by _encode."""
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    if isinstance(value, dict):
+        if "__path__" in value:
+            return Path(value["__path__"])
+        if "__tuple__" in value:
+            return tuple(_decode(v) for v in value["__tuple__"])
+        return {k: _decode(v) for k, v in value["__dict__"].items()}
+    return value
+
+
+def _fingerprint_value(value) -> Any:
+    """Json serialisable representation of a get argument."""
+    if isinstance(value, BaseModel):
+        return [type(value).__name__, value.model_dump(mode="json")]
+    return _encode(value)
+
+
+def _source_stats(value, stats: dict):
+    """Collect the size and mtime or etag of the files referred to in value."""
+    if isinstance(value, dict):
+        for v in value.values():
+            _source_stats(v, stats)
+    elif isinstance(value, (list, tuple)):
+        for v in value:
+            _source_stats(v, stats)
+    elif isinstance(value, str) and value not in stats:
+        if os.path.isfile(value):
+            stat = os.stat(value)
+            stats[value] = [stat.st_size, stat.st_mtime_ns]
+        elif "://" in value and not value.startswith("file://"):
+            stats[value] = _remote_stats(value)
+
+
+def _remote_stats(uri: str) -> Optional[list]:
+    """Etag, modification time and size of a remote file, None if unavailable."""
+    try:
+        import fsspec
+
+        fs, path = fsspec.core.url_to_fs(uri)
+        info = fs.info(path)
+    except Exception:
+        return None
+    keys = ("ETag", "etag", "md5Hash", "LastModified", "mtime", "updated", "size")
+    return [str(info.get(key)) for key in keys if info.get(key) is not None]
+
+
+def _split_destdir(args: tuple, kwargs: dict) -> tuple[Optional[Path], tuple, dict]:
+    """Split the destination directory from the other arguments of a get call."""
+    kwargs = dict(kwargs)
+    for name in ("destdir", "staging_dir"):
+        if kwargs.get(name) is not None:
+            return Path(kwargs.pop(name)), args, kwargs
+    if args and isinstance(args[0], (str, Path)):
+        return Path(args[0]), args[1:], kwargs
+    return None, args, kwargs
+
+
+def _result_files(value, files: dict):
+    """Collect the size and mtime of existing files referred to in a get result."""
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, (list, tuple)):
+        for v in value:
+            _result_files(v, files)
+    elif isinstance(value, (str, Path)) and os.path.isfile(value):
+        stat = os.stat(value)
+        files[str(value)] = [stat.st_size, stat.st_mtime_ns]
+
+
+def _snapshot(directory: Path) -> dict:
+    """Size and mtime of all the files under a directory."""
+    files = {}
+    for root, _, names in os.walk(directory):
+        for name in names:
+            if name == MANIFEST_NAME:
+                continue
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            files[path] = [stat.st_size, stat.st_mtime_ns]
+    return files
+
+
+class Manifest:
+    """Data products generated in a staging directory keyed on input fingerprints.
+
+    Parameters
+    ----------
+    staging_dir : str | Path
+        Staging directory of the model run, the manifest is kept in it.
+
+    """
+
+    def __init__(self, staging_dir: Union[str, Path]):
+        self.staging_dir = Path(staging_dir).resolve()
+        self.path = self.staging_dir / MANIFEST_NAME
+        self.entries: dict[str, dict] = {}
+        if self.path.is_file():
+            try:
+                self.entries = json.loads(self.path.read_text())
+            except ValueError:
+                logger.warning(f"Ignoring unreadable manifest {self.path}")
+        self._used: set[str] = set()
+        self._lock = threading.Lock()
+
+    def fingerprint(
+        self, data, destdir: Path, args: tuple, kwargs: dict
+    ) -> Optional[str]:
+        """Fingerprint of a get call, None if its inputs cannot be serialised."""
+        try:
+            dump = data.model_dump(mode="json")
+            arguments = [_fingerprint_value(arg) for arg in args]
+            for key, value in sorted(kwargs.items()):
+                arguments.append([key, _fingerprint_value(value)])
+        except Exception as e:
+            logger.debug(f"Cannot fingerprint {type(data).__name__}: {e}")
+            return None
+        stats = {}
+        _source_stats([dump, arguments], stats)
+        return cache_key(
+            __version__,
+            MANIFEST_VERSION,
+            type(data).__name__,
+            dump,
+            arguments,
+            self._relative(destdir),
+            stats,
+        )
+
+    def _relative(self, path: str) -> str:
+        try:
+            return str(Path(path).resolve().relative_to(self.staging_dir))
+        except ValueError:
+            return str(Path(path).resolve())
+
+    def fetch(self, fingerprint: str) -> tuple[bool, Any, dict]:
+        """Return whether the entry is valid, the recorded result and private state.
+
+        An entry is only valid if all its files are unchanged since recorded.
+
+        """
+        with self._lock:
+            entry = self.entries.get(fingerprint)
+        if entry is None:
+            return False, None, {}
+        for name, stat in entry["files"].items():
+            path = self.staging_dir / name
+            try:
+                current = os.stat(path)
+            except FileNotFoundError:
+                return False, None, {}
+            if [current.st_size, current.st_mtime_ns] != stat:
+                return False, None, {}
+        with self._lock:
+            self._used.add(fingerprint)
+        return True, _decode(entry["result"]), _decode(entry["private"])
+
+    def record(self, fingerprint: str, result: Any, private: dict, files: dict):
+        """Record the result, private state and output files of a get call."""
+        try:
+            result = _encode(result)
+        except Unencodable as e:
+            logger.debug(f"Not recording get output in the manifest: {e}")
+            return
+        state = {}
+        for key, value in (private or {}).items():
+            try:
+                state[key] = _encode(value)
+            except Unencodable:
+                continue
+        entry = {
+            "result": result,
+            "private": {"__dict__": state},
+            "files": {self._relative(path): stat for path, stat in files.items()},
+        }
+        with self._lock:
+            self.entries[fingerprint] = entry
+            self._used.add(fingerprint)
+
+    def save(self):
+        """Write the entries used in this generation, dropping stale ones."""
+        with self._lock:
+            entries = {k: v for k, v in self.entries.items() if k in self._used}
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(entries, indent=1))
+        os.replace(tmp, self.path)
+
+
+@contextmanager
+def incremental_generation(staging_dir: Union[str, Path]):
+    """Record and reuse data products of get calls in the staging directory."""
+    global _ACTIVE
+    manifest = Manifest(staging_dir)
+    _ACTIVE = manifest
+    try:
+        yield manifest
+    finally:
+        _ACTIVE = None
+        manifest.save()
+
+
+def incremental(get: Callable) -> Callable:
+    """Decorate the get method of a data object to use the active manifest."""
+
+    @functools.wraps(get)
+    def wrapper(self, *args, **kwargs):
+        manifest = _ACTIVE
+        if manifest is None or getattr(_LOCAL, "active", False):
+            return get(self, *args, **kwargs)
+        destdir, arguments, keywords = _split_destdir(args, kwargs)
+        fingerprint = None
+        if destdir is not None:
+            fingerprint = manifest.fingerprint(self, destdir, arguments, keywords)
+        if fingerprint is None:
+            return get(self, *args, **kwargs)
+
+        hit, result, private = manifest.fetch(fingerprint)
+        if hit:
+            logger.info(f"Reusing unchanged {type(self).__name__} '{self.id}' output")
+            for key, value in private.items():
+                setattr(self, key, value)
+            return result
+
+        before = _snapshot(destdir)
+        _LOCAL.active = True
+        try:
+            result = get(self, *args, **kwargs)
+        finally:
+            _LOCAL.active = False
+        after = _snapshot(destdir)
+        files = {path: stat for path, stat in after.items() if before.get(path) != stat}
+        _result_files(result, files)
+        manifest.record(fingerprint, result, self.__pydantic_private__, files)
+        return result
+
+    return wrapper
@@ -0,0 +1,72 @@
+"""
+Concurrent execution of independent data processing tasks.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from rompy.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class TaskErrors(RuntimeError):
+    """Raised when one or more tasks failed, holding the error of each of them.
+
+    Parameters
+    ----------
+    errors : dict
+        Exception raised by each failed task keyed on the task name.
+
+    """
+
+    def __init__(self, errors: dict[str, BaseException]):
+        self.errors = errors
+        details = "\n".join(
+            f"  - {name}: {type(err).__name__}: {err}" for name, err in errors.items()
+        )
+        super().__init__(f"{len(errors)} task(s) failed:\n{details}")
+
+
+def run_tasks(
+    tasks: dict[str, Callable[[], Any]], workers: int = 1
+) -> dict[str, Any]:
+    """Run independent tasks, concurrently in a thread pool if workers > 1.
+
+    Parameters
+    ----------
+    tasks : dict
+        Callables without arguments keyed on the task name.
+    workers : int
+        Number of worker threads. Tasks are run one after another in the calling
+        thread if 1, in which case the first error is raised as is.
+
+    Returns
+    -------
+    dict
+        Result of each task keyed on the task name in the order of tasks,
+        regardless of the order in which they complete.
+
+    Raises
+    ------
+    TaskErrors
+        If any task failed when run concurrently, after all tasks have finished.
+
+    """
+    if workers <= 1 or len(tasks) <= 1:
+        return {name: task() for name, task in tasks.items()}
+
+    logger.debug(f"Running {len(tasks)} tasks with {workers} workers")
+    with ThreadPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+        futures = {name: executor.submit(task) for name, task in tasks.items()}
+    results, errors = {}, {}
+    for name, future in futures.items():
+        err = future.exception()
+        if err is not None:
+            logger.error(f"Task {name} failed: {err}")
+            errors[name] = err
+        else:
+            results[name] = future.result()
+    if errors:
+        raise TaskErrors(errors) from next(iter(errors.values()))
+    return results
@@ -1,8 +1,9 @@
 """Rompy source objects."""
 
 import logging
+import os
 from abc import ABC, abstractmethod
-from functools import cached_property
+from functools import cached_property, lru_cache
 from pathlib import Path
 from typing import Literal, Optional, Union
 
@@ -16,11 +17,15 @@ from intake.catalog.local import YAMLFileCatalog
 from oceanum.datamesh import Connector
 from pydantic import ConfigDict, Field, model_validator
 
-from rompy.core.filters import Filter
+from rompy.core.cache import DatasetCache, cache_key
+from rompy.core.filters import Filter, plan_filters
 from rompy.core.types import DatasetCoords, RompyBaseModel
 
 logger = logging.getLogger(__name__)
 
+# Process-wide cache of open source datasets, set max_open to 0 to disable it
+SOURCE_CACHE = DatasetCache(max_open=16)
+
 # Import stubs for classes moved to rompy_binary_datasources
 try:
     from rompy_binary_datasources import (SourceDataset,
@@ -50,9 +55,32 @@ class SourceBase(RompyBaseModel, ABC):
         """Return the coordinates of the datasource."""
         return self.open().coords
 
+    def _cache_key(self) -> Optional[str]:
+        """Key of this source in the SOURCE_CACHE, None if it cannot be cached.
+
+        The key is built from the serialised model and from the size and
+        modification time of local files it refers to so changed files are reopened.
+
+        """
+        try:
+            dump = self.model_dump(mode="json")
+        except Exception:
+            return None
+        stats = []
+        for value in dump.values():
+            if isinstance(value, str) and os.path.isfile(value):
+                stat = os.stat(value)
+                stats.append([value, stat.st_size, stat.st_mtime_ns])
+        return cache_key(type(self).__name__, dump, stats)
+
     def open(self, variables: list = [], filters: Filter = {}, **kwargs) -> xr.Dataset:
         """Return the filtered dataset object.
 
+        The source is opened once and the filtered dataset is built once for each
+        combination of variables and filters, both are kept in the SOURCE_CACHE.
+        A shallow copy is returned so variables can be added or replaced without
+        altering the cached dataset.
+
         Parameters
         ----------
         variables : list, optional
@@ -66,7 +94,28 @@ class SourceBase(RompyBaseModel, ABC):
         arguments to the open method.
 
         """
-        ds = self._open()
+        key = self._cache_key()
+        if key is None:
+            return self._filter(self._open(), variables, filters)
+        if isinstance(filters, RompyBaseModel):
+            view = cache_key(list(variables), filters.model_dump(mode="json"))
+        else:
+            view = cache_key(list(variables), filters)
+        ds = SOURCE_CACHE.get(
+            key,
+            self._open,
+            view=view,
+            build=lambda ds: self._filter(ds, variables, filters),
+        )
+        return ds.copy(deep=False)
+
+    def _filter(self, ds: xr.Dataset, variables: list, filters: Filter) -> xr.Dataset:
+        """Select the variables and apply the filters to the dataset.
+
+        Variables are selected first and the subset and crop filters are pushed down
+        by `plan_filters` so only the data kept is sorted, decoded or derived.
+
+        """
         if variables:
             try:
                 ds = ds[variables]
@@ -83,6 +132,8 @@ class SourceBase(RompyBaseModel, ABC):
                     f"2. The data source contains the expected variables\n"
                     f"3. If using a custom data source, ensure it creates variables with the correct names"
                 ) from e
+        if isinstance(filters, Filter):
+            ds, filters = plan_filters(ds, filters)
         if filters:
             ds = filters(ds)
         return ds
@@ -122,6 +173,21 @@ class SourceFile(SourceBase):
             return xr.open_dataset(uri_str, **self.kwargs)
 
 
+@lru_cache(maxsize=32)
+def _open_catalog(catalog_uri: str) -> Catalog:
+    return intake.open_catalog(catalog_uri)
+
+
+@lru_cache(maxsize=32)
+def _yaml_catalog(catalog_yaml: str) -> Catalog:
+    fs = fsspec.filesystem("memory")
+    fs_map = fs.get_mapper()
+    # Catalogs are kept so each yaml is given its own file in the memory filesystem
+    name = f"{cache_key(catalog_yaml)}.yaml"
+    fs_map[f"/{name}"] = catalog_yaml.encode("utf-8")
+    return YAMLFileCatalog(name, fs=fs)
+
+
 class SourceIntake(SourceBase):
     """Source dataset from intake catalog.
 
@@ -164,14 +230,11 @@ class SourceIntake(SourceBase):
 
     @property
     def catalog(self) -> Catalog:
-        """The intake catalog instance."""
+        """The intake catalog instance, parsed once for each catalog."""
         if self.catalog_uri:
-            return intake.open_catalog(self.catalog_uri)
+            return _open_catalog(str(self.catalog_uri))
         else:
-            fs = fsspec.filesystem("memory")
-            fs_map = fs.get_mapper()
-            fs_map["/temp.yaml"] = self.catalog_yaml.encode("utf-8")
-            return YAMLFileCatalog("temp.yaml", fs=fs)
+            return _yaml_catalog(self.catalog_yaml)
 
     def _open(self) -> xr.Dataset:
         return self.catalog[self.dataset_id](**self.kwargs).to_dask()
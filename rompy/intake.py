@@ -0,0 +1,234 @@
+"""Intake drivers for stacks of forecast cycles.
+
+Operational forecasts are archived as one file or store per forecast cycle. The
+drivers in this module discover the cycles available for a set of format fields,
+open them lazily in parallel and stack them along the forecast initialisation time
+(`init`) and lead time (`lead`) dimensions. With `hindcast=True` the stack is
+collapsed into a continuous time series using the shortest lead times available.
+"""
+
+from functools import partial
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+from intake.source.base import DataSource, Schema
+
+from rompy import __version__
+from rompy.core.filters import _apply_filters
+from rompy.logging import get_logger
+from rompy.utils import dict_product, walk_server
+
+logger = get_logger(__name__)
+
+
+def stack_cycle(ds: xr.Dataset, filters: dict = {}, interval: str = "hour"):
+    """Apply filters to one forecast cycle and index it by init and lead time.
+
+    Parameters
+    ----------
+    ds : xr.Dataset
+        Dataset of one forecast cycle with a `time` dimension.
+    filters : dict
+        Filters applied to the cycle before stacking, as {filter name: params}.
+    interval : str
+        Unit of the lead time.
+
+    Returns
+    -------
+    ds : xr.Dataset
+        Cycle with `init` and `lead` dimensions, `time` is kept as a coordinate.
+
+    """
+    ds = _apply_filters(ds, filters)
+    times = pd.to_datetime(ds["time"].values)
+    lead = (times - times[0]) / pd.to_timedelta(1, interval)
+    ds = ds.assign_coords(lead=("time", lead.values.astype("float64")))
+    ds = ds.swap_dims({"time": "lead"})
+    ds["lead"].attrs["units"] = interval
+    ds = ds.expand_dims(init=[times[0]])
+    return ds.assign_coords(time=ds["time"].expand_dims(init=ds["init"]))
+
+
+def to_hindcast(ds: xr.Dataset) -> xr.Dataset:
+    """Collapse a forecast stack into a continuous time series.
+
+    Each cycle contributes its lead times up to the initialisation of the next
+    cycle, the last cycle contributes all of its lead times.
+
+    """
+    init = ds["init"].values
+    next_init = np.append(init[1:], np.datetime64("NaT"))
+    times = ds["time"].transpose("init", "lead").values
+    keep = (times < next_init[:, None]) | np.isnat(next_init)[:, None]
+    keep &= ~np.isnat(times)
+    stacked = ds.stack(step=("init", "lead"))
+    stacked = stacked.isel(step=np.flatnonzero(keep.ravel()))
+    stacked = stacked.drop_vars(["step", "init", "lead"])
+    return stacked.swap_dims({"step": "time"})
+
+
+class FCStackSourceBase(DataSource):
+    """Base intake driver for a stack of forecast cycles.
+
+    Parameters
+    ----------
+    urlpath : str
+        Format string of the location of the cycles, e.g. a thredds catalog page
+        or a directory, formatted with each combination of `fmt_fields`.
+    fmt_fields : dict
+        Lists of the values of each field in `urlpath` and `fn_fmt`.
+    fn_fmt : str
+        Format string of the file names of the cycles.
+    url_replace : dict
+        Replacements applied to the discovered urls, e.g. to go from a thredds
+        catalog to the dods endpoint.
+    ds_filters : dict
+        Filters applied to each cycle before stacking, as {filter name: params}.
+    hindcast : bool
+        Collapse the stack into a continuous time series.
+    chunks : dict
+        Chunks of each cycle, cycles are always opened lazily.
+    lead_interval : str
+        Unit of the lead time.
+    xarray_kwargs : dict
+        Extra keyword arguments passed to xarray.open_mfdataset.
+
+    """
+
+    version = __version__
+    container = "xarray"
+    partition_access = True
+    engine: Optional[str] = None
+
+    def __init__(
+        self,
+        urlpath: str,
+        fmt_fields: dict,
+        fn_fmt: str = "",
+        url_replace: dict = {},
+        ds_filters: dict = {},
+        hindcast: bool = False,
+        chunks: dict = {},
+        lead_interval: str = "hour",
+        xarray_kwargs: Optional[dict] = None,
+        metadata: Optional[dict] = None,
+        **kwargs,
+    ):
+        self.urlpath = urlpath
+        self.fmt_fields = fmt_fields
+        self.fn_fmt = fn_fmt
+        self.url_replace = url_replace
+        self.ds_filters = ds_filters
+        self.hindcast = hindcast
+        self.chunks = chunks
+        self.lead_interval = lead_interval
+        self.xarray_kwargs = xarray_kwargs or {}
+        self._ds = None
+        super().__init__(metadata=metadata, **kwargs)
+
+    def _get_urls(self) -> list[str]:
+        """Urls of the available forecast cycles."""
+        raise NotImplementedError
+
+    def _open_dataset(self):
+        urls = self._get_urls()
+        if not urls:
+            raise ValueError(
+                f"No forecast cycles found for {self.urlpath} with {self.fmt_fields}"
+            )
+        logger.debug(f"Opening {len(urls)} forecast cycles")
+        kwargs = dict(self.xarray_kwargs)
+        if self.engine is not None:
+            kwargs.setdefault("engine", self.engine)
+        ds = xr.open_mfdataset(
+            urls,
+            preprocess=partial(
+                stack_cycle, filters=self.ds_filters, interval=self.lead_interval
+            ),
+            combine="nested",
+            concat_dim="init",
+            parallel=True,
+            chunks=self.chunks,
+            **kwargs,
+        )
+        ds = ds.sortby("init")
+        if self.hindcast:
+            ds = to_hindcast(ds)
+        self._ds = ds
+
+    def _get_schema(self) -> Schema:
+        if self._ds is None:
+            self._open_dataset()
+            metadata = {
+                "dims": dict(self._ds.sizes),
+                "data_vars": {k: list(v.coords) for k, v in self._ds.data_vars.items()},
+                "coords": tuple(self._ds.coords),
+            }
+            metadata.update(self._ds.attrs)
+            self._schema = Schema(
+                dtype=None, shape=None, npartitions=1, extra_metadata=metadata
+            )
+        return self._schema
+
+    def read(self) -> xr.Dataset:
+        """Return the stack loaded in memory."""
+        self._load_metadata()
+        return self._ds.load()
+
+    def to_dask(self) -> xr.Dataset:
+        """Return the lazy stack."""
+        self._load_metadata()
+        return self._ds
+
+    def _close(self):
+        self._ds = None
+        self._schema = None
+
+
+class NetCDFFCStackSource(FCStackSourceBase):
+    """Stack of NetCDF forecast cycles discovered by walking a server or directory."""
+
+    name = "netcdf_fcstack"
+
+    def _get_urls(self) -> list[str]:
+        return walk_server(self.urlpath, self.fn_fmt, self.fmt_fields, self.url_replace)
+
+
+class ZarrFCStackSource(FCStackSourceBase):
+    """Stack of Zarr forecast cycles, one store per cycle.
+
+    The stores are given directly by `urlpath` and their existence is checked in
+    parallel, `fn_fmt` is not used.
+
+    """
+
+    name = "zarr_fcstack"
+    engine = "zarr"
+
+    def __init__(self, *args, storage_options: Optional[dict] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.storage_options = storage_options or {}
+        if self.storage_options:
+            backend_kwargs = self.xarray_kwargs.setdefault("backend_kwargs", {})
+            backend_kwargs.setdefault("storage_options", self.storage_options)
+
+    def _get_urls(self) -> list[str]:
+        from dask import compute, delayed
+        from fsspec import filesystem
+        from fsspec.utils import get_protocol
+
+        fields = dict_product(self.fmt_fields)
+        urls = sorted({self.urlpath.format(**pv) for pv in fields})
+
+        @delayed
+        def exists(url):
+            fs = filesystem(get_protocol(url), **self.storage_options)
+            return fs.exists(url)
+
+        found = compute(*[exists(url) for url in urls], scheduler="threads")
+        urls = [url for url, ok in zip(urls, found) if ok]
+        for f, r in self.url_replace.items():
+            urls = [u.replace(f, r) for u in urls]
+        return urls
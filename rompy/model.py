@@ -18,6 +18,7 @@ from pydantic import Field
 from rompy.backends import BackendConfig
 from rompy.backends.config import BaseBackendConfig
 from rompy.core.config import BaseConfig
+from rompy.core.manifest import incremental_generation
 from rompy.core.render import render
 from rompy.core.time import TimeRange
 from rompy.core.types import RompyBaseModel
@@ -102,6 +103,13 @@ class ModelRun(RompyBaseModel):
     run_id_subdir: bool = Field(
         True, description="Use run_id subdirectory in the output directory"
     )
+    incremental: bool = Field(
+        False,
+        description=(
+            "Reuse data files from a previous generation in the staging directory "
+            "when the inputs they were generated from are unchanged"
+        ),
+    )
     _datefmt: str = "%Y%m%d.%H%M%S"
     _staging_dir: Path = None
 
@@ -250,7 +258,11 @@ class ModelRun(RompyBaseModel):
             # Run the __call__() method of the config object if it is callable passing
             # the runtime instance, and fill in the context with what is returned
             logger.info("Running configuration callable...")
-            cc_full["config"] = self.config(self)
+            if self.incremental:
+                with incremental_generation(self.staging_dir):
+                    cc_full["config"] = self.config(self)
+            else:
+                cc_full["config"] = self.config(self)
         else:
             # Otherwise just fill in the context with the config instance itself
             logger.info("Using static configuration...")
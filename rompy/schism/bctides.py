@@ -4,7 +4,10 @@ Tidal boundary conditions for SCHISM.
 A direct implementation based on PyLibs scripts/gen_bctides.py with no fallbacks.
 """
 
+import os
+import uuid
 from datetime import datetime
+from pathlib import Path
 
 import numpy as np
 import pyTMD
@@ -12,12 +15,19 @@ import timescale
 import xarray as xr
 from scipy.spatial import KDTree
 
+from rompy.core.cache import array_hash, cache_key
 from rompy.formatting import ARROW
 from rompy.logging import get_logger
 
 logger = get_logger(__name__)
 
 
+def _format_rows(fmt, data):
+    """Format all rows of a 2D array at once, fmt formats a single row."""
+    data = np.asarray(data)
+    return (fmt * data.shape[0]) % tuple(data.ravel().tolist())
+
+
 class Bctides:
     """Direct implementation of SCHISM tidal boundary conditions using PyLibs.
 
@@ -58,6 +68,7 @@ class Bctides:
         temp_3d_path=None,
         salt_th_path=None,
         salt_3d_path=None,
+        tidal_cache_dir=None,
     ):
         """Initialize Bctides handler.
 
@@ -101,6 +112,9 @@ class Bctides:
             Number of flow boundary segments, by default 0
         nfluxf : int, optional
             Number of flux boundary segments, by default 0
+        tidal_cache_dir : str or Path, optional
+            Directory to cache tidal constants extracted at the boundary nodes in,
+            by default None which extracts them from the tidal model on every call
         """
         # Set default values for any None parameters
         flags = flags or [[5, 5, 4, 4]]
@@ -128,6 +142,8 @@ class Bctides:
         self.extrapolation_distance = extrapolation_distance
         self.extra_databases = extra_databases
         self.mdt = mdt
+        self.tidal_cache_dir = tidal_cache_dir
+        self._tmd_model = None
         self._h_coeffs = {} # Placeholder for harmonic coefficients
         self._uv_coeffs = {}  # Placeholder for UV coefficients
 
@@ -247,10 +263,28 @@ class Bctides:
         # Store earth equilibrium argument for each constituent
         self.earth_equil_arg = G[0, :]
 
+    def _tidal_cache_file(self, lons, lats, constituents, data_type, method):
+        """Cache file of the tidal constants extracted at the given points."""
+        key = cache_key(
+            self.tidal_model,
+            str(self.tidal_database),
+            [str(db) for db in self.extra_databases or []],
+            sorted(constituents),
+            data_type,
+            method,
+            self.extrapolate_tides,
+            self.extrapolation_distance,
+            array_hash(lons, lats),
+        )
+        return Path(self.tidal_cache_dir) / f"tides-{data_type}-{key}.npz"
+
     def _interpolate_tidal_data(self, lons, lats, constituents, data_type="h"):
         """
         Interpolate tidal data for a constituent to boundary points using pyTMD extract_constants.
 
+        Extracted constants are read from and written to tidal_cache_dir if set so
+        runs on the same boundary nodes don't read the tidal model again.
+
         Parameters
         ----------
         lons : array
@@ -268,44 +302,59 @@ class Bctides:
             For elevation: [amp, pha] (shape: n_points, 2)
             For velocity: [u_amp, u_pha, v_amp, v_pha] (shape: n_points, 4)
         """
-        tmd_model = pyTMD.io.model(
-            self.tidal_database, extra_databases=self.extra_databases, constituents=constituents
+        if data_type not in ("h", "uv"):
+            raise ValueError(f"Unknown data_type: {data_type}")
+        method = "bilinear"
+        cache_file = None
+        if self.tidal_cache_dir is not None:
+            cache_file = self._tidal_cache_file(
+                lons, lats, constituents, data_type, method
+            )
+            if cache_file.is_file():
+                logger.info(f"Loading {data_type} tidal constants from {cache_file}")
+                with np.load(cache_file) as cached:
+                    names = list(cached["constituents"])
+                    order = [names.index(c) for c in constituents]
+                    return cached["data"][:, order, :]
+
+        data = self._extract_tidal_data(lons, lats, constituents, data_type, method)
+
+        if cache_file is not None:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_file.with_name(f".{cache_file.stem}.{uuid.uuid4().hex}.npz")
+            np.savez(tmp, data=data, constituents=np.array(constituents))
+            os.replace(tmp, cache_file)
+            logger.debug(f"Saved {data_type} tidal constants to {cache_file}")
+        return data
+
+    def _extract_tidal_data(self, lons, lats, constituents, data_type, method):
+        """Extract tidal constants at points from the pyTMD tidal model."""
+        if self._tmd_model is None:
+            self._tmd_model = pyTMD.io.model(
+                self.tidal_database,
+                extra_databases=self.extra_databases,
+                constituents=constituents,
+            )
+        tmd_model = self._tmd_model
+        kwargs = dict(
+            constituents=constituents,
+            method=method,
+            crop=True,
+            extrapolate=self.extrapolate_tides,
+            cutoff=self.extrapolation_distance,
         )
         if data_type == "h":
             amp, pha, _ = tmd_model.elevation(self.tidal_model).extract_constants(
-                lons,
-                lats,
-                constituents=constituents,
-                method="bilinear",
-                crop=True,
-                extrapolate=self.extrapolate_tides,
-                cutoff=self.extrapolation_distance,
+                lons, lats, **kwargs
             )
             amp = amp.squeeze()[...,None]
             pha = pha.squeeze()[...,None]
             # Return shape (n_points, 2)
             return np.concatenate((amp, pha), axis=-1)
-        elif data_type == "uv":
-            amp_u, pha_u, _ = tmd_model.current(self.tidal_model).extract_constants(
-                lons,
-                lats,
-                type="u",
-                constituents=constituents,
-                method="bilinear",
-                crop=True,
-                extrapolate=self.extrapolate_tides,
-                cutoff=self.extrapolation_distance,
-            )
-            amp_v, pha_v, _ = tmd_model.current(self.tidal_model).extract_constants(
-                lons,
-                lats,
-                type="v",
-                constituents=constituents,
-                method="bilinear",
-                crop=True,
-                extrapolate=self.extrapolate_tides,
-                cutoff=self.extrapolation_distance,
-            )
+        else:
+            current = tmd_model.current(self.tidal_model)
+            amp_u, pha_u, _ = current.extract_constants(lons, lats, type="u", **kwargs)
+            amp_v, pha_v, _ = current.extract_constants(lons, lats, type="v", **kwargs)
             amp_u = (
                 amp_u.squeeze() / 100
             )[...,None]  # Convert cm/s to m/s - pyTMD always returns in cm/s
@@ -316,8 +365,39 @@ class Bctides:
             pha_v = pha_v.squeeze()[...,None]
             # Return shape (n_points, 4)
             return np.concatenate((amp_u, pha_u, amp_v, pha_v), axis=-1)
-        else:
-            raise ValueError(f"Unknown data_type: {data_type}")
+
+    def _boundary_tidal_data(self, nope, data_type, flag_index):
+        """Tidal constants at the nodes of all boundaries forced by tides.
+
+        The nodes of every boundary with a tidal flag (3 or 5) at flag_index are
+        extracted in a single call so the tidal model is only read once.
+
+        Returns
+        -------
+        dict
+            Tidal constants of each tidal boundary keyed on the boundary index
+        """
+        nob = getattr(self.gd, "nob", 0) or 0
+        boundaries = [
+            ibnd
+            for ibnd in range(min(nope, nob))
+            if ibnd < len(self.flags)
+            and len(self.flags[ibnd]) > flag_index
+            and self.flags[ibnd][flag_index] in (3, 5)
+        ]
+        if not boundaries:
+            return {}
+        nodes = [np.asarray(self.gd.iobn[ibnd]) for ibnd in boundaries]
+        all_nodes = np.concatenate(nodes)
+        logger.info(
+            f"Extracting {data_type} tidal constants for {len(self.tnames)} "
+            f"constituents at {all_nodes.size} nodes of {len(boundaries)} boundaries"
+        )
+        data = self._interpolate_tidal_data(
+            self.gd.x[all_nodes], self.gd.y[all_nodes], self.tnames, data_type
+        )
+        splits = np.split(data, np.cumsum([n.size for n in nodes])[:-1])
+        return dict(zip(boundaries, splits))
 
     def write_bctides(self, output_file):
         """Generate bctides.in file directly using PyLibs approach.
@@ -426,13 +506,17 @@ class Bctides:
 
             f.write(f"{nope} !nope\n")
 
+            # Extract the tidal constants of all boundaries at once
+            elev_tides = self._boundary_tidal_data(nope, "h", 0)
+            vel_tides = self._boundary_tidal_data(nope, "uv", 1)
+
             # For each open boundary
             for ibnd in range(nope):
                 # Get boundary nodes - prioritize grid boundaries if available
                 if hasattr(self.gd, "nob") and self.gd.nob > 0 and ibnd < self.gd.nob:
                     # Use actual grid boundary
                     nodes = self.gd.iobn[ibnd]
-                    num_nodes = self.gd.nobn[ibnd]
+                    num_nodes = int(self.gd.nobn[ibnd])
                     logger.debug(f"Using grid boundary {ibnd} with {num_nodes} nodes")
                 elif (
                     hasattr(self.gd, "nob") and self.gd.nob > 0 and ibnd >= self.gd.nob
@@ -484,8 +568,7 @@ class Bctides:
                         eth_val = (
                             self.ethconst[ibnd] if ibnd < len(self.ethconst) else 0.0
                         )
-                        for n in range(num_nodes):
-                            f.write(f"{eth_val} 0.0\n")
+                        f.write(f"{eth_val} 0.0\n" * num_nodes)
                 # Type 4: Space-time varying elevation
                 elif elev_type == 4:
                     f.write(
@@ -500,8 +583,7 @@ class Bctides:
                         f.write("z0\n")
                         if isinstance(self.mdt, float):
                             # If mdt is a single float, write it for all nodes
-                            for n in range(num_nodes):
-                                f.write(f"{self.mdt:.6f} 0.0\n")
+                            f.write(f"{self.mdt:.6f} 0.0\n" * num_nodes)
                         elif isinstance(self.mdt, (xr.Dataset, xr.DataArray)):
                             # Use a KDTree to efficiently find the closest mdt point for each boundary node
                             mdt_lons = self.mdt.x.values
@@ -525,9 +607,7 @@ class Bctides:
                                 )
                             # Extract the mdt values for these points
                             mdt_values = mdt_values[indices]
-                            for n in range(num_nodes):
-                                mdt_val = float(mdt_values[n])
-                                f.write(f"{mdt_val:.6f} 0.0\n")
+                            f.write(_format_rows("%.6f 0.0\n", mdt_values[:, None]))
                         else:
                             # If mdt is not a float or xr.Dataset, raise an error
                             logger.error(
@@ -537,9 +617,7 @@ class Bctides:
                     logger.info(f"Processing tide for boundary {ibnd+1}")
                     logger.info(f"Number of boundary nodes: {len(lons)}")
                     logger.info(f"Number of tidal coefficients: {len(self.tnames)}")
-                    all_tidal_data = self._interpolate_tidal_data(
-                                lons, lats, self.tnames, "h"
-                            )
+                    all_tidal_data = elev_tides[ibnd]
                     logger.info(f'Tidal_data shape: {all_tidal_data.shape}')
                     for i, tname in enumerate(self.tnames):
 
@@ -559,10 +637,7 @@ class Bctides:
                             f.write(f"{tname}\n")
 
                             # Write amplitude and phase for each node
-                            for n in range(num_nodes):
-                                f.write(
-                                    f"{tidal_data[n,0]:8.6f} {tidal_data[n,1]:.6f}\n"
-                                )
+                            f.write(_format_rows("%8.6f %.6f\n", tidal_data))
                         except Exception as e:
                             # Log error but continue with other constituents
                             logger.error(
@@ -581,27 +656,24 @@ class Bctides:
                     f.write("eta_mean\n")
 
                     # Write mean elevation for each node (use 0 as default)
-                    for n in range(num_nodes):
-                        f.write("0.0\n")  # Default mean elevation
+                    f.write("0.0\n" * num_nodes)
 
                     # Write mean normal velocity marker
                     f.write("vn_mean\n")
 
-                    # Write mean normal velocity for each node
-                    for n in range(num_nodes):
-                        f.write("0.0\n")  # Default mean normal velocity
+                    # Write mean normal velocity for each node (use 0 as default)
+                    f.write("0.0\n" * num_nodes)
                 # Type 1: Time history of discharge
                 elif vel_type == 1:
                     f.write("! Time history of discharge will be read from flux.th\n")
                 # Type 2: Constant discharge
                 elif vel_type == 2 and len(self.vthconst) > 0:
                     vth_val = self.vthconst[ibnd] if ibnd < len(self.vthconst) else 0.0
-                    for n in range(num_nodes):
-                        # Write as integer if it's a whole number, otherwise as float
-                        if vth_val == int(vth_val):
-                            f.write(f"{int(vth_val)}\n")
-                        else:
-                            f.write(f"{vth_val}\n")
+                    # Write as integer if it's a whole number, otherwise as float
+                    if vth_val == int(vth_val):
+                        f.write(f"{int(vth_val)}\n" * num_nodes)
+                    else:
+                        f.write(f"{vth_val}\n" * num_nodes)
                 # Type -4: Relaxed velocity with 3D input
                 elif vel_type == -4:
                     f.write("! 3D velocity will be read from uv3D.th.nc\n")
@@ -625,9 +697,8 @@ class Bctides:
                 if vel_type in {3, 5}:
                     if self.mdt is not None:
                         f.write("z0\n")
-                        for n in range(num_nodes):
-                            f.write("0.0 0.0 0.0 0.0\n")
-                    all_vel_data = self._interpolate_tidal_data(lons, lats, self.tnames, "uv")
+                        f.write("0.0 0.0 0.0 0.0\n" * num_nodes)
+                    all_vel_data = vel_tides[ibnd]
 
                     for i, tname in enumerate(self.tnames):
                         # Write header for constituent first
@@ -653,11 +724,7 @@ class Bctides:
                             vel_data[:, 3] = vel_data[:, 3] % 360.0
 
                         # Write u/v amplitude and phase for each node
-                        for n in range(num_nodes):
-                            f.write(
-                                f"{vel_data[n,0]:8.6f} {vel_data[n,1]:.6f} "
-                                f"{vel_data[n,2]:8.6f} {vel_data[n,3]:.6f}\n"
-                            )
+                        f.write(_format_rows("%8.6f %.6f %8.6f %.6f\n", vel_data))
                         # else:
                         #     # If no velocity file, use zeros to ensure file structure is complete
                         #     logger.warning(
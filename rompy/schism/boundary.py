@@ -13,12 +13,13 @@ import pandas as pd
 import xarray as xr
 
 from rompy.logging import get_logger
+from rompy.schism.gr3 import load_hgrid
 
 logger = get_logger(__name__)
 
 # Import PyLibs functions directly
 from pylib import *
-from src.schism_file import read_schism_hgrid, read_schism_vgrid
+from src.schism_file import read_schism_vgrid
 
 
 class BoundaryData:
@@ -49,9 +50,10 @@ class BoundaryData:
         self.boundary_indexes = boundary_indexes
         self.source_data = source_data
 
-        # Load grid using PyLibs if path is provided
+        # Load grid using PyLibs if path is provided, shared with other consumers
+        # of the same hgrid through the parsed mesh cache
         if self.grid_path is not None and os.path.exists(self.grid_path):
-            self.grid = read_schism_hgrid(str(self.grid_path))
+            self.grid = load_hgrid(self.grid_path)
         else:
             self.grid = None
 
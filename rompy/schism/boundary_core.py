@@ -165,6 +165,16 @@ class TidalDataset(BaseModel):
         description="Extra tidal databases loaded from database.json if present",
     )
 
+    cache_dir: Optional[Path] = Field(
+        None,
+        description=(
+            "Directory to cache the tidal constants extracted at the open boundary "
+            "nodes in. Later runs with the same tidal model, constituents, boundary "
+            "nodes and extrapolation settings read them from the cache instead of the "
+            "tidal model. No caching if None."
+        ),
+    )
+
     def get(self, grid) -> Dict[str, Any]:
         """Get the tidal dataset as a dictionary."""
 
@@ -762,6 +772,7 @@ class BoundaryHandler(BoundaryData):
             extrapolate_tides=self.tidal_data.extrapolate_tides,
             extrapolation_distance=self.tidal_data.extrapolation_distance,
             extra_databases=self.tidal_data.extra_databases,
+            tidal_cache_dir=self.tidal_data.cache_dir,
             mdt=getattr(
                 self.tidal_data, "_mdt", self.tidal_data.mean_dynamic_topography
             ),
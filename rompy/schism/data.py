@@ -2,14 +2,17 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, Literal, Optional, Union
 
+import dask.array as da
 import numpy as np
 import pandas as pd
-import scipy as sp
 import xarray as xr
-from pydantic import ConfigDict, Field, model_validator
+from pydantic import ConfigDict, Field, field_validator, model_validator
+from pydantic_core import PydanticSerializationError
 
 from rompy.core.boundary import BoundaryWaveStation, DataBoundary
+from rompy.core.cache import cache_key
 from rompy.core.data import DataBlob, DataGrid
+from rompy.core.parallel import run_tasks
 from rompy.core.time import TimeRange
 from rompy.core.types import RompyBaseModel
 from rompy.formatting import ARROW
@@ -17,6 +20,7 @@ from rompy.logging import get_logger
 from rompy.schism.boundary_core import (BoundaryHandler, ElevationType,
                                         TidalDataset, TracerType, VelocityType)
 from rompy.schism.grid import SCHISMGrid
+from rompy.schism.interpolation import VerticalRemap, boundary_zcor
 from rompy.schism.tides_enhanced import BoundarySetup
 from rompy.utils import total_seconds
 
@@ -62,6 +66,14 @@ class SfluxSource(DataGrid):
         default=[0, 1],
         description="Number of source data timesteps to buffer the time range if `filter_time` is True",
     )
+    split: Optional[Union[Literal["day"], int]] = Field(
+        None,
+        description="Write one sflux file per day or per this number of time steps, all times are written to a single file if None",
+    )
+    dtype: Literal["float64", "float32"] = Field(
+        "float64",
+        description="Data type of the variables in the sflux files",
+    )
     # The source field needs special handling
     source: Any = None
     _variable_names = []
@@ -89,10 +101,84 @@ class SfluxSource(DataGrid):
         # Initialize variable names
         self._set_variables()
 
+    @field_validator("split")
+    @classmethod
+    def split_gt_zero(cls, v):
+        if isinstance(v, int) and v <= 0:
+            raise ValueError("Number of time steps per file must be greater than zero")
+        return v
+
     @property
     def outfile(self) -> str:
-        # TODO - filenumber is. Hardcoded to 1 for now.
-        return f'{self.id}.{str(1).rjust(4, "0")}.nc'
+        return self._filename(1)
+
+    def _filename(self, number: int) -> str:
+        """Name of the sflux file with the given sequence number."""
+        if not 1 <= number <= 9999:
+            raise ValueError(f"SCHISM reads up to 9999 sflux files, got {number}")
+        return f'{self.id}.{str(number).rjust(4, "0")}.nc'
+
+    def _split_times(self, times: xr.DataArray) -> list[slice]:
+        """Time index ranges written to each sflux file."""
+        if self.split is None:
+            return [slice(None)]
+        if self.split == "day":
+            days = times.dt.floor("D").values
+            starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+        else:
+            starts = np.arange(0, times.size, self.split)
+        ends = np.r_[starts[1:], times.size]
+        return [slice(start, end) for start, end in zip(starts, ends)]
+
+    def get(
+        self,
+        destdir: str | Path,
+        grid: Optional[SCHISMGrid] = None,
+        time: Optional[TimeRange] = None,
+    ) -> Union[Path, list[Path]]:
+        """Write the sflux data, optionally split into a sequence of files.
+
+        The data are chunked over time so they are streamed from the source to the
+        files one time step at a time rather than loaded in memory at once, split
+        files are written together from a single dask graph.
+
+        Parameters
+        ----------
+        destdir : str | Path
+            The destination directory to write the sflux files to.
+        grid: SCHISMGrid, optional
+            The grid to filter the data to, only used if `self.crop_data` is True.
+        time: TimeRange, optional
+            The times to filter the data to, only used if `self.crop_data` is True.
+
+        Returns
+        -------
+        outfile: Path | list[Path]
+            The path to the written file, or to each written file if `split` is set.
+
+        """
+        if self.crop_data:
+            if grid is not None:
+                self._filter_grid(grid)
+            if time is not None:
+                self._filter_time(time)
+        ds = self.ds.chunk({"time": 1})
+        if self.dtype != "float64":
+            for var in ds.data_vars:
+                ds[var].encoding["dtype"] = np.dtype(self.dtype)
+
+        if self.split is None:
+            outfile = Path(destdir) / self.outfile
+            ds.to_netcdf(outfile)
+            return outfile
+
+        datasets, outfiles = [], []
+        for number, times in enumerate(self._split_times(ds.time), start=1):
+            datasets.append(self._set_time_attrs(ds.isel(time=times)))
+            outfiles.append(Path(destdir) / self._filename(number))
+        logger.debug(f"Writing {len(outfiles)} sflux files for {self.id}")
+        xr.save_mfdataset(datasets, outfiles)
+        return outfiles
 
     def _set_variables(self) -> None:
         for variable in self._variable_names:
@@ -134,6 +220,23 @@ class SfluxSource(DataGrid):
         lon, lat = np.meshgrid(ds[self.coords.x], ds[self.coords.y])
         ds["lon"] = (("ny_grid", "nx_grid"), lon)
         ds["lat"] = (("ny_grid", "nx_grid"), lat)
+        ds = self._set_time_attrs(ds)
+
+        # SCHISM doesn't like scale_factor and add_offset attributes and requires Float64 values
+        for var in ds.data_vars:
+            # If the variable has scale_factor or add_offset attributes, remove them
+            if "scale_factor" in ds[var].encoding:
+                del ds[var].encoding["scale_factor"]
+            if "add_offset" in ds[var].encoding:
+                del ds[var].encoding["add_offset"]
+            # set the data variable encoding to Float64
+            ds[var].encoding["dtype"] = np.dtypes.Float64DType()
+
+        return ds
+
+    @staticmethod
+    def _set_time_attrs(ds: xr.Dataset) -> xr.Dataset:
+        """Set the sflux base date and time units from the first time in ds."""
         basedate = pd.to_datetime(ds.time.values[0])
         unit = f"days since {basedate.strftime('%Y-%m-%d %H:%M:%S')}"
         ds.time.attrs = {
@@ -151,22 +254,15 @@ class SfluxSource(DataGrid):
                     ]
                 )
             ),
-            # "units": unit,
         }
-        ds.time.encoding["units"] = unit
-        ds.time.encoding["calendar"] = "proleptic_gregorian"
-        # open bad dataset
-
-        # SCHISM doesn't like scale_factor and add_offset attributes and requires Float64 values
-        for var in ds.data_vars:
-            # If the variable has scale_factor or add_offset attributes, remove them
-            if "scale_factor" in ds[var].encoding:
-                del ds[var].encoding["scale_factor"]
-            if "add_offset" in ds[var].encoding:
-                del ds[var].encoding["add_offset"]
-            # set the data variable encoding to Float64
-            ds[var].encoding["dtype"] = np.dtypes.Float64DType()
-
+        # Fractional days can't be encoded as integers, which would make xarray
+        # fall back to finer units than the days SCHISM reads
+        ds.time.encoding = {
+            **ds.time.encoding,
+            "units": unit,
+            "calendar": "proleptic_gregorian",
+            "dtype": np.dtype("float64"),
+        }
         return ds
 
 
@@ -282,18 +378,30 @@ class SfluxAir(SfluxSource):
 
     @property
     def ds(self):
-        """Return the xarray dataset for this data source."""
+        """Return the xarray dataset for this data source.
+
+        Variables missing from the source are filled with constant proxies shaped
+        like the zonal wind. The proxies are lazy dask arrays with one chunk per time
+        step so they are only allocated a time step at a time when written.
+
+        """
         ds = super().ds
+        uwind = ds[self.uwind_name]
         for variable in self._variable_names:
             data_var = getattr(self, variable)
             if data_var is None:
                 proxy_var = variable.replace("_name", "")
-                ds[proxy_var] = ds[self.uwind_name].copy()
                 if variable == "spfh_name":
                     missing = 0.01
                 else:
                     missing = -999
-                ds[proxy_var][:, :, :] = missing
+                data = da.full(
+                    uwind.shape,
+                    missing,
+                    dtype=uwind.dtype,
+                    chunks=(1,) + uwind.shape[1:],
+                )
+                ds[proxy_var] = uwind.copy(deep=False, data=data)
                 ds.data_vars[proxy_var].attrs["long_name"] = proxy_var
         return ds
 
@@ -610,11 +718,27 @@ class SCHISMDataBoundary(DataBoundary):
         description="Number of source data timesteps to buffer the time range if `filter_time` is True",
     )
 
+    def _group_key(self) -> Optional[str]:
+        """Key shared by boundary sources that select the same data.
+
+        Sources only differing in their id and variables read the same dataset with
+        the same filters and selection settings, so their variables can be selected
+        at the boundary points together. None if the source can't be serialised to
+        compare it with other sources.
+
+        """
+        try:
+            config = self.model_dump(mode="json", exclude={"id", "variables"})
+        except PydanticSerializationError:
+            return None
+        return cache_key(type(self).__name__, config)
+
     def get(
         self,
         destdir: str | Path,
         grid: SCHISMGrid,
         time: Optional[TimeRange] = None,
+        ds: Optional[xr.Dataset] = None,
     ) -> str:
         """Write the selected boundary data to a netcdf file.
         Parameters
@@ -625,6 +749,8 @@ class SCHISMDataBoundary(DataBoundary):
             Grid instance to use for selecting the boundary points.
         time: TimeRange, optional
             The times to filter the data to, only used if `self.crop_data` is True.
+        ds: xr.Dataset, optional
+            Data already selected at the boundary points, see `boundary_ds`.
 
         Returns
         -------
@@ -634,7 +760,7 @@ class SCHISMDataBoundary(DataBoundary):
         """
         # prepare xarray.Dataset and save forcing netCDF file
         outfile = Path(destdir) / f"{self.id}.th.nc"
-        boundary_ds = self.boundary_ds(grid, time)
+        boundary_ds = self.boundary_ds(grid, time, ds=ds)
         boundary_ds.to_netcdf(outfile, "w", "NETCDF3_CLASSIC", unlimited_dims="time")
 
         # Log file details with dimensions
@@ -645,7 +771,12 @@ class SCHISMDataBoundary(DataBoundary):
             logger.debug(f"Saved boundary data to {outfile}")
         return outfile
 
-    def boundary_ds(self, grid: SCHISMGrid, time: Optional[TimeRange]) -> xr.Dataset:
+    def boundary_ds(
+        self,
+        grid: SCHISMGrid,
+        time: Optional[TimeRange],
+        ds: Optional[xr.Dataset] = None,
+    ) -> xr.Dataset:
         """Generate SCHISM boundary dataset from source data.
 
         This function extracts and formats boundary data for SCHISM from a source dataset.
@@ -657,6 +788,10 @@ class SCHISMDataBoundary(DataBoundary):
             The SCHISM grid to extract boundary data for
         time : Optional[TimeRange]
             The time range to filter data to, if crop_data is True
+        ds : Optional[xr.Dataset]
+            Data already selected at the boundary points with `_sel_boundary`, e.g.
+            shared by several sources of the same dataset. The time filter is not
+            applied to it. Selected from the source if not provided.
 
         Returns
         -------
@@ -664,11 +799,12 @@ class SCHISMDataBoundary(DataBoundary):
             Dataset formatted for SCHISM boundary input
         """
         logger.debug(f"Fetching {self.id}")
-        if self.crop_data and time is not None:
-            self._filter_time(time)
+        if ds is None:
+            if self.crop_data and time is not None:
+                self._filter_time(time)
 
-        # Extract boundary data from source
-        ds = self._sel_boundary(grid)
+            # Extract boundary data from source
+            ds = self._sel_boundary(grid)
 
         # Calculate time step
         if len(ds.time) > 1:
@@ -770,9 +906,9 @@ class SCHISMDataBoundary(DataBoundary):
                 raise ValueError("No open boundary nodes found in the grid")
 
             # Collect all boundary nodes
-            boundary_indices = []
-            for i in range(gd.nob):
-                boundary_indices.extend(gd.iobn[i])
+            boundary_indices = np.concatenate(
+                [np.asarray(gd.iobn[i]) for i in range(gd.nob)]
+            )
 
             # Get bathymetry for boundary nodes
             boundary_depths = gd.dp[boundary_indices]
@@ -780,150 +916,35 @@ class SCHISMDataBoundary(DataBoundary):
             # Get sigma levels from vgrid
             # Note: This assumes a simple sigma or SZ grid format
             # For more complex vgrids, more sophisticated extraction would be needed
+            sigma_levels = np.array([-1.0, 0.0])
+            z_levels = np.array([])
             if vgd is not None:
                 if hasattr(vgd, "sigma"):
                     sigma_levels = vgd.sigma.copy()
-                    num_sigma_levels = len(sigma_levels)
-                else:
-                    # Default sigma levels if not available
-                    sigma_levels = np.array([-1.0, 0.0])
-                    num_sigma_levels = 2
-
                 # Get fixed z levels if available
                 if hasattr(vgd, "ztot"):
                     z_levels = vgd.ztot
-                else:
-                    z_levels = np.array([])
 
-            # For each boundary point, determine the total number of vertical levels
-            # and create appropriate zcor arrays
-            all_zcors = []
-            all_nvrt = []
-
-            for i, (node_idx, depth) in enumerate(
-                zip(boundary_indices, boundary_depths)
-            ):
-                # Check if we're in deep water (depth > first z level)
-                if z_levels.size > 0 and depth > z_levels[0]:
-                    # In deep water, find applicable z levels (between first z level and actual depth)
-                    first_z_level = z_levels[0]
-                    z_mask = (z_levels > first_z_level) & (z_levels < depth)
-                    applicable_z = z_levels[z_mask] if np.any(z_mask) else []
+            # Vertical levels and number of levels at each boundary point, deep
+            # points use the sigma levels down to the first z level followed by the
+            # z levels above the actual depth, shallow points only use sigma levels
+            zcor, all_nvrt = boundary_zcor(boundary_depths, sigma_levels, z_levels)
+            max_nvrt = zcor.shape[1]
 
-                    # Total levels = sigma levels + applicable z levels
-                    total_levels = num_sigma_levels + len(applicable_z)
-
-                    # Create zcor for this boundary point
-                    node_zcor = np.zeros(total_levels)
-
-                    # First, calculate sigma levels using the first z level as the "floor"
-                    for j in range(num_sigma_levels):
-                        node_zcor[j] = first_z_level * sigma_levels[j]
-
-                    # Then, add the fixed z levels below the sigma levels
-                    for j, z_val in enumerate(applicable_z):
-                        node_zcor[num_sigma_levels + j] = z_val
-
-                else:
-                    # In shallow water, just use sigma levels scaled to the actual depth
-                    total_levels = num_sigma_levels
-
-                    # Create zcor for this boundary point
-                    node_zcor = np.zeros(total_levels)
-
-                    for j in range(total_levels):
-                        node_zcor[j] = depth * sigma_levels[j]
-
-                # Store this boundary point's zcor and number of levels
-                all_zcors.append(node_zcor)
-                all_nvrt.append(total_levels)
-
-            # Now we have a list of zcor arrays with potentially different lengths
-            # Find the maximum number of levels across all boundary points
-            max_nvrt = max(all_nvrt) if all_nvrt else num_sigma_levels
-
-            # Create a uniform zcor array with the maximum number of levels
-            zcor = np.zeros((len(boundary_indices), max_nvrt))
-
-            # Fill in the values, leaving zeros for levels beyond a particular boundary point's total
-            for i, (node_zcor, nvrt_i) in enumerate(zip(all_zcors, all_nvrt)):
-                zcor[i, :nvrt_i] = node_zcor
-
-            # Get source z-levels and prepare for interpolation
+            # Get source z-levels and interpolate all times, boundary points and
+            # components at once with weights computed once per boundary point
             sigma_values = (
                 ds[self.coords.z].values
                 if self.coords and self.coords.z
                 else np.array([0])
             )
-            data_shape = time_series.shape
-
-            # Initialize interpolated data array with the maximum number of vertical levels
-            if num_components == 1:
-                interpolated_data = np.zeros((data_shape[0], data_shape[1], max_nvrt))
-            else:
-                interpolated_data = np.zeros(
-                    (data_shape[0], data_shape[1], max_nvrt, data_shape[3])
-                )
-
-            # For each time step and boundary point
-            for t in range(data_shape[0]):  # time
-                for n in range(data_shape[1]):  # boundary points
-                    # Get z-coordinates for this point
-                    z_dest = zcor[n, :]
-                    nvrt_n = all_nvrt[
-                        n
-                    ]  # Get the number of vertical levels for this point
-
-                    if num_components == 1:
-                        # Extract vertical profile for single component
-                        profile = time_series[t, n, :, 0]
-
-                        # Create interpolator for this profile
-                        interp = sp.interpolate.interp1d(
-                            sigma_values,
-                            profile,
-                            kind="linear",
-                            bounds_error=False,
-                            fill_value="extrapolate",
-                        )
-
-                        # Interpolate to SCHISM levels for this boundary point
-                        # Only interpolate up to the actual number of levels for this point
-                        interpolated_data[t, n, :nvrt_n] = interp(z_dest[:nvrt_n])
-                    else:
-                        # Handle multiple components (e.g., u,v for velocity)
-                        for c in range(num_components):
-                            # Extract vertical profile for this component
-                            profile = time_series[t, n, :, c]
-
-                            # Create interpolator for this profile
-                            interp = sp.interpolate.interp1d(
-                                sigma_values,
-                                profile,
-                                kind="linear",
-                                bounds_error=False,
-                                fill_value="extrapolate",
-                            )
-
-                            # Interpolate to SCHISM levels for this boundary point
-                            # Only interpolate up to the actual number of levels for this point
-                            interpolated_data[t, n, :nvrt_n, c] = interp(
-                                z_dest[:nvrt_n]
-                            )
-
-            # Replace data with interpolated values
-            data = interpolated_data
-            if num_components == 1:
-                time_series = np.expand_dims(data, axis=3)
-            else:
-                time_series = data
+            remap = VerticalRemap(sigma_values, zcor, all_nvrt)
+            time_series = remap(time_series)
 
             # Store the variable vertical levels in the output dataset
             # Create a 2D array where each row contains the vertical levels for a boundary node
             # For nodes with fewer levels, pad with NaN
-            vert_levels = np.full((len(boundary_indices), max_nvrt), np.nan)
-            for i, (node_zcor, nvrt_i) in enumerate(zip(all_zcors, all_nvrt)):
-                vert_levels[i, :nvrt_i] = node_zcor
+            vert_levels = np.where(remap.valid, zcor, np.nan)
 
             # Create output dataset
             schism_ds = xr.Dataset(
@@ -1053,6 +1074,16 @@ class SCHISMData(RompyBaseModel):
     boundary_conditions: Optional["SCHISMDataBoundaryConditions"] = Field(
         None, description="unified boundary conditions (replaces tides and ocean)"
     )
+    workers: int = Field(
+        1,
+        description=(
+            "Number of threads used to process the atmos, wave and "
+            "boundary_conditions components concurrently. Components are processed "
+            "one after another if 1, otherwise the errors of all failed components are "
+            "reported together"
+        ),
+        ge=1,
+    )
 
     def get(
         self,
@@ -1086,36 +1117,49 @@ class SCHISMData(RompyBaseModel):
         if not destdir.exists():
             destdir.mkdir(parents=True, exist_ok=True)
 
-        results = {}
+        tasks = {}
 
         # Process atmospheric data
         if self.atmos:
-            logger.info(f"{ARROW} Processing atmospheric forcing data")
-            results["atmos"] = self.atmos.get(destdir, grid, time)
-            logger.info(f"{ARROW} Atmospheric data processed successfully")
+
+            def atmos():
+                logger.info(f"{ARROW} Processing atmospheric forcing data")
+                result = self.atmos.get(destdir, grid, time)
+                logger.info(f"{ARROW} Atmospheric data processed successfully")
+                return result
+
+            tasks["atmos"] = atmos
 
         # Process wave data
         if self.wave:
-            logger.info(f"{ARROW} Processing wave boundary data")
-            # Get source information
-            if hasattr(self.wave, 'source') and hasattr(self.wave.source, 'uri'):
-                logger.info(f"  • Source: {self.wave.source.uri}")
-            elif hasattr(self.wave, 'source') and hasattr(self.wave.source, 'catalog_uri'):
-                logger.info(f"  • Source: {self.wave.source.catalog_uri} (dataset: {getattr(self.wave.source, 'dataset_id', 'unknown')})")
 
-            results["wave"] = self.wave.get(destdir, grid, time)
-            logger.info(f"  • Output: {results['wave']}")
-            logger.info(f"{ARROW} Wave data processed successfully")
+            def wave():
+                logger.info(f"{ARROW} Processing wave boundary data")
+                # Get source information
+                if hasattr(self.wave, 'source') and hasattr(self.wave.source, 'uri'):
+                    logger.info(f"  • Source: {self.wave.source.uri}")
+                elif hasattr(self.wave, 'source') and hasattr(self.wave.source, 'catalog_uri'):
+                    logger.info(f"  • Source: {self.wave.source.catalog_uri} (dataset: {getattr(self.wave.source, 'dataset_id', 'unknown')})")
+
+                result = self.wave.get(destdir, grid, time)
+                logger.info(f"  • Output: {result}")
+                logger.info(f"{ARROW} Wave data processed successfully")
+                return result
+
+            tasks["wave"] = wave
 
         # Process boundary conditions
         if self.boundary_conditions:
-            logger.info(f"{ARROW} Processing boundary conditions")
-            results["boundary_conditions"] = self.boundary_conditions.get(
-                destdir, grid, time
-            )
-            logger.info(f"{ARROW} Boundary conditions processed successfully")
 
-        return results
+            def boundary_conditions():
+                logger.info(f"{ARROW} Processing boundary conditions")
+                result = self.boundary_conditions.get(destdir, grid, time)
+                logger.info(f"{ARROW} Boundary conditions processed successfully")
+                return result
+
+            tasks["boundary_conditions"] = boundary_conditions
+
+        return run_tasks(tasks, workers=self.workers)
 
     def _format_value(self, obj):
         """Custom formatter for SCHISMData values.
@@ -1389,6 +1433,26 @@ class SCHISMDataBoundaryConditions(RompyBaseModel):
         None, description="Configuration for hotstart file generation"
     )
 
+    workers: int = Field(
+        1,
+        description=(
+            "Number of threads used to fetch the boundary data sources concurrently. "
+            "Sources are fetched one after another if 1, otherwise the errors of all "
+            "failed sources are reported together"
+        ),
+        ge=1,
+    )
+
+    group_sources: bool = Field(
+        True,
+        description=(
+            "Extract the ocean boundary sources reading the same dataset with the "
+            "same filters together, opening the dataset and selecting all their "
+            "variables at the boundary points once before writing the file of each "
+            "source"
+        ),
+    )
+
     @model_validator(mode="before")
     @classmethod
     def convert_numpy_types(cls, data):
@@ -1657,7 +1721,9 @@ class SCHISMDataBoundaryConditions(RompyBaseModel):
                 else:
                     logger.info(f"  • Sources: {len(source_files)} files")
 
-        # Process each data source based on the boundary type
+        # Process each data source based on the boundary type, the sources are
+        # independent so they may be fetched concurrently
+        sources = {}
         for idx, setup in self.boundaries.items():
             # Process elevation data if needed
             if setup.elev_type in [
@@ -1665,17 +1731,7 @@ class SCHISMDataBoundaryConditions(RompyBaseModel):
                 ElevationType.HARMONICEXTERNAL,
             ]:
                 if setup.elev_source:
-                    if (
-                        hasattr(setup.elev_source, "data_type")
-                        and setup.elev_source.data_type == "boundary"
-                    ):
-                        # Process using SCHISMDataBoundary interface
-                        setup.elev_source.id = "elev2D"  # Set the ID for the boundary
-                        file_path = setup.elev_source.get(destdir, grid, time)
-                    else:
-                        # Process using DataBlob interface
-                        file_path = setup.elev_source.get(str(destdir))
-                    processed_files[f"elev_boundary_{idx}"] = file_path
+                    sources[f"elev_boundary_{idx}"] = (setup.elev_source, "elev2D")
 
             # Process velocity data if needed
             if setup.vel_type in [
@@ -1684,47 +1740,21 @@ class SCHISMDataBoundaryConditions(RompyBaseModel):
                 VelocityType.RELAXED,
             ]:
                 if setup.vel_source:
-                    if (
-                        hasattr(setup.vel_source, "data_type")
-                        and setup.vel_source.data_type == "boundary"
-                    ):
-                        # Process using SCHISMDataBoundary interface
-                        setup.vel_source.id = "uv3D"  # Set the ID for the boundary
-                        file_path = setup.vel_source.get(destdir, grid, time)
-                    else:
-                        # Process using DataBlob interface
-                        file_path = setup.vel_source.get(str(destdir))
-                    processed_files[f"vel_boundary_{idx}"] = file_path
+                    sources[f"vel_boundary_{idx}"] = (setup.vel_source, "uv3D")
 
             # Process temperature data if needed
             if setup.temp_type == TracerType.EXTERNAL:
                 if setup.temp_source:
-                    if (
-                        hasattr(setup.temp_source, "data_type")
-                        and setup.temp_source.data_type == "boundary"
-                    ):
-                        # Process using SCHISMDataBoundary interface
-                        setup.temp_source.id = "TEM_3D"  # Set the ID for the boundary
-                        file_path = setup.temp_source.get(destdir, grid, time)
-                    else:
-                        # Process using DataBlob interface
-                        file_path = setup.temp_source.get(str(destdir))
-                    processed_files[f"temp_boundary_{idx}"] = file_path
+                    sources[f"temp_boundary_{idx}"] = (setup.temp_source, "TEM_3D")
 
             # Process salinity data if needed
             if setup.salt_type == TracerType.EXTERNAL:
                 if setup.salt_source:
-                    if (
-                        hasattr(setup.salt_source, "data_type")
-                        and setup.salt_source.data_type == "boundary"
-                    ):
-                        # Process using SCHISMDataBoundary interface
-                        setup.salt_source.id = "SAL_3D"  # Set the ID for the boundary
-                        file_path = setup.salt_source.get(destdir, grid, time)
-                    else:
-                        # Process using DataBlob interface
-                        file_path = setup.salt_source.get(str(destdir))
-                    processed_files[f"salt_boundary_{idx}"] = file_path
+                    sources[f"salt_boundary_{idx}"] = (setup.salt_source, "SAL_3D")
+
+        tasks = self._source_tasks(sources, destdir, grid, time)
+        for files in run_tasks(tasks, workers=self.workers).values():
+            processed_files.update(files)
 
         # Generate hotstart file if configured
         if self.hotstart_config and self.hotstart_config.enabled:
@@ -1740,6 +1770,86 @@ class SCHISMDataBoundaryConditions(RompyBaseModel):
 
         return processed_files
 
+    def _source_tasks(
+        self, sources: dict, destdir: Path, grid: SCHISMGrid, time: TimeRange
+    ) -> dict:
+        """Tasks fetching the boundary data sources into destdir.
+
+        Parameters
+        ----------
+        sources : dict
+            Tuples of data source and SCHISM th id keyed on the processed file name.
+
+        Returns
+        -------
+        dict
+            Tasks returning the paths of the files they write keyed on their names.
+            Ocean boundary sources reading the same data are fetched by a single
+            task if `group_sources` is True.
+
+        """
+        groups = {}
+        for name, (source, id) in sources.items():
+            key = None
+            if self.group_sources and getattr(source, "data_type", None) == "boundary":
+                key = source._group_key()
+            # Sources that can't be grouped are keyed on their own name
+            groups.setdefault(key or name, {})[name] = (source, id)
+
+        tasks = {}
+        for members in groups.values():
+            if len(members) == 1:
+                [(name, (source, id))] = members.items()
+                task = self._source_task(source, id, destdir, grid, time)
+                tasks[name] = lambda name=name, task=task: {name: task()}
+            else:
+                tasks["+".join(members)] = (
+                    lambda members=members: self._group_task(
+                        members, destdir, grid, time
+                    )
+                )
+        return tasks
+
+    @staticmethod
+    def _source_task(source, id: str, destdir: Path, grid: SCHISMGrid, time: TimeRange):
+        """Task fetching a boundary data source into destdir."""
+        if hasattr(source, "data_type") and source.data_type == "boundary":
+            # Process using SCHISMDataBoundary interface, the ID names the file. The
+            # source may be shared with other boundaries so a renamed copy is fetched
+            return lambda: source.model_copy(update={"id": id}).get(destdir, grid, time)
+        # Process using DataBlob interface
+        return lambda: source.get(str(destdir))
+
+    @staticmethod
+    def _group_task(
+        members: dict, destdir: Path, grid: SCHISMGrid, time: TimeRange
+    ) -> dict:
+        """Fetch ocean boundary sources reading the same data in a single pass.
+
+        The dataset is opened and all the variables of the sources are selected at
+        the boundary points at once, each source then formats its own variables
+        from the selected data and writes its file.
+
+        """
+        sources = [source for source, _ in members.values()]
+        variables = list(dict.fromkeys(v for s in sources for v in s.variables))
+        combined = sources[0].model_copy(update={"variables": variables}, deep=True)
+        ids = ", ".join(dict.fromkeys(id for _, id in members.values()))
+        logger.debug(f"Selecting {', '.join(variables)} for {ids} in a single pass")
+        if combined.crop_data and time is not None:
+            combined._filter_time(time)
+        ds = combined._sel_boundary(grid).load()
+
+        files, written = {}, {}
+        for name, (source, id) in members.items():
+            # Sources shared between boundaries write the same file only once
+            token = (id, tuple(source.variables))
+            if token not in written:
+                source.id = id
+                written[token] = source.get(destdir, grid, time, ds=ds)
+            files[name] = written[token]
+        return files
+
     def _generate_hotstart(
         self,
         destdir: Union[str, Path],
@@ -0,0 +1,531 @@
+"""
+Bulk reader and writer for SCHISM gr3 files.
+
+Node and element blocks are parsed and formatted as NumPy arrays in chunks of
+rows rather than one line at a time, so reading and writing multi-million element
+meshes is fast while temporaries stay bounded by the chunk size.
+
+Parsed meshes are cached in memory, and PyLibs hgrid objects optionally as npz
+files, keyed on the content of the gr3 file so the ASCII mesh is parsed once and
+its read-only arrays are shared by all the consumers of the same grid.
+"""
+
+import copy
+import os
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field, fields, replace
+from itertools import islice
+from pathlib import Path
+from typing import Optional, TextIO, Union
+
+import numpy as np
+from pylib import schism_grid, zdata
+
+from rompy.core.cache import file_hash
+from rompy.logging import get_logger
+
+logger = get_logger(__name__)
+
+CHUNK_SIZE = 100_000
+
+# Bump when the layout of the cached mesh files changes
+MESH_CACHE_VERSION = 2
+
+# Subdirectory of the cache directory holding the npz meshes, kept apart from the
+# files managed by rompy.core.cache.FileCache so they are not evicted with them
+MESH_CACHE_SUBDIR = "meshes"
+
+# Parsed meshes keyed on the file hash, least recently used evicted first
+_MESHES: OrderedDict = OrderedDict()
+_HGRIDS: OrderedDict = OrderedDict()
+_MAX_HGRIDS = 4
+
+
+@dataclass
+class Gr3Mesh:
+    """Arrays describing a horizontal SCHISM mesh read from a gr3 file.
+
+    Node indices in `elnode` and in the boundary lists are zero-based, unused
+    vertices of triangular elements in `elnode` are set to -1.
+
+    """
+
+    description: str
+    x: np.ndarray
+    y: np.ndarray
+    values: np.ndarray
+    i34: np.ndarray
+    elnode: np.ndarray
+    open_boundaries: list[np.ndarray] = field(default_factory=list)
+    land_boundaries: list[np.ndarray] = field(default_factory=list)
+    land_types: list[int] = field(default_factory=list)
+
+    @property
+    def np(self) -> int:
+        """Number of nodes."""
+        return self.x.size
+
+    @property
+    def ne(self) -> int:
+        """Number of elements."""
+        return self.i34.size
+
+    @classmethod
+    def from_hgrid(cls, gd: schism_grid) -> "Gr3Mesh":
+        """Create from a PyLibs schism_grid."""
+        elnode = np.where(gd.elnode < 0, -1, gd.elnode)
+        return cls(
+            description=Path(str(getattr(gd, "source_file", ""))).name,
+            x=gd.x,
+            y=gd.y,
+            values=gd.dp,
+            i34=gd.i34,
+            elnode=elnode,
+            open_boundaries=[np.asarray(b) for b in getattr(gd, "iobn", [])],
+            land_boundaries=[np.asarray(b) for b in getattr(gd, "ilbn", [])],
+        )
+
+
+def _first_int(line: str) -> int:
+    """Integer at the start of a line such as `94 = Number of open boundaries`."""
+    return int(line.split()[0])
+
+
+def _read_nodes(f: TextIO, nnodes: int, chunk_size: int) -> np.ndarray:
+    """Read the node block into an (nnodes, 3) array of x, y, value."""
+    nodes = np.empty((nnodes, 3))
+    for start in range(0, nnodes, chunk_size):
+        lines = list(islice(f, min(chunk_size, nnodes - start)))
+        block = np.array(" ".join(lines).split(), dtype=float).reshape(len(lines), -1)
+        nodes[start : start + len(lines)] = block[:, 1:4]
+    return nodes
+
+
+def _read_elements(
+    f: TextIO, nelements: int, chunk_size: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Read the element block into i34 and zero-based (nelements, 4) elnode."""
+    i34 = np.empty(nelements, dtype=np.int32)
+    elnode = np.full((nelements, 4), -1, dtype=np.int64)
+    for start in range(0, nelements, chunk_size):
+        lines = list(islice(f, min(chunk_size, nelements - start)))
+        stop = start + len(lines)
+        tokens = np.array(" ".join(lines).split(), dtype=np.int64)
+        if tokens.size == 5 * len(lines) and np.all(tokens[1::5] == 3):
+            # Fast path for chunks of triangles only
+            block = tokens.reshape(-1, 5)
+            i34[start:stop] = 3
+            elnode[start:stop, :3] = block[:, 2:] - 1
+        else:
+            for i, line in enumerate(lines, start):
+                row = line.split()
+                nv = int(row[1])
+                i34[i] = nv
+                elnode[i, :nv] = np.array(row[2 : 2 + nv], dtype=np.int64) - 1
+    return i34, elnode
+
+
+def _read_boundaries(f: TextIO, nnodes: int) -> tuple[list, list, list]:
+    """Read the optional open and land boundary sections."""
+    open_boundaries, land_boundaries, land_types = [], [], []
+    line = f.readline()
+    if not line.strip():
+        return open_boundaries, land_boundaries, land_types
+
+    nope = _first_int(line)
+    f.readline()  # Total number of open boundary nodes
+    for _ in range(nope):
+        nond = _first_int(f.readline())
+        open_boundaries.append(
+            np.array([_first_int(f.readline()) for _ in range(nond)]) - 1
+        )
+
+    line = f.readline()
+    if line.strip():
+        nland = _first_int(line)
+        f.readline()  # Total number of land boundary nodes
+        for _ in range(nland):
+            header = f.readline().split()
+            nlnd = int(header[0])
+            ibtype = int(header[1]) if len(header) > 1 and header[1].isdigit() else 0
+            land_types.append(ibtype)
+            land_boundaries.append(
+                np.array([_first_int(f.readline()) for _ in range(nlnd)]) - 1
+            )
+
+    for bnd in open_boundaries + land_boundaries:
+        if bnd.size and (bnd.min() < 0 or bnd.max() >= nnodes):
+            raise ValueError("iond > nnp")
+    return open_boundaries, land_boundaries, land_types
+
+
+def read_gr3(
+    path: Union[str, Path], boundaries: bool = True, chunk_size: int = CHUNK_SIZE
+) -> Gr3Mesh:
+    """Read a gr3 file such as hgrid.gr3.
+
+    Parameters
+    ----------
+    path : str | Path
+        Path of the gr3 file.
+    boundaries : bool
+        Read the open and land boundary sections if present.
+    chunk_size : int
+        Number of lines parsed at once.
+
+    Returns
+    -------
+    Gr3Mesh
+
+    """
+    with open(path, "r") as f:
+        description = f.readline().strip()
+        ne, nnodes = map(int, f.readline().split()[:2])
+        nodes = _read_nodes(f, nnodes, chunk_size)
+        i34, elnode = _read_elements(f, ne, chunk_size)
+        mesh = Gr3Mesh(
+            description=description,
+            x=nodes[:, 0],
+            y=nodes[:, 1],
+            values=nodes[:, 2],
+            i34=i34,
+            elnode=elnode,
+        )
+        if boundaries:
+            (
+                mesh.open_boundaries,
+                mesh.land_boundaries,
+                mesh.land_types,
+            ) = _read_boundaries(f, nnodes)
+    return mesh
+
+
+def _read_only(value):
+    """Make arrays, including those nested in object arrays and lists, read-only."""
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            for item in value.flat:
+                _read_only(item)
+        value.flags.writeable = False
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _read_only(item)
+    return value
+
+
+def _remember(cache: OrderedDict, key: str, value):
+    """Add a value to an in-memory mesh cache evicting the least recently used."""
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > _MAX_HGRIDS:
+        cache.popitem(last=False)
+
+
+def load_gr3(path: Union[str, Path]) -> Gr3Mesh:
+    """Read a gr3 file with :func:`read_gr3` once per file content.
+
+    The arrays of the returned mesh are read-only and shared by all the callers
+    reading the same file content.
+
+    """
+    key = file_hash(path)
+    if key in _MESHES:
+        _MESHES.move_to_end(key)
+        logger.debug(f"Using parsed mesh for {path} from memory")
+    else:
+        mesh = read_gr3(path)
+        for f in fields(mesh):
+            _read_only(getattr(mesh, f.name))
+        _remember(_MESHES, key, mesh)
+    return replace(_MESHES[key])
+
+
+def write_rows(
+    f: TextIO,
+    fmt: str,
+    columns: list,
+    nrows: int,
+    start: int = 1,
+    chunk_size: int = CHUNK_SIZE,
+):
+    """Write rows prefixed with a running index in preformatted chunks.
+
+    Parameters
+    ----------
+    f : TextIO
+        Open file to write to.
+    fmt : str
+        Row format including the leading index and the trailing newline, e.g.
+        `"%d %.8f %.8f\\n"`.
+    columns : list
+        Column arrays of length nrows or scalars broadcast to all rows.
+    nrows : int
+        Number of rows to write.
+    start : int
+        Index of the first row.
+    chunk_size : int
+        Number of rows formatted at once.
+
+    """
+    for i0 in range(0, nrows, chunk_size):
+        i1 = min(i0 + chunk_size, nrows)
+        block = [np.arange(start + i0, start + i1)]
+        for column in columns:
+            if np.ndim(column) == 0:
+                block.append(np.full(i1 - i0, column))
+            else:
+                block.append(np.asarray(column)[i0:i1])
+        values = np.column_stack(block).ravel().tolist()
+        f.write((fmt * (i1 - i0)) % tuple(values))
+
+
+def write_elements(
+    f: TextIO,
+    elnode: np.ndarray,
+    i34: Optional[np.ndarray] = None,
+    chunk_size: int = CHUNK_SIZE,
+):
+    """Write the element block `id nv n1 n2 n3 [n4]` from zero-based elnode."""
+    elnode = np.asarray(elnode)
+    ne = elnode.shape[0]
+    if i34 is None:
+        i34 = (elnode >= 0).sum(axis=1)
+    i34 = np.asarray(i34)
+    for i0 in range(0, ne, chunk_size):
+        i1 = min(i0 + chunk_size, ne)
+        nv = i34[i0:i1]
+        block = np.column_stack([np.arange(i0 + 1, i1 + 1), nv, elnode[i0:i1] + 1])
+        if np.all(nv == 3):
+            values = block[:, :5].ravel().tolist()
+            fmt = "%d %d %d %d %d\n" * (i1 - i0)
+        else:
+            mask = np.arange(block.shape[1])[None, :] < (nv[:, None] + 2)
+            values = block[mask].tolist()
+            fmt = "".join(np.where(nv == 3, "%d %d %d %d %d\n", "%d %d %d %d %d %d\n"))
+        f.write(fmt % tuple(values))
+
+
+def write_gr3(
+    path: Union[str, Path],
+    mesh: Gr3Mesh,
+    values: Union[float, np.ndarray],
+    description: str = "",
+    fmt: str = "%.8f",
+    footer: str = "",
+    chunk_size: int = CHUNK_SIZE,
+) -> Path:
+    """Write a gr3 file with node values on the mesh connectivity.
+
+    Parameters
+    ----------
+    path : str | Path
+        Path of the gr3 file to write.
+    mesh : Gr3Mesh
+        Mesh providing node coordinates and element connectivity.
+    values : float | np.ndarray
+        Node values, a constant is broadcast to all nodes without allocating them.
+    description : str
+        Description written in the first line.
+    fmt : str
+        Format of the node coordinates and values.
+    footer : str
+        Text written after the element block.
+    chunk_size : int
+        Number of rows formatted at once.
+
+    Returns
+    -------
+    Path
+
+    """
+    path = Path(path)
+    with open(path, "w", buffering=1 << 20) as f:
+        f.write(f"{description}\n{mesh.ne} {mesh.np}\n")
+        node_fmt = f"%d {fmt} {fmt} {fmt}\n"
+        write_rows(f, node_fmt, [mesh.x, mesh.y, values], mesh.np, chunk_size=chunk_size)
+        write_elements(f, mesh.elnode, mesh.i34, chunk_size=chunk_size)
+        f.write(footer)
+    return path
+
+
+def _pack(arrays: dict, name: str, value):
+    """Add an attribute of a schism_grid to the arrays written to npz.
+
+    Raises
+    ------
+    TypeError
+        If the attribute cannot be stored without pickle.
+
+    """
+    if isinstance(value, list):
+        # Lists are stored as arrays flagged to be converted back
+        arrays[f"{name}.list"] = np.asarray(True)
+        if any(isinstance(v, (list, np.ndarray)) for v in value):
+            ragged = np.empty(len(value), dtype=object)
+            for i, v in enumerate(value):
+                ragged[i] = np.asarray(v)
+            value = ragged
+        else:
+            value = np.asarray(value)
+    if value is None:
+        arrays[f"{name}.none"] = np.asarray(True)
+    elif isinstance(value, np.ndarray) and value.dtype == object:
+        # Ragged lists such as the land boundary nodes
+        parts = [np.asarray(v) for v in value]
+        if any(p.dtype == object for p in parts):
+            raise TypeError(f"Cannot store nested attribute {name} in mesh cache")
+        arrays[f"{name}.size"] = np.array([p.size for p in parts])
+        arrays[f"{name}.data"] = (
+            np.concatenate(parts) if parts else np.array([], dtype=int)
+        )
+    elif isinstance(value, (np.ndarray, np.generic, bool, int, float, str)):
+        arrays[name] = np.asarray(value)
+    else:
+        raise TypeError(
+            f"Cannot store attribute {name} of type {type(value).__name__} in the "
+            "mesh cache"
+        )
+
+
+def _unpack(npz) -> dict:
+    """Attributes of a schism_grid from the arrays read from npz."""
+    attrs = {}
+    for name in npz.files:
+        if name.endswith((".data", ".list", ".zdata")):
+            continue
+        if name.endswith(".none"):
+            attrs[name[: -len(".none")]] = None
+        elif name.endswith(".size"):
+            base = name[: -len(".size")]
+            sizes = npz[name]
+            ragged = np.empty(sizes.size, dtype=object)
+            parts = np.split(npz[f"{base}.data"], np.cumsum(sizes)[:-1])
+            for i, part in enumerate(parts[: sizes.size]):
+                ragged[i] = part
+            attrs[base] = ragged
+        else:
+            value = npz[name]
+            if value.ndim == 0:
+                value = value[()]
+                value = str(value) if isinstance(value, np.str_) else value
+            attrs[name] = value
+    for name in npz.files:
+        if name.endswith(".list"):
+            base = name[: -len(".list")]
+            attrs[base] = list(attrs[base])
+    return attrs
+
+
+def save_hgrid(gd: schism_grid, path: Union[str, Path]) -> Path:
+    """Write the arrays of a PyLibs schism_grid to an npz file.
+
+    Ragged lists are stored as concatenated values and sizes so the file can be
+    read without pickle. A TypeError is raised and nothing is written if any
+    attribute cannot be stored that way, so a loaded grid never lacks attributes.
+
+    """
+    path = Path(path)
+    arrays = {"version": np.asarray(MESH_CACHE_VERSION)}
+    for name, value in vars(gd).items():
+        if isinstance(value, zdata):
+            arrays[f"{name}.zdata"] = np.asarray(True)
+            for subname, subvalue in vars(value).items():
+                _pack(arrays, f"{name}:{subname}", subvalue)
+        else:
+            _pack(arrays, name, value)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.stem}.{uuid.uuid4().hex}.npz")
+    np.savez(tmp, **arrays)
+    os.replace(tmp, path)
+    return path
+
+
+def load_hgrid_npz(path: Union[str, Path]) -> schism_grid:
+    """Read a PyLibs schism_grid written by :func:`save_hgrid`."""
+    with np.load(path) as npz:
+        if int(npz["version"]) != MESH_CACHE_VERSION:
+            raise ValueError(f"Unsupported mesh cache version in {path}")
+        attrs = _unpack(npz)
+        groups = [n[: -len(".zdata")] for n in npz.files if n.endswith(".zdata")]
+    attrs.pop("version")
+    gd = schism_grid()
+    for group in groups:
+        setattr(gd, group, zdata())
+    for name, value in attrs.items():
+        if ":" in name:
+            group, subname = name.split(":", 1)
+            if group not in vars(gd):
+                setattr(gd, group, zdata())
+            setattr(getattr(gd, group), subname, value)
+        else:
+            setattr(gd, name, value)
+    return gd
+
+
+def _shared_copy(gd: schism_grid) -> schism_grid:
+    """Shallow copy of a cached grid sharing its read-only arrays."""
+    shared = copy.copy(gd)
+    for name, value in vars(gd).items():
+        if isinstance(value, zdata):
+            setattr(shared, name, copy.copy(value))
+    return shared
+
+
+def load_hgrid(
+    path: Union[str, Path], cache_dir: Optional[Union[str, Path]] = None
+) -> schism_grid:
+    """Load hgrid.gr3 as a PyLibs schism_grid with all properties computed.
+
+    The grid is parsed and `compute_all` and `compute_bnd` are called once per
+    file content, later calls get the grid kept in memory or read from the npz
+    cache file in the meshes subdirectory of cache_dir.
+
+    Each call returns a shallow copy so attributes can be added or replaced without
+    affecting other consumers, the arrays themselves are shared and read-only.
+
+    Parameters
+    ----------
+    path : str | Path
+        Path of the hgrid.gr3 file.
+    cache_dir : str | Path, optional
+        Directory of the npz mesh cache, only the in-memory cache is used if None.
+
+    Returns
+    -------
+    schism_grid
+
+    """
+    key = file_hash(path)
+    cache_file = None
+    if cache_dir:
+        cache_file = Path(cache_dir) / MESH_CACHE_SUBDIR / f"hgrid-{key}.npz"
+    if key in _HGRIDS:
+        gd = _HGRIDS[key]
+        logger.debug(f"Using parsed mesh for {path} from memory")
+    elif cache_file is not None and cache_file.is_file():
+        logger.info(f"Loading parsed mesh for {path} from {cache_file}")
+        gd = load_hgrid_npz(cache_file)
+    else:
+        logger.info(f"Parsing mesh {path}")
+        gd = schism_grid()
+        gd.read_hgrid(str(path))
+        gd.compute_all()
+        gd.compute_bnd()
+    if cache_file is not None and not cache_file.is_file():
+        logger.debug(f"Saving parsed mesh for {path} to {cache_file}")
+        try:
+            save_hgrid(gd, cache_file)
+        except TypeError as e:
+            logger.warning(f"Not caching parsed mesh for {path}: {e}")
+    if key not in _HGRIDS:
+        for value in vars(gd).values():
+            if isinstance(value, zdata):
+                for subvalue in vars(value).values():
+                    _read_only(subvalue)
+            else:
+                _read_only(value)
+    _remember(_HGRIDS, key, gd)
+    gd = _shared_copy(gd)
+    gd.source_file = str(path)
+    return gd
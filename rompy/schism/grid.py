@@ -4,14 +4,16 @@ from typing import Literal, Optional
 import numpy as np
 from pydantic import (Field, PrivateAttr, field_validator, model_serializer,
                       model_validator)
-from pylib import read_schism_hgrid, read_schism_vgrid, schism_grid
+from pylib import read_schism_vgrid, schism_grid
 from shapely.geometry import Polygon
 
+from rompy.core.cache import FileCache, cache_key, file_hash
 from rompy.core.data import DataBlob
 from rompy.core.grid import BaseGrid
 from rompy.core.types import RompyBaseModel
 from rompy.logging import get_logger
 
+from .gr3 import load_gr3, load_hgrid, write_gr3, write_rows
 from .vgrid import VGrid, create_2d_vgrid
 
 logger = get_logger(__name__)
@@ -108,77 +110,18 @@ class GR3Generator(GeneratorBase):
         # Determine the output filename
         dest = Path(destdir) / f"{self.gr3_type}.gr3"
 
-        # Load the grid with PyLibs
-        try:
-            gd = schism_grid(ref)
-        except Exception:
-            gd = read_schism_hgrid(ref)
-
         # Generate a standard gr3 file that matches PySchism format
         # This follows the same format as hgrid.gr3: description, NE NP, node list, element list
         logger.info(f"Generating {self.gr3_type}.gr3 with constant value {self.value}")
-
-        with open(dest, "w") as f:
-            # First line: Description
-            f.write(f"{self.gr3_type} gr3 file\n")
-
-            # Second line: NE NP (# of elements, # of nodes)
-            f.write(f"{gd.ne} {gd.np}\n")
-
-            # Write node information with the constant value
-            # Format: node_id x y value
-            for i in range(gd.np):
-                f.write(f"{i+1} {gd.x[i]:.8f} {gd.y[i]:.8f} {self.value:.8f}\n")
-
-            # Write element connectivity
-            # Format: element_id num_vertices vertex1 vertex2 ...
-            for i in range(gd.ne):
-                if hasattr(gd, "i34") and gd.i34 is not None:
-                    num_vertices = gd.i34[i]
-                elif hasattr(gd, "elnode") and gd.elnode is not None:
-                    # Count non-negative values for number of vertices
-                    num_vertices = sum(1 for x in gd.elnode[i] if x >= 0)
-                else:
-                    num_vertices = 3  # Default to triangles
-
-                # Write element connectivity line
-                if hasattr(gd, "elnode") and gd.elnode is not None:
-                    vertices = " ".join(
-                        str(gd.elnode[i, j] + 1) for j in range(num_vertices)
-                    )
-                    f.write(f"{i+1} {num_vertices} {vertices}\n")
-
+        mesh = load_gr3(ref)
+        write_gr3(
+            dest,
+            mesh,
+            self.value,
+            description=f"{self.gr3_type} gr3 file",
             # Add empty line at the end (part of PySchism gr3 format)
-            f.write("\n")
-            self._copied = dest
-            return dest
-
-        # For all other gr3 files (e.g., albedo, diffmin, diffmax, etc.), use standard node-based gr3 format
-        with open(dest, "w") as f:
-            f.write(f"{self.gr3_type} gr3 file\n")
-            f.write(f"{gd.np} {gd.ne}\n")
-
-            # Write node information with constant value
-            for i in range(gd.np):
-                f.write(f"{i+1} {gd.x[i]} {gd.y[i]} {self.value}\n")
-
-            # Write element connectivity
-            for i in range(gd.ne):
-                if hasattr(gd, "i34") and gd.i34 is not None:
-                    num_vertices = gd.i34[i]
-                elif hasattr(gd, "elnode") and gd.elnode is not None:
-                    # For triangular elements, count non-negative values
-                    num_vertices = sum(1 for x in gd.elnode[i] if x >= 0)
-                else:
-                    num_vertices = 3  # Default to triangles
-
-                if hasattr(gd, "elnode") and gd.elnode is not None:
-                    vertices = " ".join(
-                        str(gd.elnode[i, j] + 1) for j in range(num_vertices)
-                    )
-                    f.write(f"{i+1} {num_vertices} {vertices}\n")
-
-        logger.info(f"Generated {self.gr3_type} with constant value of {self.value}")
+            footer="\n",
+        )
         self._copied = dest
         return dest
 
@@ -302,55 +245,27 @@ class WWMBNDGR3Generator(GeneratorBase):
         else:
             ref = self.hgrid
 
-        with open(ref, "r") as file:
-            file.readline()
-            ne, nnp = map(int, file.readline().split())
-            xnd, ynd, ibnd, nm = (
-                np.zeros(nnp),
-                np.zeros(nnp),
-                np.zeros(nnp),
-                np.zeros((ne, 3), dtype=int),
-            )
-            ibnd.fill(0)
+        mesh = load_gr3(ref)
+        nope = len(mesh.open_boundaries)
 
-            for i in range(nnp):
-                j, xnd[i], ynd[i], tmp = map(float, file.readline().split())
+        bcflags = self.bcflags or np.ones(nope, dtype=int) * 2
+        nope2 = len(bcflags)
+        ifl_wwm = np.array(bcflags, dtype=int)
 
-            for i in range(ne):
-                j, k, *nm[i, :] = map(int, file.readline().split())
-
-            nope = int(file.readline().split()[0].strip())
-
-            bcflags = self.bcflags or np.ones(nope, dtype=int) * 2
-            nope2 = len(bcflags)
-            ifl_wwm = np.array(bcflags, dtype=int)
-
-            if nope != nope2:
-                raise ValueError(
-                    f"List of flags {nope2} must be the same length as the number of open boundaries in the hgrid.gr3 file ({nope})"
-                )
-
-            int(file.readline().split()[0].strip())
-
-            for k in range(nope):
-                nond = int(file.readline().split()[0].strip())
-                for _ in range(nond):
-                    iond = int(file.readline().strip())
-                    if iond > nnp or iond <= 0:
-                        raise ValueError("iond > nnp")
+        if nope != nope2:
+            raise ValueError(
+                f"List of flags {nope2} must be the same length as the number of open boundaries in the hgrid.gr3 file ({nope})"
+            )
 
-                    ibnd[iond - 1] = ifl_wwm[k]
+        ibnd = np.zeros(mesh.np)
+        for k, nodes in enumerate(mesh.open_boundaries):
+            if nodes.size and (nodes.min() < 0 or nodes.max() >= mesh.np):
+                raise ValueError("iond > nnp")
+            ibnd[nodes] = ifl_wwm[k]
 
         # Write output file
         dest = Path(destdir) / "wwmbnd.gr3"
-        with open(dest, "w") as file:
-            file.write("Generated by rompy\n")
-            file.write(f"{ne} {nnp}\n")
-            for i in range(nnp):
-                file.write(f"{i+1} {xnd[i]} {ynd[i]} {float(ibnd[i])}\n")
-
-            for i in range(ne):
-                file.write(f"{i+1} 3 {' '.join(map(str, nm[i, :]))}\n")
+        write_gr3(dest, mesh, ibnd, description="Generated by rompy", fmt="%r")
         self._copied = dest
         return dest
 
@@ -501,6 +416,20 @@ class SCHISMGrid(BaseGrid):
         validate_default=True,
     )
     crs: str = Field("epsg:4326", description="Coordinate reference system")
+    cache_dir: Optional[Path] = Field(
+        default=None,
+        description=(
+            "Directory to cache generated grid files (gr3 files, wwmbnd.gr3, vgrid.in "
+            "and tvd.prop) in. Cached files are keyed on the hgrid content and the "
+            "generator parameters and are linked or copied into the staging directory "
+            "on later runs. No caching if not set"
+        ),
+    )
+    cache_max_size: float = Field(
+        default=1.0,
+        description="Maximum size of the grid file cache in GB, least recently used files are evicted above this size",
+        gt=0,
+    )
     _pylibs_hgrid: Optional[schism_grid] = None
     _pylibs_vgrid: Optional[object] = None
 
@@ -564,20 +493,9 @@ class SCHISMGrid(BaseGrid):
     def pylibs_hgrid(self):
         if self._pylibs_hgrid is None:
             grid_path = self.hgrid._copied or self.hgrid.source
-            try:
-                # Try to load as schism_grid first
-                self._pylibs_hgrid = schism_grid(grid_path)
-            except Exception:
-                # Fall back to read_schism_hgrid
-                self._pylibs_hgrid = read_schism_hgrid(grid_path)
-
-            # Compute all grid properties to ensure they're available
-            if hasattr(self._pylibs_hgrid, "compute_all"):
-                self._pylibs_hgrid.compute_all()
-
-            # Calculate boundary information
-            if hasattr(self._pylibs_hgrid, "compute_bnd"):
-                self._pylibs_hgrid.compute_bnd()
+            # Parsed once per hgrid content with all grid and boundary properties
+            # computed, reused from the mesh cache in cache_dir if set
+            self._pylibs_hgrid = load_hgrid(grid_path, cache_dir=self.cache_dir)
 
         return self._pylibs_hgrid
 
@@ -669,24 +587,34 @@ class SCHISMGrid(BaseGrid):
         if not dest_path.exists():
             dest_path.mkdir(parents=True, exist_ok=True)
 
-        # Process .gr3 files
-        for filetype in G3FILES + ["hgrid"]:
+        # Process .gr3 files, hgrid first as all other files are derived from it
+        cache = self.file_cache
+        for filetype in ["hgrid"] + G3FILES:
             source = getattr(self, filetype)
             if source is not None:
-                ret[filetype] = source.get(destdir, name=f"{filetype}.gr3")
+                ret[filetype] = self._get_cached(
+                    source, dest_path / f"{filetype}.gr3", cache
+                )
 
         # Process other grid files, but handle vgrid separately
-        for filetype in GRIDLINKS + ["wwmbnd"]:
+        for filetype in GRIDLINKS:
             source = getattr(self, filetype)
             if source is not None:
                 try:
                     ret[filetype] = source.get(destdir)
                 except Exception as e:
                     logger.error(f"Error generating {filetype}: {e}")
+        if self.wwmbnd is not None:
+            try:
+                ret["wwmbnd"] = self._get_cached(
+                    self.wwmbnd, dest_path / "wwmbnd.gr3", cache
+                )
+            except Exception as e:
+                logger.error(f"Error generating wwmbnd: {e}")
 
         # Generate vertical grid
         logger.info(f"{ARROW} Generating vertical grid configuration")
-        ret["vgrid"] = self.vgrid.get(destdir)
+        ret["vgrid"] = self._get_cached(self.vgrid, dest_path / "vgrid.in", cache)
 
         # Create symlinks for special grid files
         try:
@@ -708,9 +636,63 @@ class SCHISMGrid(BaseGrid):
             logger.warning(f"Failed to create grid symlinks: {e}")
 
         # Generate tvd.prop if needed
-        self.generate_tvprop(destdir)
+        tvprop = dest_path / "tvd.prop"
+        if self._fetch_cached(cache, tvprop, "tvd.prop") is None:
+            self._store_cached(cache, self.generate_tvprop(dest_path), "tvd.prop")
         return ret
 
+    @property
+    def file_cache(self) -> Optional[FileCache]:
+        """Cache of the generated grid files, None if cache_dir is not set."""
+        if self.cache_dir is None:
+            return None
+        return FileCache(self.cache_dir, max_size=self.cache_max_size * 1024**3)
+
+    def _cache_key(self, name: str, *params) -> str:
+        """Cache key of a file derived from the hgrid content and parameters."""
+        return cache_key(file_hash(self.hgrid._copied), name, *params)
+
+    def _fetch_cached(self, cache: Optional[FileCache], dest: Path, *params):
+        """Place a cached derived file at dest, return None on a miss."""
+        if cache is None:
+            return None
+        if cache.fetch(self._cache_key(dest.name, *params), dest) is not None:
+            return dest
+        # Remove any file linked from the cache so it isn't modified in place
+        if dest.is_symlink() or dest.exists():
+            dest.unlink()
+        return None
+
+    def _store_cached(self, cache: Optional[FileCache], path: Path, *params):
+        """Store a generated derived file in the cache."""
+        if cache is not None:
+            cache.store(self._cache_key(Path(path).name, *params), path)
+
+    def _get_cached(
+        self,
+        source: DataBlob | GeneratorBase | VGrid,
+        dest: Path,
+        cache: Optional[FileCache],
+    ) -> Path:
+        """Get a grid file, generated files are reused from the cache if possible."""
+        if isinstance(source, DataBlob):
+            return source.get(dest.parent, name=dest.name)
+        params = (
+            type(source).__name__,
+            {
+                name: getattr(source, name)
+                for name in type(source).model_fields
+                if name != "hgrid"
+            },
+        )
+        if self._fetch_cached(cache, dest, *params) is not None:
+            if isinstance(source, GeneratorBase):
+                source._copied = dest
+            return dest
+        path = source.get(dest.parent)
+        self._store_cached(cache, path, *params)
+        return path
+
     # The _create_gr3_from_hgrid method has been removed as we now use PyLibs' native
     # write_hgrid method to create gr3 files with uniform values
 
@@ -750,8 +732,7 @@ class SCHISMGrid(BaseGrid):
         # Create the file with the proper format
         with open(dest, "w") as f:
             # Write element_number and TVD flag (1) for each element
-            for i in range(1, num_elements + 1):
-                f.write(f"{i} 1\n")
+            write_rows(f, "%d 1\n", [], num_elements)
 
         # Ensure file permissions are correct
         try:
@@ -10,6 +10,7 @@ from pathlib import Path
 from typing import Literal, Optional, Union
 
 import numpy as np
+import pandas as pd
 import scipy as sp
 from pydantic import Field
 from pylib import WriteNC, datenum, zdata
@@ -18,10 +19,35 @@ from rompy.core.data import DataGrid
 from rompy.core.time import TimeRange
 from rompy.logging import get_logger
 from rompy.schism.grid import SCHISMGrid
+from rompy.schism.interpolation import TrilinearPlan, trilinear_plan
 
 logger = get_logger(__name__)
 
 
+def _fill_nearest_index(layer_data: np.ndarray) -> np.ndarray:
+    """Replace NaNs in place with the value at the nearest valid index."""
+    nan_mask = np.isnan(layer_data)
+    if not np.any(nan_mask):
+        return layer_data
+    valid_indices = np.nonzero(~nan_mask)[0]
+    if valid_indices.size == 0:
+        # If all values in this layer are NaN, use a default value
+        layer_data[nan_mask] = 0.0
+        return layer_data
+    nan_indices = np.nonzero(nan_mask)[0]
+    # Closest valid index on either side, preferring the lower one on ties
+    upper = np.searchsorted(valid_indices, nan_indices).clip(1, valid_indices.size - 1)
+    lower = upper - 1
+    if valid_indices.size == 1:
+        nearest = np.zeros_like(nan_indices)
+    else:
+        dlower = np.abs(nan_indices - valid_indices[lower])
+        dupper = np.abs(valid_indices[upper] - nan_indices)
+        nearest = np.where(dupper < dlower, upper, lower)
+    layer_data[nan_indices] = layer_data[valid_indices[nearest]]
+    return layer_data
+
+
 class SCHISMDataHotstart(DataGrid):
     """
     This class is used to generate a hotstart file for SCHISM based on source data.
@@ -49,6 +75,107 @@ class SCHISMDataHotstart(DataGrid):
     output_filename: str = Field(
         "hotstart.nc", description="Name of the output hotstart file"
     )
+    chunk_size: int = Field(
+        100000,
+        description="Number of nodes interpolated at once, bounds the memory usage",
+        gt=0,
+    )
+    plan_dir: Optional[Union[str, Path]] = Field(
+        None,
+        description=(
+            "Directory to persist interpolation plans in so that hotstarts generated "
+            "on the same pair of grids can reuse them"
+        ),
+    )
+
+    def _source_values(self, ds, svar: str) -> np.ndarray:
+        """Return the (depth, lat, lon) values of a source variable."""
+        names = [svar]
+        if hasattr(self, "coords") and hasattr(self.coords, "var"):
+            # Try to find the variable using alternative names
+            names += [
+                v
+                for k, v in self.coords.var.items()
+                if k in [self.temp_var, self.salt_var]
+            ]
+        for name in names:
+            if name not in ds.variables:
+                continue
+            if len(ds[name].dims) == 4:  # time, depth, lat, lon
+                return ds[name].values[0]  # First time step
+            elif len(ds[name].dims) == 3:  # depth, lat, lon
+                return ds[name].values
+            elif name == svar:
+                raise ValueError(
+                    f"Unexpected dimensions for variable {svar}: {ds[svar].dims}"
+                )
+        raise ValueError(
+            f"Could not find variable {svar} or any alternative names in dataset"
+        )
+
+    def _interpolate(
+        self,
+        plan: TrilinearPlan,
+        cv: np.ndarray,
+        lxi: np.ndarray,
+        lyi: np.ndarray,
+        lzi0: np.ndarray,
+        svar: str,
+    ) -> np.ndarray:
+        """Interpolate source values onto all nodes and levels in node chunks.
+
+        Missing corner values are replaced by the mean of the valid values of the
+        same corner and level across all nodes, and invalid (very large) values by
+        the nearest valid value, so a first pass over the chunks gathers the
+        statistics required before the interpolation pass.
+
+        """
+        nvrt, nnodes = plan.shape
+
+        # First pass, statistics of the corner values at each level
+        total = np.zeros((8, nvrt))
+        count = np.zeros((8, nvrt))
+        nlarge = np.zeros((8, nvrt))
+        for nodes in plan.chunks(self.chunk_size):
+            v0 = plan.corners(cv, nodes).astype(float)
+            valid = ~np.isnan(v0)
+            total += np.where(valid, v0, 0.0).sum(axis=2)
+            count += valid.sum(axis=2)
+            nlarge += (np.abs(np.where(valid, v0, 0.0)) > 1e3).sum(axis=2)
+        fill = np.divide(total, count, out=np.zeros_like(total), where=count > 0)
+        if np.any(count < nnodes):
+            logger.debug(f"Found NaN values in extracted data for {svar}")
+
+        # Replace invalid points (very large values) with nearest neighbour values
+        has_large = (nlarge > 0) | ((count < nnodes) & (np.abs(fill) > 1e3))
+        corrections = {}
+        for n, k in zip(*np.nonzero(has_large)):
+            v = np.asarray(plan.corner(cv, n, levels=k), dtype=float)
+            v[np.isnan(v)] = fill[n, k]
+            fpn = np.abs(v) > 1e3
+            if np.sum(~fpn) == 0:  # Only if we have valid points
+                continue
+            bxyz = np.c_[lxi, lyi, lzi0[k]]
+            try:
+                v[fpn] = sp.interpolate.griddata(
+                    bxyz[~fpn, :], v[~fpn], bxyz[fpn, :], "nearest", rescale=True
+                )
+            except Exception as e:
+                logger.warning(f"Interpolation failed for {svar} at level {k+1}: {e}")
+                # Use mean of valid values as fallback
+                v[fpn] = np.mean(v[~fpn])
+            corrections[(n, k)] = (np.nonzero(fpn)[0], v[fpn])
+
+        # Second pass, trilinear interpolation
+        out = np.empty((nvrt, nnodes))
+        for nodes in plan.chunks(self.chunk_size):
+            v0 = plan.corners(cv, nodes).astype(float)
+            v0 = np.where(np.isnan(v0), fill[:, :, None], v0)
+            for (n, k), (ind, values) in corrections.items():
+                sel = (ind >= nodes.start) & (ind < nodes.stop)
+                v0[n, k, ind[sel] - nodes.start] = values[sel]
+            out[:, nodes] = plan.interpolate(v0, nodes)
+        return out
 
     def get(
         self,
@@ -192,6 +319,10 @@ class SCHISMDataHotstart(DataGrid):
                 valid_depth = 0.0
             lzi0[nan_mask] = valid_depth
 
+        # Interpolation indices and ratios only depend on the pair of grids so they
+        # are computed once and reused for all variables (and persisted if required)
+        plan = trilinear_plan(lxi, lyi, lzi0, sx, sy, sz, cache_dir=self.plan_dir)
+
         # Initialize data structure for interpolated variables
         S = zdata()
         mvars = ["temp", "salt"]
@@ -205,189 +336,19 @@ class SCHISMDataHotstart(DataGrid):
             if isinstance(var_mapping, dict) and self.salt_var in var_mapping:
                 svars[1] = var_mapping[self.salt_var]
 
-        for var in mvars:
-            setattr(S, var, [])
-
-        # Interpolate for each vertical level
         logger.debug(f"Interpolating all variables to required {nvrt} levels")
-        for k in range(nvrt):
-            lzi = lzi0[k]
-            bxyz = np.c_[lxi, lyi, lzi]
-
-            # Get interpolation indices
-            idx = ((lxi[:, None] - sx[None, :]) >= 0).sum(axis=1) - 1
-            ratx = (lxi - sx[idx]) / (sx[idx + 1] - sx[idx])
-
-            idy = ((lyi[:, None] - sy[None, :]) >= 0).sum(axis=1) - 1
-            raty = (lyi - sy[idy]) / (sy[idy + 1] - sy[idy])
-
-            idz = ((lzi[:, None] - sz[None, :]) >= 0).sum(axis=1) - 1
-            ratz = (lzi - sz[idz]) / (sz[idz + 1] - sz[idz])
-
-            # Handle edge cases
-            idx = np.clip(idx, 0, len(sx) - 2)
-            idy = np.clip(idy, 0, len(sy) - 2)
-            idz = np.clip(idz, 0, len(sz) - 2)
-
-            # For each variable
-            for m, svar in enumerate(svars):
-                logger.debug(f"Interpolating {svar} at level {k+1}/{nvrt}")
-                mvar = mvars[m]
-
-                # Get source data for this variable
-                try:
-                    if svar in ds.variables:
-                        if len(ds[svar].dims) == 4:  # time, depth, lat, lon
-                            cv = ds[svar].values[0]  # First time step
-                        elif len(ds[svar].dims) == 3:  # depth, lat, lon
-                            cv = ds[svar].values
-                        else:
-                            raise ValueError(
-                                f"Unexpected dimensions for variable {svar}: {ds[svar].dims}"
-                            )
-                    else:
-                        # Try to find the variable using alternative names
-                        alt_names = (
-                            [
-                                v
-                                for k, v in self.coords.var.items()
-                                if k in [self.temp_var, self.salt_var]
-                            ]
-                            if hasattr(self, "coords") and hasattr(self.coords, "var")
-                            else []
-                        )
-                        found = False
-                        for alt_name in alt_names:
-                            if alt_name in ds.variables:
-                                if len(ds[alt_name].dims) == 4:  # time, depth, lat, lon
-                                    cv = ds[alt_name].values[0]  # First time step
-                                    found = True
-                                    break
-                                elif len(ds[alt_name].dims) == 3:  # depth, lat, lon
-                                    cv = ds[alt_name].values
-                                    found = True
-                                    break
-                        if not found:
-                            raise ValueError(
-                                f"Could not find variable {svar} or any alternative names in dataset"
-                            )
-                except Exception as e:
-                    logger.error(f"Error accessing variable {svar}: {e}")
-                    raise
-
-                # Extract values at interpolation points with error handling
-                try:
-                    v0 = np.array(
-                        [
-                            cv[idz, idy, idx],
-                            cv[idz, idy, idx + 1],
-                            cv[idz, idy + 1, idx],
-                            cv[idz, idy + 1, idx + 1],
-                            cv[idz + 1, idy, idx],
-                            cv[idz + 1, idy, idx + 1],
-                            cv[idz + 1, idy + 1, idx],
-                            cv[idz + 1, idy + 1, idx + 1],
-                        ]
-                    )
-
-                    # Check for NaN values in the extracted data
-                    nan_mask = np.isnan(v0)
-                    if np.any(nan_mask):
-                        logger.debug(
-                            f"Found NaN values in extracted data for {svar} at level {k+1}"
-                        )
-                        # Replace NaNs with valid values where possible
-                        for n in range(8):
-                            if np.any(np.isnan(v0[n])):
-                                valid_indices = ~np.isnan(v0[n])
-                                if np.any(valid_indices):
-                                    # Use mean of valid values
-                                    v0[n, np.isnan(v0[n])] = np.mean(
-                                        v0[n, valid_indices]
-                                    )
-                                else:
-                                    # If all values are NaN, use a default value
-                                    v0[n, np.isnan(v0[n])] = 0.0  # Default value
-
-                    # Remove invalid points (very large values)
-                    for n in range(8):
-                        fpn = np.abs(v0[n]) > 1e3
-                        if np.any(fpn):
-                            # Use nearest neighbor interpolation for invalid points
-                            if np.sum(~fpn) > 0:  # Only if we have valid points
-                                try:
-                                    v0[n, fpn] = sp.interpolate.griddata(
-                                        bxyz[~fpn, :],
-                                        v0[n, ~fpn],
-                                        bxyz[fpn, :],
-                                        "nearest",
-                                        rescale=True,
-                                    )
-                                except Exception as e:
-                                    logger.warning(
-                                        f"Interpolation failed for {svar} at level {k+1}: {e}"
-                                    )
-                                    # Use mean of valid values as fallback
-                                    if np.sum(~fpn) > 0:
-                                        v0[n, fpn] = np.mean(v0[n, ~fpn])
-                                    else:
-                                        v0[n, fpn] = 0.0  # Default value
-                except Exception as e:
-                    logger.error(
-                        f"Error extracting values for {svar} at level {k+1}: {e}"
-                    )
-                    # Create a fallback array with zeros
-                    v0 = np.zeros((8, len(idx)))
-                    logger.warning(f"Using zeros as fallback for {svar} at level {k+1}")
-
-                # Trilinear interpolation
-                v11 = v0[0] * (1 - ratx) + v0[1] * ratx
-                v12 = v0[2] * (1 - ratx) + v0[3] * ratx
-                v1 = v11 * (1 - raty) + v12 * raty
-
-                v21 = v0[4] * (1 - ratx) + v0[5] * ratx
-                v22 = v0[6] * (1 - ratx) + v0[7] * ratx
-                v2 = v21 * (1 - raty) + v22 * raty
-
-                vi = v1 * (1 - ratz) + v2 * ratz
-
-                # Save interpolated values
-                getattr(S, mvar).append(vi)
-
-        # Convert lists to arrays
-        for var in mvars:
-            setattr(S, var, np.array(getattr(S, var)))
+        for mvar, svar in zip(mvars, svars):
+            cv = self._source_values(ds, svar)
+            data_array = self._interpolate(plan, cv, lxi, lyi, lzi0, svar)
 
-        # Create tracer arrays with NaN handling
-        # Convert lists to arrays and check for NaNs
-        for var in mvars:
-            data_array = np.array(getattr(S, var))
-            # Check for NaNs
+            # Replace any remaining NaNs with the nearest valid node in each layer
             if np.any(np.isnan(data_array)):
                 logger.warning(
-                    f"Found NaN values in {var} data, replacing with interpolated values"
+                    f"Found NaN values in {mvar} data, replacing with interpolated values"
                 )
-                # Replace NaNs with interpolated values
-                for i in range(data_array.shape[0]):
-                    layer_data = data_array[i]
-                    if np.any(np.isnan(layer_data)):
-                        # Get indices of NaN values
-                        nan_indices = np.where(np.isnan(layer_data))[0]
-                        # Get indices of non-NaN values
-                        valid_indices = np.where(~np.isnan(layer_data))[0]
-                        if len(valid_indices) > 0:
-                            # Use nearest valid values
-                            for nan_idx in nan_indices:
-                                # Find nearest valid index
-                                nearest_idx = valid_indices[
-                                    np.argmin(np.abs(valid_indices - nan_idx))
-                                ]
-                                # Replace NaN with nearest valid value
-                                layer_data[nan_idx] = layer_data[nearest_idx]
-                        else:
-                            # If all values in this layer are NaN, use a default value
-                            layer_data[nan_indices] = 0.0
-            setattr(S, var, data_array)
+                for layer_data in data_array:
+                    _fill_nearest_index(layer_data)
+            setattr(S, mvar, data_array)
 
         # Create tracer arrays
         tr_nd = np.r_[S.temp[None, ...], S.salt[None, ...]].T
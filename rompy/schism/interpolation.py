@@ -0,0 +1,359 @@
+"""
+Vectorised interpolation helpers for SCHISM forcing generation.
+
+The functions in this module replace per-node / per-timestep scipy interpolator
+construction with array operations. Interpolation weights are computed once for
+each destination point and then applied to all time steps and components at once.
+"""
+
+import hashlib
+import os
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+from rompy.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def boundary_zcor(
+    depths: np.ndarray,
+    sigma: np.ndarray,
+    ztot: Optional[np.ndarray] = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Build the vertical coordinate table for a set of boundary nodes.
+
+    Nodes deeper than the first z level use the sigma levels scaled to that first z
+    level followed by every z level between the first z level and the node depth.
+    Shallower nodes use the sigma levels scaled to the node depth.
+
+    Parameters
+    ----------
+    depths : np.ndarray
+        Depth at each boundary node, shape (nnodes,).
+    sigma : np.ndarray
+        Sigma levels of the vertical grid, shape (nsigma,).
+    ztot : np.ndarray, optional
+        Fixed z levels of the vertical grid, shape (nz,).
+
+    Returns
+    -------
+    zcor : np.ndarray
+        Vertical coordinate of each level, shape (nnodes, max_nvrt). Levels beyond
+        the number of levels of a node are set to zero.
+    nvrt : np.ndarray
+        Number of vertical levels at each node, shape (nnodes,).
+
+    """
+    depths = np.asarray(depths, dtype=float)
+    sigma = np.asarray(sigma, dtype=float)
+    ztot = np.asarray(ztot if ztot is not None else [], dtype=float)
+    nsigma = sigma.size
+
+    if ztot.size > 0:
+        deep = depths > ztot[0]
+        zmask = (ztot[None, :] > ztot[0]) & (ztot[None, :] < depths[:, None])
+        zmask &= deep[:, None]
+        floor = np.where(deep, ztot[0], depths)
+    else:
+        zmask = np.zeros((depths.size, 0), dtype=bool)
+        floor = depths
+
+    nvrt = nsigma + zmask.sum(axis=1)
+    max_nvrt = int(nvrt.max()) if nvrt.size else nsigma
+
+    zcor = np.zeros((depths.size, max_nvrt))
+    zcor[:, :nsigma] = floor[:, None] * sigma[None, :]
+
+    # Pack the applicable z levels of each node right after its sigma levels
+    rows, cols = np.nonzero(zmask)
+    position = np.cumsum(zmask, axis=1) - 1
+    zcor[rows, nsigma + position[rows, cols]] = ztot[cols]
+
+    return zcor, nvrt
+
+
+class VerticalRemap:
+    """Linear vertical remap from source levels onto per-node destination levels.
+
+    The bracketing source levels and weights are computed once from `searchsorted`
+    and reused for every time step and component. Values outside the source range
+    are linearly extrapolated from the outermost source levels, matching
+    `scipy.interpolate.interp1d(kind="linear", fill_value="extrapolate")`.
+
+    Parameters
+    ----------
+    src_z : np.ndarray
+        Source vertical levels, shape (nz_src,), in any order.
+    dst_z : np.ndarray
+        Destination vertical levels, shape (nnodes, nlevels).
+    nvrt : np.ndarray, optional
+        Number of valid destination levels at each node, levels beyond it are set
+        to zero in the output. All levels are valid if not provided.
+
+    """
+
+    def __init__(
+        self,
+        src_z: np.ndarray,
+        dst_z: np.ndarray,
+        nvrt: Optional[np.ndarray] = None,
+    ):
+        src_z = np.asarray(src_z, dtype=float).ravel()
+        dst_z = np.asarray(dst_z, dtype=float)
+        self.order = np.argsort(src_z, kind="mergesort")
+        zsrc = src_z[self.order]
+        nsrc = zsrc.size
+
+        if nvrt is None:
+            nvrt = np.full(dst_z.shape[0], dst_z.shape[1])
+        self.valid = np.arange(dst_z.shape[1])[None, :] < np.asarray(nvrt)[:, None]
+
+        if nsrc == 1:
+            # A single source level can only be broadcast
+            self.lo = np.zeros(dst_z.shape, dtype=int)
+            self.hi = self.lo
+            self.weight = np.zeros(dst_z.shape)
+        else:
+            hi = np.searchsorted(zsrc, dst_z).clip(1, nsrc - 1)
+            self.lo = hi - 1
+            self.hi = hi
+            self.weight = (dst_z - zsrc[self.lo]) / (zsrc[hi] - zsrc[self.lo])
+        self.weight[~self.valid] = 0.0
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """Shape (nnodes, nlevels) of the destination levels."""
+        return self.weight.shape
+
+    def __call__(self, data: np.ndarray, chunk_size: int = 64) -> np.ndarray:
+        """Remap data onto the destination levels.
+
+        Parameters
+        ----------
+        data : np.ndarray
+            Source data with shape (ntime, nnodes, nz_src, ncomponents).
+        chunk_size : int
+            Number of time steps evaluated at once, bounds the size of temporaries.
+
+        Returns
+        -------
+        np.ndarray
+            Remapped data with shape (ntime, nnodes, nlevels, ncomponents).
+
+        """
+        data = np.asarray(data)[:, :, self.order, :]
+        ntime, nnodes, _, ncomp = data.shape
+        if nnodes != self.shape[0]:
+            raise ValueError(
+                f"Data has {nnodes} nodes but the remap was built for {self.shape[0]}"
+            )
+        out = np.zeros((ntime, nnodes, self.shape[1], ncomp))
+        inode = np.arange(nnodes)[:, None]
+        weight = self.weight[None, :, :, None]
+        for t0 in range(0, ntime, chunk_size):
+            block = data[t0 : t0 + chunk_size]
+            ylo = block[:, inode, self.lo, :]
+            yhi = block[:, inode, self.hi, :]
+            out[t0 : t0 + chunk_size] = ylo + (yhi - ylo) * weight
+        out[:, ~self.valid, :] = 0.0
+        return out
+
+
+def _bracket(src: np.ndarray, dst: np.ndarray) -> tuple[np.ndarray, ...]:
+    """Bracket indices and ratio of dst points in an arbitrarily ordered axis.
+
+    The returned indices refer to the original ordering of `src` so they can be used
+    directly to index the source data. Points outside the source range are clamped
+    to the nearest edge.
+
+    """
+    src = np.asarray(src, dtype=float)
+    order = np.argsort(src, kind="mergesort")
+    ssrc = src[order]
+    i = (np.searchsorted(ssrc, dst, side="right") - 1).clip(0, ssrc.size - 2)
+    ratio = ((dst - ssrc[i]) / (ssrc[i + 1] - ssrc[i])).clip(0.0, 1.0)
+    return order[i], order[i + 1], ratio
+
+
+class TrilinearPlan:
+    """Trilinear interpolation plan from a regular (z, y, x) source grid onto nodes.
+
+    The bracketing indices and ratios are computed once with `searchsorted` for all
+    nodes and vertical levels and can be reused for every variable interpolated
+    between the same pair of grids, or persisted to disk with `save`.
+
+    Parameters
+    ----------
+    ix0, ix1, iy0, iy1 : np.ndarray
+        Source x and y bracket indices at each node, shape (nnodes,).
+    iz0, iz1 : np.ndarray
+        Source z bracket indices at each level and node, shape (nlevels, nnodes).
+    ratx, raty : np.ndarray
+        Horizontal interpolation ratios, shape (nnodes,).
+    ratz : np.ndarray
+        Vertical interpolation ratios, shape (nlevels, nnodes).
+
+    """
+
+    fields = ("ix0", "ix1", "iy0", "iy1", "iz0", "iz1", "ratx", "raty", "ratz")
+
+    def __init__(self, ix0, ix1, iy0, iy1, iz0, iz1, ratx, raty, ratz):
+        self.ix0, self.ix1, self.iy0, self.iy1 = ix0, ix1, iy0, iy1
+        self.iz0, self.iz1 = iz0, iz1
+        self.ratx, self.raty, self.ratz = ratx, raty, ratz
+
+    @classmethod
+    def build(cls, lx, ly, lz, sx, sy, sz) -> "TrilinearPlan":
+        """Build the plan for nodes (lx, ly) with levels lz (nlevels, nnodes)."""
+        ix0, ix1, ratx = _bracket(sx, np.asarray(lx, dtype=float))
+        iy0, iy1, raty = _bracket(sy, np.asarray(ly, dtype=float))
+        iz0, iz1, ratz = _bracket(sz, np.asarray(lz, dtype=float))
+        index = np.int32 if max(len(sx), len(sy), len(sz)) < 2**31 else np.int64
+        return cls(
+            ix0.astype(index),
+            ix1.astype(index),
+            iy0.astype(index),
+            iy1.astype(index),
+            iz0.astype(index),
+            iz1.astype(index),
+            ratx,
+            raty,
+            ratz,
+        )
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """Shape (nlevels, nnodes) of the interpolated fields."""
+        return self.ratz.shape
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Persist the plan to a npz file.
+
+        The plan is written to a temporary file moved into place once complete, so
+        processes loading the same plan never read a partially written file.
+
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}")
+        try:
+            with open(tmp, "wb") as f:
+                np.savez(f, **{name: getattr(self, name) for name in self.fields})
+            os.replace(tmp, path)
+        finally:
+            tmp.unlink(missing_ok=True)
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "TrilinearPlan":
+        """Load a plan persisted with `save`."""
+        with np.load(path) as data:
+            return cls(**{name: data[name] for name in cls.fields})
+
+    def corner(
+        self, cv: np.ndarray, n: int, levels=slice(None), nodes=slice(None)
+    ) -> np.ndarray:
+        """Gather the values of cell corner n from the (z, y, x) source array cv.
+
+        Corners are numbered from the (z, y, x) bracket bits so corner 0 is
+        (z0, y0, x0), corner 1 is (z0, y0, x1), ..., corner 7 is (z1, y1, x1).
+
+        """
+        iz = (self.iz0, self.iz1)[n >> 2 & 1][levels, nodes]
+        iy = (self.iy0, self.iy1)[n >> 1 & 1][nodes]
+        ix = (self.ix0, self.ix1)[n & 1][nodes]
+        return cv[iz, iy, ix]
+
+    def corners(self, cv: np.ndarray, nodes=slice(None)) -> np.ndarray:
+        """Gather all 8 cell corners of a node chunk, shape (8, nlevels, nnodes)."""
+        return np.array([self.corner(cv, n, nodes=nodes) for n in range(8)])
+
+    def interpolate(self, v0: np.ndarray, nodes: slice) -> np.ndarray:
+        """Trilinear interpolation of corner values gathered with `corners`."""
+        ratx, raty, ratz = self.ratx[nodes], self.raty[nodes], self.ratz[:, nodes]
+        v11 = v0[0] * (1 - ratx) + v0[1] * ratx
+        v12 = v0[2] * (1 - ratx) + v0[3] * ratx
+        v1 = v11 * (1 - raty) + v12 * raty
+
+        v21 = v0[4] * (1 - ratx) + v0[5] * ratx
+        v22 = v0[6] * (1 - ratx) + v0[7] * ratx
+        v2 = v21 * (1 - raty) + v22 * raty
+
+        return v1 * (1 - ratz) + v2 * ratz
+
+    def chunks(self, chunk_size: int):
+        """Iterate over node slices of at most chunk_size nodes."""
+        nnodes = self.shape[1]
+        for start in range(0, nnodes, chunk_size):
+            yield slice(start, min(start + chunk_size, nnodes))
+
+
+def plan_key(*arrays: np.ndarray) -> str:
+    """Content hash of the arrays defining an interpolation plan."""
+    sha = hashlib.sha1()
+    for array in arrays:
+        array = np.ascontiguousarray(array, dtype=float)
+        sha.update(str(array.shape).encode())
+        sha.update(array.tobytes())
+    return sha.hexdigest()
+
+
+_PLANS = OrderedDict()
+_MAX_PLANS = 4
+
+
+def trilinear_plan(
+    lx: np.ndarray,
+    ly: np.ndarray,
+    lz: np.ndarray,
+    sx: np.ndarray,
+    sy: np.ndarray,
+    sz: np.ndarray,
+    cache_dir: Optional[Union[str, Path]] = None,
+) -> TrilinearPlan:
+    """Return the trilinear plan between a pair of grids, building it only once.
+
+    Plans are kept in memory for the lifetime of the process and, if `cache_dir` is
+    provided, persisted there so later runs on the same grids can reuse them.
+
+    Parameters
+    ----------
+    lx, ly : np.ndarray
+        Destination node coordinates, shape (nnodes,).
+    lz : np.ndarray
+        Destination vertical coordinates, shape (nlevels, nnodes).
+    sx, sy, sz : np.ndarray
+        Source grid coordinates.
+    cache_dir : str | Path, optional
+        Directory to persist plans in.
+
+    Returns
+    -------
+    TrilinearPlan
+
+    """
+    key = plan_key(lx, ly, lz, sx, sy, sz)
+    path = Path(cache_dir) / f"trilinear-{key}.npz" if cache_dir else None
+    if key in _PLANS:
+        logger.debug(f"Reusing trilinear plan {key} from memory")
+        _PLANS.move_to_end(key)
+        plan = _PLANS[key]
+    elif path is not None and path.exists():
+        logger.debug(f"Loading trilinear plan from {path}")
+        plan = TrilinearPlan.load(path)
+    else:
+        plan = TrilinearPlan.build(lx, ly, lz, sx, sy, sz)
+
+    if path is not None and not path.exists():
+        plan.save(path)
+        logger.debug(f"Saved trilinear plan to {path}")
+
+    _PLANS[key] = plan
+    if len(_PLANS) > _MAX_PLANS:
+        _PLANS.popitem(last=False)
+    return plan
@@ -10,10 +10,12 @@ from typing import Literal, Optional, Union
 
 import numpy as np
 import pandas as pd
+import xarray as xr
 from pydantic import Field, field_validator
 from shapely.geometry import LineString
 
 from rompy.core.boundary import BoundaryWaveStation
+from rompy.core.filters import sortby
 from rompy.core.time import TimeRange
 from rompy.logging import get_logger
 from rompy.swan.grid import SwanGrid
@@ -88,7 +90,7 @@ class Boundnest1(BoundaryWaveStation):
         if self.crop_data and grid is not None:
             self._filter_grid(grid)
 
-        ds = self._sel_boundary(grid).sortby("dir")
+        ds = sortby(self._sel_boundary(grid), "dir")
 
         # If nearest, ensure points are returned at the requested positions
         if self.sel_method == "nearest":
@@ -118,7 +120,6 @@ class BoundspecBase(BoundaryWaveStation, ABC):
     file_type: Literal["tpar", "spec2d"] = Field(
         default="tpar", description="The type of file to write"
     )
-    _ds: None
 
     @field_validator("sel_method_kwargs")
     @classmethod
@@ -152,10 +153,44 @@ class BoundspecBase(BoundaryWaveStation, ABC):
         elif self.shapespec.dspr_type == "power":
             raise NotImplementedError("Power of cos not supported yet")
 
-    @property
-    def tpar(self) -> pd.DataFrame:
-        """TPAR dataframe for the _ds attr."""
-        return self._ds.spec.stats(["hs", self.per, "dpm", self.dspr]).to_pandas()
+    def tpar(self, ds: xr.Dataset) -> list[pd.DataFrame]:
+        """TPAR dataframes of each segment in ds.
+
+        Parameters
+        ----------
+        ds: xr.Dataset
+            Spectra dataset with a `segment` dimension.
+
+        Returns
+        -------
+        tpar: list[pd.DataFrame]
+            TPAR dataframe of each segment.
+
+        """
+        stats = ds.spec.stats(["hs", self.per, "dpm", self.dspr]).load()
+        nseg = ds.sizes["segment"]
+        return [stats.isel(segment=ind).to_pandas() for ind in range(nseg)]
+
+    def _write_segments(self, ds: xr.Dataset, filenames: list[Path]):
+        """Write the boundary file of each segment of ds in a single pass.
+
+        Parameters
+        ----------
+        ds: xr.Dataset
+            Spectra dataset with a `segment` dimension.
+        filenames: list[Path]
+            Filename to write for each segment.
+
+        """
+        # Coordinates along the segments such as lon and lat are not written
+        ds = ds.drop_vars([k for k, v in ds.coords.items() if "segment" in v.dims])
+        if self.file_type == "tpar":
+            for df, filename in zip(self.tpar(ds), filenames):
+                write_tpar(df, filename)
+        elif self.file_type == "spec2d":
+            ds = ds.load()
+            for ind, filename in enumerate(filenames):
+                ds.isel(segment=ind).spec.to_swan(filename)
 
     def _interpolate_side(self, xbnd, ybnd, spacing) -> tuple:
         """Interpolate points along side at user-defined spacing.
@@ -278,24 +313,20 @@ class BoundspecSide(BoundspecBase):
             self._filter_time(time)
         if self.crop_data and grid is not None:
             self._filter_grid(grid)
-        ds = self._sel_boundary(grid).sortby("dir")
+        ds = sortby(self._sel_boundary(grid), "dir")
 
         cmds = []
         filenames = []
         # Code below allows for multiple sides but only one side is currently supported
         for ind in range(ds.lon.size):
-            self._ds = ds.isel(site=ind, drop=True)
             filename = (
                 Path(destdir)
                 / f"{self.id}_{self.file_type}_{self.location.side}_{ind:03d}.bnd"
             )
-            if self.file_type == "tpar":
-                write_tpar(self.tpar, filename)
-            elif self.file_type == "spec2d":
-                self._ds.spec.to_swan(filename)
             comp = CONSTANTFILE(fname=filename.name, seq=1)
             cmds.append(f"BOUNDSPEC {self.location.render()}{comp.render()}")
             filenames.append(filename)
+        self._write_segments(ds.rename(site="segment"), filenames)
         return filename, "\n".join(cmds)
 
 
@@ -373,7 +404,7 @@ class BoundspecSegmentXY(BoundspecBase):
             self._filter_time(time)
         if self.crop_data and grid is not None:
             self._filter_grid(grid)
-        ds = self._sel_boundary(grid).sortby("dir")
+        ds = sortby(self._sel_boundary(grid), "dir")
 
         # If nearest, ensure points are returned at the requested positions
         if self.sel_method == "nearest":
@@ -383,18 +414,17 @@ class BoundspecSegmentXY(BoundspecBase):
 
         cmds = []
         filenames = []
+        lon, lat = ds.lon.values, ds.lat.values
         for ind in range(ds.lon.size - 1):
-            ds_seg = ds.isel(site=slice(ind, ind + 2))
             # TODO: Ensure points in segment are different
-            self._ds = ds_seg.mean("site")
             filename = Path(destdir) / f"{self.id}_{self.file_type}_{ind:03d}.bnd"
-            if self.file_type == "tpar":
-                write_tpar(self.tpar, filename)
-            elif self.file_type == "spec2d":
-                self._ds.spec.to_swan(filename)
             file = CONSTANTFILE(fname=filename.name, seq=1)
-            location = SEGMENT(points=XY(x=ds_seg.lon.values, y=ds_seg.lat.values))
+            location = SEGMENT(points=XY(x=lon[ind : ind + 2], y=lat[ind : ind + 2]))
             location = location.render().replace("\n", " ").replace("  ", " ")
             cmds.append(f"BOUNDSPEC {location}{file.render()}")
             filenames.append(filename)
+
+        # Mean of the two end points of all segments at once, skipping missing values
+        ds_seg = ds.rolling(site=2, min_periods=1).mean().isel(site=slice(1, None))
+        self._write_segments(ds_seg.rename(site="segment"), filenames)
         return filenames, "\n".join(cmds)
@@ -5,9 +5,12 @@ This module provides data handling functionality for the SWAN model within the R
 """
 
 import os
+import re
 import time as time_module
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Literal, Optional
 
 import numpy as np
 import pandas as pd
@@ -25,6 +28,16 @@ logger = get_logger(__name__)
 
 FILL_VALUE = -99.0
 
+# Number of values formatted at once when writing ascii files
+BLOCK_SIZE = 1_000_000
+
+# Fixed-point formats that can be formatted with vectorised integer arithmetic
+# Fixed-point formats without flags, e.g. "%4.2f" but not "%08.2f" or "%-6.1f"
+_FIXED_FORMAT = re.compile(r"%([1-9]\d*)?\.(\d+)f")
+
+# Powers of ten to count the integer digits of values up to 2**52 exactly
+_POWERS_OF_TEN = 10 ** np.arange(17, dtype="int64")
+
 
 class SwanDataGrid(DataGrid):
     """This class is used to write SWAN data from a dataset."""
@@ -52,6 +65,14 @@ class SwanDataGrid(DataGrid):
         ),
         default=1.0,
     )
+    format: Literal["free", "unformatted"] = Field(
+        default="free",
+        description=(
+            "Format of the file written for SWAN, 'free' writes an ascii file read "
+            "in FREE format, 'unformatted' writes a smaller binary file with "
+            "float32 Fortran records read in UNFORMATTED format"
+        ),
+    )
 
     @model_validator(mode="after")
     def ensure_z1_in_data_vars(self) -> "SwanDataGrid":
@@ -68,6 +89,7 @@ class SwanDataGrid(DataGrid):
         destdir: str | Path,
         grid: Optional[SwanGrid] = None,
         time: Optional[TimeRange] = None,
+        format: Optional[Literal["free", "unformatted"]] = None,
     ) -> Path:
         """Write the data source to a new location.
 
@@ -79,6 +101,8 @@ class SwanDataGrid(DataGrid):
             The grid to filter the data to, only used if `self.filter_grid` is True.
         time: TimeRange, optional
             The times to filter the data to, only used if `self.filter_time` is True.
+        format: str, optional
+            Format of the file written, overrides `self.format` if provided.
 
         Returns
         -------
@@ -99,7 +123,9 @@ class SwanDataGrid(DataGrid):
             if time is not None:
                 self._filter_time(time)
 
-        output_file = os.path.join(destdir, f"{self.var.value}.grd")
+        format = format or self.format
+        suffix = "grd" if format == "free" else "bin"
+        output_file = os.path.join(destdir, f"{self.var.value}.{suffix}")
 
         # Create a formatted box for logging
         log_box(
@@ -136,6 +162,7 @@ class SwanDataGrid(DataGrid):
                 fac=self.fac,
                 rot=0.0,
                 vmin=float("-inf"),
+                format=format,
             )
         else:
             inpgrid, readgrid = self.ds.swan.to_inpgrid(
@@ -147,6 +174,7 @@ class SwanDataGrid(DataGrid):
                 fac=self.fac,
                 rot=0.0,
                 var=self.var.name,
+                format=format,
             )
 
         # Log completion and processing time
@@ -221,6 +249,283 @@ class SwanDataGrid(DataGrid):
         return "\n".join(lines)
 
 
+def _format_fixed(
+    fmt: str, values: np.ndarray, separators: np.ndarray
+) -> Optional[list[str]]:
+    """Vectorised formatting of values with a fixed-point "%W.Pf" formatter.
+
+    Digits are computed with integer arithmetic on the values scaled by 10**P and
+    laid out in a character array, giving the same text as Python's correctly
+    rounded formatting. None is returned so the caller falls back to string
+    formatting if the format isn't fixed-point without flags or if any value is not
+    finite, too large or so close to a rounding tie that the scaled value could
+    round the other way.
+
+    Parameters
+    ----------
+    fmt: str
+        String float formatter.
+    values: np.ndarray
+        Values of shape (ntimes, nvalues).
+    separators: np.ndarray
+        Single character written after each of the nvalues of each time.
+
+    Returns
+    -------
+    texts: list[str] | None
+        The formatted values of each time.
+
+    """
+    match = _FIXED_FORMAT.fullmatch(fmt)
+    if match is None or values.size == 0:
+        return None
+    width, precision = int(match.group(1) or 0), int(match.group(2))
+    values = np.asarray(values, dtype="float64")
+    if precision > 15 or not np.isfinite(values).all():
+        return None
+    scaled = np.abs(values) * 10.0**precision
+    if scaled.max() >= 2**52:
+        return None
+    tie = np.abs(scaled - np.floor(scaled) - 0.5) <= 2 * np.spacing(scaled)
+    if tie.any():
+        return None
+    digits = np.rint(scaled).astype("int64")
+
+    # Number of digits written, at least one before the decimal point
+    ndigits = np.maximum(
+        precision + 1, np.searchsorted(_POWERS_OF_TEN, digits, side="right")
+    )
+    negative = np.signbit(values)
+    length = ndigits + (precision > 0) + negative
+    field = np.maximum(length, width)
+    ncols = int(field.max()) + 1
+
+    # Characters of each value right aligned in rows followed by the separator
+    chars = np.full(values.shape + (ncols,), ord(" "), dtype="uint8")
+    chars[..., -1] = separators
+    for d in range(int(ndigits.max())):
+        col = ncols - 2 - d - (precision > 0 and d >= precision)
+        digit = (digits // 10**d) % 10 + ord("0")
+        chars[..., col] = np.where(d < ndigits, digit, chars[..., col])
+    if precision > 0:
+        chars[..., ncols - 2 - precision] = ord(".")
+    sign_col = ncols - 1 - length
+    rows, cols = np.nonzero(negative)
+    chars[rows, cols, sign_col[rows, cols]] = ord("-")
+
+    keep = np.arange(ncols) >= (ncols - 1 - field)[..., None]
+    text = chars[keep].tobytes().decode("ascii")
+    offsets = np.r_[0, np.cumsum((field + 1).sum(axis=1))]
+    return [text[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+
+
+def format_slabs(
+    fmt: str,
+    arrays: list[np.ndarray],
+    headers: Optional[list[str]] = None,
+    delimiter: str = " ",
+) -> str:
+    """Format 2D slabs of consecutive times as successive np.savetxt calls would.
+
+    Fixed-point formats are formatted with vectorised integer arithmetic, other
+    formats with a single string formatting operation over a template built for
+    the whole block rather than row by row.
+
+    Parameters
+    ----------
+    fmt: str
+        String float formatter for each value.
+    arrays: list[np.ndarray]
+        Arrays of shape (ntimes, nrows, ncols), the slabs of each array are written
+        one after another for each time.
+    headers: list[str], optional
+        Line written before the slabs of each time.
+    delimiter: str
+        String separating the values in each row.
+
+    Returns
+    -------
+    text: str
+        The formatted block.
+
+    """
+    ntimes = arrays[0].shape[0]
+    values = np.concatenate([array.reshape(ntimes, -1) for array in arrays], axis=1)
+
+    texts = None
+    if len(delimiter) == 1:
+        separators = np.concatenate(
+            [
+                np.tile(
+                    [ord(delimiter)] * (array.shape[2] - 1) + [ord("\n")],
+                    array.shape[1],
+                )
+                for array in arrays
+            ]
+        )
+        texts = _format_fixed(fmt, values, separators)
+    if texts is not None:
+        if headers is None:
+            return "".join(texts)
+        return "".join(f"{header}\n{text}" for header, text in zip(headers, texts))
+
+    template = "".join(
+        (delimiter.join([fmt] * array.shape[2]) + "\n") * array.shape[1]
+        for array in arrays
+    )
+    if headers is None:
+        template *= ntimes
+    else:
+        template = "".join(
+            header.replace("%", "%%") + "\n" + template for header in headers
+        )
+    return template % tuple(values.ravel().tolist())
+
+
+def _slabs(data: np.ndarray, squeeze: bool = False) -> np.ndarray:
+    """Shape the slabs of each time as the 2D arrays written by np.savetxt."""
+    shape = list(data.shape[1:])
+    if squeeze:
+        shape = [size for size in shape if size != 1]
+    if len(shape) == 1:
+        # 1D slabs are written as a single column
+        shape.append(1)
+    if len(shape) != 2:
+        raise ValueError(f"Expected 1D or 2D slabs, got {len(shape)}D slabs instead")
+    return data.reshape(data.shape[0], *shape)
+
+
+def time_blocks(
+    dset: xr.Dataset,
+    variables: list,
+    time_dim: str = "time",
+    fill_value: Optional[float] = None,
+    squeeze: bool = False,
+    block_size: Optional[int] = None,
+) -> Iterable[tuple[list[np.ndarray], pd.DatetimeIndex]]:
+    """Yield contiguous time blocks of the variables as arrays of 2D slabs.
+
+    Parameters
+    ----------
+    dset: xr.Dataset
+        Dataset with the variables to read.
+    variables: list
+        Variables to read, the time dimension is moved first in each of them.
+    time_dim: str
+        Name of the time dimension.
+    fill_value: float, optional
+        Value replacing missing data, missing data are kept if None.
+    squeeze: bool
+        Remove the dimensions of length one from the slabs of each time.
+    block_size: int, optional
+        Approximate number of values read in each block, BLOCK_SIZE by default.
+
+    """
+    block_size = block_size or BLOCK_SIZE
+    nvalues = sum(dset[var].size // dset.sizes[time_dim] for var in variables)
+    step = max(1, block_size // max(1, nvalues))
+    ntimes = dset.sizes[time_dim]
+    for start in range(0, ntimes, step):
+        block = dset[variables].isel({time_dim: slice(start, start + step)})
+        if fill_value is not None:
+            block = block.fillna(fill_value)
+        arrays = [
+            _slabs(block[var].transpose(time_dim, ...).values, squeeze)
+            for var in variables
+        ]
+        yield arrays, pd.to_datetime(block[time_dim].values)
+
+
+def write_blocks(
+    stream,
+    fmt: str,
+    blocks: Iterable[tuple[list[np.ndarray], Optional[list[str]]]],
+    delimiter: str = " ",
+    workers: int = 1,
+):
+    """Format blocks of slabs with `format_slabs` and write them in order.
+
+    Parameters
+    ----------
+    stream: file
+        Text stream to write to.
+    fmt: str
+        String float formatter.
+    blocks: Iterable
+        Tuples of the arrays and headers of each block.
+    delimiter: str
+        String separating the values in each row.
+    workers: int
+        Number of processes formatting blocks concurrently, blocks are formatted in
+        the calling process if 1. Only a few blocks are in flight at any time so
+        memory doesn't grow with the size of the output.
+
+    """
+    if workers <= 1:
+        for arrays, headers in blocks:
+            stream.write(format_slabs(fmt, arrays, headers, delimiter))
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for arrays, headers in blocks:
+            pending.append(
+                executor.submit(format_slabs, fmt, arrays, headers, delimiter)
+            )
+            if len(pending) > 2 * workers:
+                stream.write(pending.popleft().result())
+        while pending:
+            stream.write(pending.popleft().result())
+
+
+def write_unformatted(stream, blocks: Iterable[list[np.ndarray]]):
+    """Write blocks of slabs as sequential unformatted Fortran records.
+
+    Each slab is written as a single record of little-endian float32 values framed
+    by its 4-byte record length so SWAN reads it in UNFORMATTED format with idla=4.
+
+    Parameters
+    ----------
+    stream: file
+        Binary stream to write to.
+    blocks: Iterable
+        Arrays of shape (ntimes, nrows, ncols) of each block, the slabs of each
+        array are written one after another for each time.
+
+    """
+    for arrays in blocks:
+        records = []
+        for array in arrays:
+            ntimes = array.shape[0]
+            record = np.empty((ntimes, array[0].size + 2), dtype="<f4")
+            record[:, 1:-1] = array.reshape(ntimes, -1)
+            record.view("<i4")[:, [0, -1]] = 4 * array[0].size
+            records.append(record)
+        stream.write(np.concatenate(records, axis=1).tobytes())
+
+
+def _write_tpar(
+    output_file: str,
+    times: pd.Index,
+    hs: np.ndarray,
+    per: np.ndarray,
+    dirn: np.ndarray,
+    spread: str,
+):
+    """Write the TPAR file of one boundary point with a single DataFrame call."""
+    df = pd.DataFrame(
+        {
+            "time": times,
+            "hs": np.char.mod("%0.2f", hs),
+            "per": np.char.mod("%0.2f", per),
+            "dir": np.char.mod("%0.1f", dirn),
+            "spread": spread,
+        }
+    )
+    with open(output_file, "wt") as f:
+        f.write("TPAR\n")
+        df.to_csv(f, sep=" ", header=False, index=False, lineterminator="\n")
+
+
 def dset_to_swan(
     dset: xr.Dataset,
     output_file: str,
@@ -228,6 +533,8 @@ def dset_to_swan(
     fmt: str = "%4.2f",
     fill_value: float = FILL_VALUE,
     time_dim="time",
+    workers: int = 1,
+    format: str = "free",
 ):
     """Convert xarray Dataset into SWAN ASCII file.
 
@@ -245,6 +552,10 @@ def dset_to_swan(
         Fill value.
     time_dim: str
         Name of the time dimension if available in the dataset.
+    workers: int
+        Number of processes used to format the data.
+    format: str
+        Either "free" to write ascii or "unformatted" to write binary records.
 
     """
     # Input checking
@@ -264,32 +575,22 @@ def dset_to_swan(
     # Write to ascii
     logger.debug(f"Writing SWAN ASCII file: {output_file}")
 
-    # Use formatting utilities imported at the top of the file
-
-    # Import formatting utilities at function level to avoid scoping issues
     # Create a formatted box for logging
     log_box(title="WRITING SWAN ASCII DATA", logger=logger)
 
     start_time = time_module.time()
     file_size = 0
-    total_times = len(dset[time_dim])
-
-    with open(output_file, "w") as stream:
-        for i, t in enumerate(dset[time_dim]):
-            time_str = pd.to_datetime(t.values)
-            if (
-                i % max(1, total_times // 10) == 0 or i == total_times - 1
-            ):  # Log progress at 10% intervals
-                logger.debug(
-                    f"Writing progress: {i+1}/{total_times} times ({(i+1)/total_times*100:.1f}%) - Time: {time_str}"
-                )
-            else:
-                logger.debug(f"Appending Time {time_str} to {output_file}")
 
-            for data_var in variables:
-                logger.debug(f"Appending Variable {data_var} to {output_file}")
-                data = dset[data_var].sel(time=t).fillna(fill_value).values
-                np.savetxt(fname=stream, X=data, fmt=fmt, delimiter="\t")
+    blocks = (
+        arrays for arrays, _ in time_blocks(dset, variables, time_dim, fill_value)
+    )
+    if format == "unformatted":
+        with open(output_file, "wb", buffering=1 << 20) as stream:
+            write_unformatted(stream, blocks)
+    else:
+        with open(output_file, "w", buffering=1 << 20) as stream:
+            blocks = ((arrays, None) for arrays in blocks)
+            write_blocks(stream, fmt, blocks, delimiter="\t", workers=workers)
 
     elapsed_time = time_module.time() - start_time
     file_size = Path(output_file).stat().st_size / (1024 * 1024)  # Size in MB
@@ -362,6 +663,8 @@ class Swan_accessor(object):
         rot=0.0,
         vmin=float("-inf"),
         fill_value=FILL_VALUE,
+        workers=1,
+        format="free",
     ):
         """Write SWAN inpgrid BOTTOM file.
 
@@ -385,6 +688,10 @@ class Swan_accessor(object):
             Fill value.
         fac: float
             Multiplying factor in case data are not in m or should be reversed.
+        workers: int
+            Number of processes used to format the data.
+        format: str
+            Either "free" to write ascii or "unformatted" to write binary records.
 
         Returns
         -------
@@ -402,10 +709,15 @@ class Swan_accessor(object):
             fmt=fmt,
             variables=[z],
             fill_value=fill_value,
+            workers=workers,
+            format=format,
         )
         grid = self.grid(x=x, y=y, rot=rot)
         inpgrid = f"INPGRID BOTTOM {grid.inpgrid}"
-        readinp = f"READINP BOTTOM {fac} '{Path(output_file).name}' 3 FREE"
+        if format == "unformatted":
+            readinp = f"READINP BOTTOM {fac} '{Path(output_file).name}' 4 UNFORMATTED"
+        else:
+            readinp = f"READINP BOTTOM {fac} '{Path(output_file).name}' 3 FREE"
         return inpgrid, readinp
 
     def to_inpgrid(
@@ -420,6 +732,8 @@ class Swan_accessor(object):
         fac: float = 1.0,
         rot: float = 0.0,
         time: str = "time",
+        workers: int = 1,
+        format: str = "free",
     ):
         """This function writes to a SWAN inpgrid format file (i.e. WIND)
 
@@ -445,6 +759,11 @@ class Swan_accessor(object):
             Rotation angle, required if the grid has been previously rotated.
         time: str
             Name of the time variable in the dataset
+        workers: int
+            Number of processes used to format the data.
+        format: str
+            Either "free" to write ascii with a time header line before each time
+            or "unformatted" to write binary records without time headers.
 
         Returns
         -------
@@ -462,25 +781,23 @@ class Swan_accessor(object):
         dt = time_diffs.mean() / pd.to_timedelta(1, "h")
         dt_str = f"{dt:.2f}"  # Format as string to avoid formatting issues
 
+        # Each time is written as a SWAN time header followed by the components
+        variables = [z1] if z2 is None else [z1, z2]
         inptimes = []
-        with open(output_file, "wt") as f:
-            # iterate through time
-            for ti, windtime in enumerate(ds[time].values):
-                time_str = pd.to_datetime(windtime).strftime("%Y%m%d.%H%M%S")
-                logger.debug(time_str)
-
-                # write SWAN time header to file:
-                f.write(f"{time_str}\n")
 
-                # Write first component to file
-                z1t = np.squeeze(ds[z1].isel(dict(time=ti)).values)
-                np.savetxt(f, z1t, fmt=fmt)
+        def blocks():
+            for arrays, times in time_blocks(ds, variables, time, squeeze=True):
+                headers = list(times.strftime("%Y%m%d.%H%M%S"))
+                logger.debug(f"Writing times {headers[0]} to {headers[-1]}")
+                inptimes.extend(headers)
+                yield arrays, headers
 
-                if z2 is not None:
-                    z2t = np.squeeze(ds[z2].isel(dict(time=ti)).values)
-                    np.savetxt(f, z2t, fmt=fmt)
-
-                inptimes.append(time_str)
+        if format == "unformatted":
+            with open(output_file, "wb", buffering=1 << 20) as f:
+                write_unformatted(f, (arrays for arrays, _ in blocks()))
+        else:
+            with open(output_file, "wt", buffering=1 << 20) as f:
+                write_blocks(f, fmt, blocks(), workers=workers)
 
         if len(inptimes) < 1:
             os.remove(output_file)
@@ -492,7 +809,12 @@ class Swan_accessor(object):
         grid = self.grid(x=x, y=y, rot=rot)
 
         inpgrid = f"INPGRID {var} {grid.inpgrid} NONSTATION {inptimes[0]} {dt_str} HR"
-        readinp = f"READINP {var} {fac} '{Path(output_file).name}' 3 0 1 0 FREE"
+        if format == "unformatted":
+            readinp = (
+                f"READINP {var} {fac} '{Path(output_file).name}' 4 0 0 0 UNFORMATTED"
+            )
+        else:
+            readinp = f"READINP {var} {fac} '{Path(output_file).name}' 3 0 1 0 FREE"
 
         # Log detailed information about the generated grid
         logger.debug(f"Created {var} grid with:")
@@ -514,11 +836,14 @@ class Swan_accessor(object):
         per_var="pk_wav_per",
         dir_var="pk_wav_dir",
         dir_spread=20.0,
+        workers=1,
     ):
         """This function writes parametric boundary forcing to a set of
         TPAR files at a given distance based on gridded wave output. It returns the string to be included in the Swan INPUT file.
 
-        At present simple nearest neighbour point lookup is used.
+        At present simple nearest neighbour point lookup is used. All boundary points
+        are selected at once along a `site` dimension and the TPAR files can be
+        written concurrently by `workers` processes.
 
         Args:
         TBD
@@ -536,45 +861,53 @@ class Swan_accessor(object):
 
         n_pts = int((boundary.length) / interval)
         splits = np.linspace(0, 1.0, n_pts)
-        j = 0
+        points = []
         for i in range(len(splits) - 1):
             segment = substring(
                 boundary.exterior, splits[i], splits[i + 1], normalized=True
             )
-            xp = segment.coords[1][0]
-            yp = segment.coords[1][1]
-            logger.debug(f"Extracting point: {xp},{yp}")
-            ds_point = self._obj.sel(
-                indexers={x_var: xp, y_var: yp}, method="nearest", tolerance=interval
+            points.append(segment.coords[1][:2])
+        if not points:
+            return bound_string
+        xp, yp = np.array(points).T
+        logger.debug(f"Extracting {len(points)} boundary points")
+        ds_sites = self._obj[[hs_var, per_var, dir_var]].sel(
+            indexers={
+                x_var: xr.DataArray(xp, dims="site"),
+                y_var: xr.DataArray(yp, dims="site"),
+            },
+            method="nearest",
+            tolerance=interval,
+        )
+        ds_sites = ds_sites.transpose("site", "time").load()
+        valid = ~np.isnan(ds_sites[hs_var].values).any(axis=1)
+
+        times = pd.to_datetime(ds_sites.time.values).strftime("%Y%m%d.%H%M%S")
+        spread = f"{dir_spread:0.2f}"
+        tpars = []
+        for j, site in enumerate(np.flatnonzero(valid)):
+            output_tpar = f"{dest_path}/{j}.TPAR"
+            logger.debug(f"Writing boundary point {j} to {output_tpar}")
+            logger.debug(f"  → Location: ({xp[site]:.5f}, {yp[site]:.5f})")
+            tpars.append(
+                (
+                    output_tpar,
+                    times,
+                    ds_sites[hs_var].values[site],
+                    ds_sites[per_var].values[site],
+                    ds_sites[dir_var].values[site],
+                    spread,
+                )
+            )
+            bound_string += file_string.format(
+                len=splits[site + 1] * boundary.length, fname=f"{j}.TPAR"
             )
-            if len(ds_point.time) == len(self._obj.time):
-                if not np.any(np.isnan(ds_point[hs_var])):
-                    output_tpar = f"{dest_path}/{j}.TPAR"
-                    logger.debug(f"Writing boundary point {j} to {output_tpar}")
-                    logger.debug(f"  → Location: ({xp:.5f}, {yp:.5f})")
-                    logger.debug(f"  → Time points: {len(ds_point.time)}")
-
-                    with open(output_tpar, "wt") as f:
-                        f.write("TPAR\n")
-                        for t in range(len(ds_point.time)):
-                            ds_row = ds_point.isel(time=t)
-                            lf = "{tt} {hs:0.2f} {per:0.2f} {dirn:0.1f} {spr:0.2f}\n"
-                            f.write(
-                                lf.format(
-                                    tt=str(
-                                        ds_row["time"]
-                                        .dt.strftime("%Y%m%d.%H%M%S")
-                                        .values
-                                    ),
-                                    hs=float(ds_row[hs_var]),
-                                    per=float(ds_row[per_var]),
-                                    dirn=float(ds_row[dir_var]),
-                                    spr=dir_spread,
-                                )
-                            )
-                    bound_string += file_string.format(
-                        len=splits[i + 1] * boundary.length, fname=f"{j}.TPAR"
-                    )
-                    j += 1
+
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(_write_tpar, *zip(*tpars)))
+        else:
+            for tpar in tpars:
+                _write_tpar(*tpar)
 
         return bound_string
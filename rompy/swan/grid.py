@@ -4,6 +4,12 @@ SWAN Grid Module
 This module provides grid-related functionality for the SWAN model within the ROMPY framework.
 """
 
+import os
+import re
+import uuid
+from functools import lru_cache
+from io import BytesIO
+from pathlib import Path
 from typing import Literal, Optional
 
 import numpy as np
@@ -16,6 +22,112 @@ from rompy.swan.subcomponents.readgrid import GRIDREGULAR
 
 logger = get_logger(__name__)
 
+# Row headers of the coordinate blocks in Delft3D/RGFGRID grid files
+ETA = re.compile(rb"ETA=\s*\d+", re.IGNORECASE)
+
+
+def _parse_rgf(text: bytes) -> tuple[np.ndarray, np.ndarray]:
+    """Parse the coordinates of a Delft3D/RGFGRID grid file.
+
+    Both the RGFGRID layout, where the x and y blocks follow the grid dimensions and
+    each row starts with an "ETA= n" header, and the layout with the blocks
+    introduced by "x-coordinates" and "y-coordinates" lines are supported.
+
+    """
+    missing = None
+    lines = text.splitlines(keepends=True)
+    offset = 0
+    shape = None
+    for ind, line in enumerate(lines):
+        stripped = line.strip()
+        offset += len(line)
+        if not stripped or stripped.startswith(b"*"):
+            continue
+        if b"=" in stripped and not ETA.match(stripped):
+            key, value = (v.strip() for v in stripped.split(b"=", 1))
+            if key.lower() == b"missing value":
+                missing = float(value)
+            continue
+        if stripped.lower() == b"x-coordinates":
+            break
+        # Grid dimensions are followed by a line of three zeros
+        mmax, nmax = (int(v) for v in stripped.split()[:2])
+        shape = (nmax, mmax)
+        if len(lines) > ind + 1 and len(lines[ind + 1].split()) == 3:
+            offset += len(lines[ind + 1])
+        break
+    body = text[offset:]
+
+    if shape is None:
+        # Blocks introduced by coordinate names, one grid row per line
+        xblock, yblock = re.split(rb"(?im)^\s*y-coordinates\s*$", body, maxsplit=1)
+        x = np.loadtxt(BytesIO(xblock), ndmin=2)
+        y = np.loadtxt(BytesIO(yblock), ndmin=2)
+    else:
+        values = np.fromstring(ETA.sub(b" ", body).decode("ascii"), sep=" ")
+        size = shape[0] * shape[1]
+        if values.size != 2 * size:
+            raise ValueError(
+                f"Expected {2 * size} coordinates for a {shape[1]}x{shape[0]} grid, "
+                f"got {values.size}"
+            )
+        x = values[:size].reshape(shape)
+        y = values[size:].reshape(shape)
+    if missing is not None:
+        x[x == missing] = np.nan
+        y[y == missing] = np.nan
+    return x, y
+
+
+@lru_cache(maxsize=8)
+def _read_curvilinear_grid(filename: str, mtime: int, sidecar: bool) -> tuple:
+    """Read grid coordinates, cached on the file name and modification time."""
+    cachefile = Path(f"{filename}.npz")
+    if cachefile.is_file() and cachefile.stat().st_mtime_ns >= mtime:
+        logger.debug(f"Loading curvilinear grid from {cachefile}")
+        with np.load(cachefile) as data:
+            x, y = data["x"], data["y"]
+    else:
+        logger.debug(f"Reading curvilinear grid {filename}")
+        x, y = _parse_rgf(Path(filename).read_bytes())
+        if sidecar:
+            tmp = cachefile.with_name(f".{cachefile.stem}.{uuid.uuid4().hex}.npz")
+            try:
+                np.savez(tmp, x=x, y=y)
+                os.replace(tmp, cachefile)
+            except OSError as err:
+                tmp.unlink(missing_ok=True)
+                logger.warning(f"Could not write grid sidecar {cachefile}: {err}")
+    x.flags.writeable = False
+    y.flags.writeable = False
+    return x, y
+
+
+def read_curvilinear_grid(
+    filename: str | Path, sidecar: bool = True
+) -> tuple[np.ndarray, np.ndarray]:
+    """Read the coordinates of a Delft3D/RGFGRID curvilinear grid file.
+
+    Parameters
+    ----------
+    filename: str | Path
+        Grid file to read.
+    sidecar: bool
+        Write the parsed coordinates to a binary `<filename>.npz` sidecar file which
+        is loaded instead of parsing the grid file again until the grid file changes.
+
+    Returns
+    -------
+    x: np.ndarray
+        Read-only x coordinates of shape (ny, nx), missing values are nan.
+    y: np.ndarray
+        Read-only y coordinates of shape (ny, nx), missing values are nan.
+
+    """
+    filename = str(filename)
+    mtime = Path(filename).stat().st_mtime_ns
+    return _read_curvilinear_grid(filename, mtime, sidecar)
+
 
 class SwanGrid(RegularGrid):
     """Regular SWAN grid in geographic space."""
@@ -42,45 +154,48 @@ class SwanGrid(RegularGrid):
         return self
 
     def _regen_grid(self):
-        if self.grid_type == "REG":
-            _x, _y = self._gen_reg_cgrid()
-        elif self.grid_type == "CURV":
-            _x, _y = self._gen_curv_cgrid()
-        self.x = _x
-        self.y = _y
+        """Regenerate the grid coordinates on the next access."""
+        self._cgrid = None
 
-    def _gen_curv_cgrid(self):
-        """loads a SWAN curvilinear grid and returns cgrid lat/lons and
-        command to be used in SWAN contol file. The Default grid is one I made using
-        Deltares' RGFGrid tool and converted to a SWAN-friendly formate using Deltares
-        OpenEarth code "swan_io_grd.m"
+    def _cached_cgrid(self) -> tuple:
+        if self.grid_type == "CURV":
+            return self._gen_curv_cgrid()
+        return super()._cached_cgrid()
 
-        """
-        # number of grid cells in the 'x' and 'y' directions:
-        # (you can get this from d3d_qp.m or other Deltares OpenEarth code)
-        nX = self.nx
-        nY = self.ny
+    def _gen_curv_cgrid(self, sidecar: bool = True) -> tuple:
+        """Coordinates of the SWAN curvilinear grid read from `gridfile`.
+
+        The grid is read from a Delft3D/RGFGRID grid file, for instance made with
+        Deltares' RGFGrid tool and converted with Deltares OpenEarth code
+        "swan_io_grd.m". Parsed coordinates are cached in memory and in a binary
+        sidecar file next to the grid file, see `read_curvilinear_grid`.
 
-        grid_Data = open(self.gridpath).readlines()
-        ix = grid_Data.index("x-coordinates\n")
-        iy = grid_Data.index("y-coordinates\n")
-        lons = []
-        lats = []
-        for idx in np.arange(ix + 1, iy):
-            lons.append(re.sub("\n", "", grid_Data[idx]).split())
-        for idx in np.arange(iy + 1, len(grid_Data)):
-            lats.append(re.sub("\n", "", grid_Data[idx]).split())
+        """
+        return read_curvilinear_grid(self.gridfile, sidecar=sidecar)
 
-        def flatten(l):
-            return [item for sublist in l for item in sublist]
+    @property
+    def minx(self) -> float:
+        if self.grid_type == "CURV":
+            return np.nanmin(self.x)
+        return super().minx
 
-        lons = np.array(flatten(lons)).astype(np.float)
-        lats = np.array(flatten(lats)).astype(np.float)
+    @property
+    def maxx(self) -> float:
+        if self.grid_type == "CURV":
+            return np.nanmax(self.x)
+        return super().maxx
 
-        x = np.reshape(lats, (nX, nY))
-        y = np.reshape(lons, (nX, nY))
+    @property
+    def miny(self) -> float:
+        if self.grid_type == "CURV":
+            return np.nanmin(self.y)
+        return super().miny
 
-        return x, y
+    @property
+    def maxy(self) -> float:
+        if self.grid_type == "CURV":
+            return np.nanmax(self.y)
+        return super().maxy
 
     @property
     def inpgrid(self):
@@ -178,76 +293,50 @@ class SwanGrid(RegularGrid):
         )[0]
         ds_spec = ds_spec.isel(site=inds)
 
-        # Work out the closest spectral points
-        def _nearestPointOnLine(p1, p2, p3):
-            # calculate the distance of p3 from the line between p1 and p2 and return
-            # the closest point on the line
-
-            from math import fabs, sqrt
-
-            a = p2[1] - p1[1]
-            b = -1.0 * (p2[0] - p1[0])
-            c = p2[0] * p1[1] - p2[1] * p1[0]
-
-            dist = fabs(a * p3[0] + b * p3[1] + c) / sqrt(a**2 + b**2)
-            x = (b * (b * p3[0] - a * p3[1]) - a * c) / (a**2 + b**2)
-            y = (a * (-b * p3[0] + a * p3[1]) - b * c) / (a**2 + b**2)
-
-            return dist, x, y
-
-        bx, by = self.boundary_points()
-        pol = np.stack([bx, by])
-
         # Spectra points
         ds_spec.lon.load()
         ds_spec.lat.load()
         ds_spec["lon_original"] = ds_spec["lon"]
         ds_spec["lat_original"] = ds_spec["lat"]
-        p3s = list(zip(ds_spec.lon.values, ds_spec.lat.values))
+        lon = ds_spec.lon.values
+        lat = ds_spec.lat.values
+
+        # Distance of all spectra points from the line through each boundary segment
+        # and closest points on these lines, arrays have shape (nsegments, nsites)
+        bx, by = self.boundary_points()
+        a = (by[1:] - by[:-1])[:, None]
+        b = -(bx[1:] - bx[:-1])[:, None]
+        c = (bx[1:] * by[:-1] - by[1:] * bx[:-1])[:, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            norm = a**2 + b**2
+            dists = np.abs(a * lon + b * lat + c) / np.sqrt(norm)
+            segx = (b * (b * lon - a * lat) - a * c) / norm
+            segy = (a * (-b * lon + a * lat) - b * c) / norm
+
+        # Points projected onto each segment in turn, ordered by segment then site
+        iseg, isite = np.nonzero(dists < dist_thres)
+        segLon = segx[iseg, isite]
+        segLat = segy[iseg, isite]
+        for i in np.unique(iseg):
+            logger.debug(f"Segment {i} - Indices {isite[iseg == i]}")
+
+        ds_boundary = ds_spec.isel(site=isite)
+        ds_boundary["lon"] = ds_boundary["lon"].copy(data=segLon)
+        ds_boundary["lat"] = ds_boundary["lat"].copy(data=segLat)
 
         if plot:
             fig, ax = self.plot()
-            ax.scatter(ds_spec.lon, ds_spec.lat)
-
-        specPoints = []
-        for i in range(pol.shape[1] - 1):
-            p1 = pol[:, i]
-            p2 = pol[:, i + 1]
-            np.stack((p1, p2))
-            output = np.array(
-                list(map(lambda xi: _nearestPointOnLine(p1, p2, xi), p3s))
+            ax.scatter(lon, lat)
+            ax.plot(
+                np.stack([segLon, lon[isite]]),
+                np.stack([segLat, lat[isite]]),
+                color="r",
+                lw=2,
             )
-            dists = output[:, 0]
-            segmentPoints = output[:, 1:]
-            inds = np.where((dists < dist_thres))[0]
-
-            # Loop through the points projected onto the line
-            for ind in inds:
-                specPoint = ds_spec.isel(site=ind)
-
-                segLon = segmentPoints[ind, 0]
-                segLat = segmentPoints[ind, 1]
-
-                if plot:
-                    ax.plot(
-                        [segLon, specPoint.lon],
-                        [segLat, specPoint.lat],
-                        color="r",
-                        lw=2,
-                    )
-                    ax.scatter(specPoint.lon, specPoint.lat, marker="o", color="b")
-                    ax.scatter(segLon, segLat, marker="x", color="g")
-
-                specPoint["lon"] = segLon
-                specPoint["lat"] = segLat
-                specPoints.append(specPoint)
-
-            logger.debug(f"Segment {i} - Indices {inds}")
-
-        if plot:
+            ax.scatter(lon[isite], lat[isite], marker="o", color="b")
+            ax.scatter(segLon, segLat, marker="x", color="g")
             fig.show()
 
-        ds_boundary = xr.concat(specPoints, dim="site")
         return ds_boundary
 
     def __repr__(self):
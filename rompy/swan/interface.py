@@ -39,6 +39,13 @@ class DataInterface(RompyBaseModel):
     )
     bottom: Optional[SwanDataGrid] = Field(default=None, description="Bathymetry data")
     input: list[SwanDataGrid] = Field(default=[], description="Input grid data")
+    format: Optional[Literal["free", "unformatted"]] = Field(
+        default=None,
+        description=(
+            "Format of the files written for all grids, overrides the `format` of "
+            "each grid if provided"
+        ),
+    )
 
     @field_validator("input")
     @classmethod
@@ -61,7 +68,11 @@ class DataInterface(RompyBaseModel):
         inputs.extend(self.input)
         cmds = []
         for input in inputs:
-            cmds.append(input.get(destdir=staging_dir, grid=grid, time=period))
+            cmds.append(
+                input.get(
+                    destdir=staging_dir, grid=grid, time=period, format=self.format
+                )
+            )
         return "\n".join(cmds)
 
     def render(self, *args, **kwargs):
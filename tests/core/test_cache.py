@@ -0,0 +1,104 @@
+"""
+Tests for the content-addressed file cache and the dataset cache.
+"""
+
+import os
+
+from rompy.core.cache import DatasetCache, FileCache, cache_key, file_hash
+
+
+def test_cache_key_deterministic():
+    assert cache_key("a", {"x": 1, "y": 2}) == cache_key("a", {"y": 2, "x": 1})
+    assert cache_key("a", {"x": 1}) != cache_key("a", {"x": 2})
+
+
+def test_file_hash_content(tmp_path):
+    a, b = tmp_path / "a.txt", tmp_path / "b.txt"
+    a.write_text("hgrid")
+    b.write_text("hgrid")
+    assert file_hash(a) == file_hash(b)
+    b.write_text("hgrid changed")
+    assert file_hash(a) != file_hash(b)
+
+
+def test_fetch_store(tmp_path):
+    cache = FileCache(tmp_path / "cache")
+    src = tmp_path / "drag.gr3"
+    src.write_text("drag")
+    dest = tmp_path / "run" / "drag.gr3"
+    assert cache.fetch("key", dest) is None
+
+    cache.store("key", src)
+    src.write_text("modified after storing")
+    assert cache.fetch("key", dest) == dest
+    assert dest.read_text() == "drag"
+    assert dest.stat().st_nlink == 2
+
+
+def test_fetch_copy(tmp_path):
+    cache = FileCache(tmp_path / "cache", link=False)
+    src = tmp_path / "tvd.prop"
+    src.write_text("1 1\n")
+    cache.store("key", src)
+    dest = cache.fetch("key", tmp_path / "run" / "tvd.prop")
+    assert dest.read_text() == "1 1\n"
+    assert dest.stat().st_nlink == 1
+
+
+def test_evict_least_recently_used(tmp_path):
+    cache = FileCache(tmp_path / "cache", max_size=25)
+    src = tmp_path / "file.gr3"
+    src.write_text("x" * 10)
+    for i, key in enumerate(["a", "b"]):
+        cache.store(key, src)
+        os.utime(cache.path(key, src.name), ns=(i * 10**9, i * 10**9))
+
+    # Using "a" makes "b" the least recently used entry
+    cache.fetch("a", tmp_path / "run" / "file.gr3")
+    cache.store("c", src)
+    assert cache.path("a", src.name).exists()
+    assert not cache.path("b", src.name).exists()
+    assert cache.path("c", src.name).exists()
+
+
+class Handle:
+    def __init__(self, name):
+        self.name = name
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_dataset_cache_opens_once():
+    cache = DatasetCache(max_open=2)
+    opened = []
+
+    def opener():
+        opened.append(Handle("a"))
+        return opened[-1]
+
+    assert cache.get("a", opener) is cache.get("a", opener)
+    assert len(opened) == 1
+    view = cache.get("a", opener, view="v", build=lambda h: [h.name])
+    assert cache.get("a", opener, view="v", build=lambda h: None) is view
+
+
+def test_dataset_cache_lru_eviction_closes_handles():
+    cache = DatasetCache(max_open=2)
+    handles = {key: Handle(key) for key in "abc"}
+    cache.get("a", lambda: handles["a"])
+    cache.get("b", lambda: handles["b"])
+    cache.get("a", lambda: handles["a"])
+    cache.get("c", lambda: handles["c"])
+    assert len(cache) == 2
+    assert handles["b"].closed
+    assert not handles["a"].closed
+    cache.clear()
+    assert handles["a"].closed and handles["c"].closed
+
+
+def test_dataset_cache_disabled():
+    cache = DatasetCache(max_open=0)
+    assert cache.get("a", lambda: Handle("a")) is not cache.get("a", lambda: Handle("a"))
+    assert len(cache) == 0
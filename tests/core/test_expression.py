@@ -0,0 +1,92 @@
+"""
+Tests for the restricted derived variable expressions.
+"""
+
+import numpy as np
+import pytest
+import xarray as xr
+from pydantic import ValidationError
+
+from rompy.core import expression
+from rompy.core.expression import compile_expression
+from rompy.core.filters import Filter, derived_filter
+
+
+@pytest.fixture
+def ds():
+    shape = (4, 30, 20)
+    return xr.Dataset(
+        {
+            "u": (("time", "y", "x"), np.random.randn(*shape)),
+            "v": (("time", "y", "x"), np.random.randn(*shape)),
+            "depth": (("y", "x"), np.random.rand(*shape[1:]) * 100),
+        },
+        coords={"time": np.arange(4), "y": np.arange(30), "x": np.arange(20)},
+    )
+
+
+@pytest.mark.parametrize(
+    "expr, expected",
+    [
+        ("np.sqrt(ds.u**2 + ds.v**2)", lambda ds: np.sqrt(ds.u**2 + ds.v**2)),
+        ("ds['depth'] * -1", lambda ds: ds.depth * -1),
+        (
+            "np.arctan2(v, u) * 180 / np.pi",
+            lambda ds: np.arctan2(ds.v, ds.u) * 180 / np.pi,
+        ),
+        ("u * depth + 1", lambda ds: ds.u * ds.depth + 1),
+    ],
+)
+def test_expression_matches_xarray(ds, expr, expected):
+    xr.testing.assert_allclose(compile_expression(expr)(ds), expected(ds))
+
+
+def test_expression_blocks(ds, monkeypatch):
+    monkeypatch.setattr(expression, "BLOCK_SIZE", 7)
+    result = compile_expression("np.hypot(ds.u, ds.v) - depth")(ds)
+    xr.testing.assert_allclose(result, np.hypot(ds.u, ds.v) - ds.depth)
+
+
+def test_expression_dask_lazy(ds):
+    dsc = ds.chunk({"time": 1})
+    result = compile_expression("np.sqrt(ds.u**2 + ds.v**2)")(dsc)
+    assert result.chunks == dsc.u.chunks
+    xr.testing.assert_allclose(result.compute(), np.sqrt(ds.u**2 + ds.v**2))
+
+
+@pytest.mark.parametrize(
+    "expr",
+    [
+        "__import__('os').system('ls')",
+        "ds.u.values",
+        "np.sum(ds.u)",
+        "np.sqrt(ds.u, out=ds.v)",
+        "(lambda: 1)()",
+        "ds.u if True else ds.v",
+        "'a' * 3",
+        "ds",
+        "ds.u[0]",
+    ],
+)
+def test_expression_rejected(expr):
+    with pytest.raises(ValueError):
+        compile_expression(expr)
+
+
+def test_expression_missing_variable(ds):
+    with pytest.raises(ValueError, match="not in dataset"):
+        compile_expression("ds.hs * 2")(ds)
+
+
+def test_compile_expression_cached():
+    assert compile_expression("ds.u * 2") is compile_expression("ds.u * 2")
+
+
+def test_derived_filter(ds):
+    dsout = derived_filter(ds, {"spd": "np.sqrt(ds.u**2 + ds.v**2)"})
+    assert dsout.spd.dims == ("time", "y", "x")
+
+
+def test_filter_rejects_unsafe_derived():
+    with pytest.raises(ValidationError):
+        Filter(derived={"derived_variables": {"x": "__import__('os')"}})
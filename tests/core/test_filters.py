@@ -0,0 +1,168 @@
+"""
+Tests for the filter functions and the filter pushdown planner.
+"""
+
+import logging
+
+import numpy as np
+import pytest
+import xarray as xr
+
+from rompy.core.filters import (Filter, _sort_permutation, crop_filter,
+                                plan_filters, sortby)
+from rompy.core.types import Slice
+
+
+def make_dataset():
+    lat = np.arange(10.0, -10.5, -0.5)
+    lon = np.arange(0.0, 20.0, 0.5)
+    time = np.arange("2023-01-01", "2023-01-03", np.timedelta64(6, "h"), "M8[ns]")
+    shape = (time.size, lat.size, lon.size)
+    return xr.Dataset(
+        {
+            "u10": (("time", "latitude", "longitude"), np.random.rand(*shape)),
+            "v10": (("time", "latitude", "longitude"), np.random.rand(*shape)),
+            "msl": (("time", "latitude", "longitude"), np.random.rand(*shape)),
+        },
+        coords={"time": time, "latitude": lat, "longitude": lon},
+    )
+
+
+def test_plan_filters_matches_filter(caplog):
+    ds = make_dataset()
+    filters = Filter(
+        sort={"coords": ["latitude"]},
+        subset={"data_vars": ["u10", "v10"]},
+        crop={
+            "time": slice("2023-01-01T06", "2023-01-02"),
+            "latitude": slice(-2.0, 5.0),
+            "longitude": slice(1.0, 3.0),
+        },
+    )
+    with caplog.at_level(logging.DEBUG, logger="rompy.core.filters"):
+        planned, remaining = plan_filters(ds, filters)
+    assert remaining.crop == {} and remaining.subset == {}
+    assert "Filter pushdown avoided" in caplog.text
+    assert planned.nbytes < ds.nbytes
+    xr.testing.assert_identical(remaining(planned), filters(ds))
+
+
+def test_plan_filters_keeps_non_monotonic_crop():
+    ds = make_dataset()
+    ds = ds.isel(longitude=np.random.permutation(ds.longitude.size))
+    filters = Filter(
+        sort={"coords": ["longitude"]}, crop={"longitude": slice(1.0, 3.0)}
+    )
+    planned, remaining = plan_filters(ds, filters)
+    assert list(remaining.crop) == ["longitude"]
+    assert planned.longitude.size == ds.longitude.size
+    xr.testing.assert_identical(remaining(planned), filters(ds))
+
+
+def test_plan_filters_sort_coordinate_not_in_dataset():
+    ds = make_dataset()
+    filters = Filter(sort={"coords": "lat"}, crop={"longitude": slice(1.0, 3.0)})
+    planned, remaining = plan_filters(ds, filters)
+    assert remaining.crop == {}
+    xr.testing.assert_identical(remaining(planned), filters(ds))
+
+
+def test_crop_filter_non_dimension_coordinate():
+    ds = xr.Dataset(
+        {"hs": (("time", "site"), np.random.rand(3, 6))},
+        coords={"lon": (("site",), np.arange(6.0))},
+    )
+    cropped = crop_filter(ds, lon=Slice(start=1, stop=4))
+    assert cropped.lon.values.tolist() == [2.0, 3.0]
+    assert cropped.hs.dims == ("time", "site")
+
+
+def test_crop_filter_curvilinear_coordinate():
+    x, y = np.meshgrid(np.arange(5.0), np.arange(4.0))
+    ds = xr.Dataset(
+        {"depth": (("j", "i"), np.ones(x.shape))},
+        coords={"lon": (("j", "i"), x + 0.5 * y)},
+    )
+    cropped = crop_filter(ds, lon=Slice(start=0.5, stop=2))
+    assert dict(cropped.sizes) == {"j": 4, "i": 2}
+    inside = ((cropped.lon > 0.5) & (cropped.lon < 2)).values
+    assert np.isfinite(cropped.depth.values[inside]).all()
+    assert np.isnan(cropped.depth.values[~inside]).all()
+
+
+def spectra(nsite=5, ntime=4, dirs=np.arange(0.0, 360.0, 10.0), chunks=None):
+    shape = (ntime, nsite, 50, dirs.size)
+    if chunks is None:
+        efth = np.random.rand(*shape).astype("float32")
+    else:
+        import dask.array as da
+
+        efth = da.zeros(shape, dtype="float32", chunks=chunks)
+    return xr.Dataset(
+        {"efth": (("time", "site", "freq", "dir"), efth)},
+        coords={
+            "time": np.arange(ntime),
+            "site": np.arange(nsite),
+            "freq": np.geomspace(0.03, 1.0, 50),
+            "dir": dirs,
+        },
+    )
+
+
+def test_sortby_sorted_is_noop():
+    ds = spectra()
+    assert sortby(ds, "dir") is ds
+
+
+def test_sortby_reversed_is_view():
+    ds = spectra(dirs=np.arange(350.0, -10.0, -10.0))
+    dsout = sortby(ds, "dir")
+    xr.testing.assert_identical(dsout, ds.sortby("dir"))
+    assert np.shares_memory(dsout.efth.values, ds.efth.values)
+
+
+def test_sortby_unsorted_permutation_cached():
+    ds = spectra(dirs=np.roll(np.arange(0.0, 360.0, 10.0), 9))
+    xr.testing.assert_identical(sortby(ds, "dir"), ds.sortby("dir"))
+    hits = _sort_permutation.cache_info().hits
+    sortby(ds.isel(site=[0]), "dir")
+    assert _sort_permutation.cache_info().hits == hits + 1
+
+
+def test_sort_filter_non_dimension_coordinate():
+    ds = spectra().assign_coords(lon=("site", [3.0, 1.0, 2.0, 5.0, 4.0]))
+    dsout = Filter(sort={"coords": "lon"})(ds)
+    xr.testing.assert_identical(dsout, ds.sortby("lon"))
+
+
+@pytest.mark.skipif(
+    "not config.getoption('--run-slow')",
+    reason="Only run when --run-slow is given",
+)
+def test_sortby_benchmark():
+    """Benchmark against xarray sortby on a lazy 36 x 50 x 10k x 240 spectra."""
+    import time
+
+    chunks = (24, 1000, 50, 36)
+    cases = {
+        "sorted": np.arange(0.0, 360.0, 10.0),
+        "reversed": np.arange(350.0, -10.0, -10.0),
+        "unsorted": np.roll(np.arange(0.0, 360.0, 10.0), 9),
+    }
+    for case, dirs in cases.items():
+        ds = spectra(nsite=10_000, ntime=240, dirs=dirs, chunks=chunks)
+
+        t0 = time.perf_counter()
+        dsout = sortby(ds, "dir")
+        dsout.efth.isel(time=0, site=0).values
+        elapsed = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        dsref = ds.sortby("dir")
+        dsref.efth.isel(time=0, site=0).values
+        elapsed_xr = time.perf_counter() - t0
+
+        np.testing.assert_array_equal(dsout.dir, dsref.dir)
+        print(f"\nsortby {case}: rompy {elapsed:.4f}s, xarray {elapsed_xr:.4f}s")
+        if case != "unsorted":
+            assert elapsed < elapsed_xr
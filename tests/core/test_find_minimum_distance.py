@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from rompy.core.boundary import find_minimum_distance
+
+
+def brute_force_minimum_distance(points):
+    points = np.asarray(points)
+    dist = np.hypot(*(points[:, None, :] - points[None, :, :]).transpose(2, 0, 1))
+    np.fill_diagonal(dist, np.inf)
+    return dist.min()
+
+
+@pytest.mark.parametrize("npoints", [2, 3, 50, 500])
+def test_find_minimum_distance(npoints):
+    points = np.random.default_rng(npoints).uniform(-180, 180, (npoints, 2))
+    expected = brute_force_minimum_distance(points)
+    assert find_minimum_distance(points) == pytest.approx(expected)
+    assert find_minimum_distance([tuple(p) for p in points]) == pytest.approx(expected)
+
+
+def test_find_minimum_distance_duplicate_points():
+    assert find_minimum_distance([(0.0, 0.0), (1.0, 1.0), (0.0, 0.0)]) == 0.0
+
+
+@pytest.mark.parametrize("points", [[], [(1.0, 2.0)], np.zeros((1, 2))])
+def test_find_minimum_distance_single_point(points):
+    assert find_minimum_distance(points) == float("inf")
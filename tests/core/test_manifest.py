@@ -0,0 +1,104 @@
+"""
+Tests for the manifest of data products used in incremental generation.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import ClassVar, Literal, Optional
+
+from pydantic import PrivateAttr
+
+from rompy.core.data import DataBase
+from rompy.core.manifest import MANIFEST_NAME, incremental_generation
+from rompy.core.time import TimeRange
+
+
+class CopyData(DataBase):
+    model_type: Literal["copy"] = "copy"
+    source: str
+    calls: ClassVar[list] = []
+    _written: Optional[Path] = PrivateAttr(default=None)
+
+    def get(self, destdir, time: Optional[TimeRange] = None) -> Path:
+        self.calls.append(self.id)
+        outfile = Path(destdir) / f"{self.id}.txt"
+        outfile.write_text(Path(self.source).read_text())
+        self._written = outfile
+        return outfile
+
+
+def generate(staging_dir, source, **kwargs):
+    with incremental_generation(staging_dir):
+        data = CopyData(id="wind", source=str(source))
+        return data, data.get(staging_dir, **kwargs)
+
+
+def setup(tmp_path):
+    CopyData.calls.clear()
+    source = tmp_path / "source.txt"
+    source.write_text("wind data")
+    staging_dir = tmp_path / "run"
+    staging_dir.mkdir()
+    return source, staging_dir
+
+
+def test_reuse_unchanged(tmp_path):
+    source, staging_dir = setup(tmp_path)
+    _, outfile = generate(staging_dir, source)
+    data, reused = generate(staging_dir, source)
+    assert CopyData.calls == ["wind"]
+    assert reused == outfile
+    assert data._written == outfile
+    assert (staging_dir / MANIFEST_NAME).is_file()
+
+
+def test_regenerate_changed_source(tmp_path):
+    source, staging_dir = setup(tmp_path)
+    generate(staging_dir, source)
+    source.write_text("new wind data")
+    _, outfile = generate(staging_dir, source)
+    assert len(CopyData.calls) == 2
+    assert outfile.read_text() == "new wind data"
+
+
+def test_regenerate_modified_output(tmp_path):
+    source, staging_dir = setup(tmp_path)
+    _, outfile = generate(staging_dir, source)
+    outfile.write_text("edited")
+    generate(staging_dir, source)
+    os.remove(outfile)
+    generate(staging_dir, source)
+    assert len(CopyData.calls) == 3
+    assert outfile.read_text() == "wind data"
+
+
+def test_regenerate_changed_arguments(tmp_path):
+    source, staging_dir = setup(tmp_path)
+    generate(staging_dir, source, time=TimeRange(start="2023-01-01", end="2023-01-02"))
+    generate(staging_dir, source, time=TimeRange(start="2023-01-01", end="2023-01-03"))
+    assert len(CopyData.calls) == 2
+    # Only the entry used in the last generation is kept
+    manifest = json.loads((staging_dir / MANIFEST_NAME).read_text())
+    assert len(manifest) == 1
+
+
+def test_not_recorded_outside_generation(tmp_path):
+    source, staging_dir = setup(tmp_path)
+    data = CopyData(id="wind", source=str(source))
+    data.get(staging_dir)
+    data.get(staging_dir)
+    assert len(CopyData.calls) == 2
+    assert not (staging_dir / MANIFEST_NAME).exists()
+
+
+def test_regenerate_after_upgrade(tmp_path, monkeypatch):
+    from rompy.core import manifest
+
+    source, staging_dir = setup(tmp_path)
+    generate(staging_dir, source)
+    monkeypatch.setattr(manifest, "__version__", "999.0.0")
+    generate(staging_dir, source)
+    monkeypatch.setattr(manifest, "MANIFEST_VERSION", manifest.MANIFEST_VERSION + 1)
+    generate(staging_dir, source)
+    assert len(CopyData.calls) == 3
@@ -0,0 +1,59 @@
+"""
+Tests for the concurrent task runner.
+"""
+
+import threading
+import time
+
+import pytest
+
+from rompy.core.parallel import TaskErrors, run_tasks
+
+
+def sleeper(value, delay):
+    def task():
+        time.sleep(delay)
+        return value
+
+    return task
+
+
+def failing(message):
+    def task():
+        raise ValueError(message)
+
+    return task
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_run_tasks_order(workers):
+    tasks = {"a": sleeper(1, 0.03), "b": sleeper(2, 0.01), "c": sleeper(3, 0.0)}
+    results = run_tasks(tasks, workers=workers)
+    assert list(results.items()) == [("a", 1), ("b", 2), ("c", 3)]
+
+
+def test_run_tasks_concurrent():
+    barrier = threading.Barrier(3, timeout=5)
+    tasks = {name: barrier.wait for name in "abc"}
+    # Would time out if the tasks weren't running at the same time
+    assert len(run_tasks(tasks, workers=3)) == 3
+
+
+def test_run_tasks_serial_raises_first_error():
+    tasks = {"a": failing("a"), "b": failing("b")}
+    with pytest.raises(ValueError, match="a"):
+        run_tasks(tasks, workers=1)
+
+
+def test_run_tasks_aggregates_errors():
+    done = []
+    tasks = {
+        "a": failing("first"),
+        "b": lambda: done.append("b"),
+        "c": failing("second"),
+    }
+    with pytest.raises(TaskErrors) as excinfo:
+        run_tasks(tasks, workers=2)
+    assert list(excinfo.value.errors) == ["a", "c"]
+    assert "first" in str(excinfo.value) and "second" in str(excinfo.value)
+    assert done == ["b"]
@@ -0,0 +1,79 @@
+"""
+Regression tests for the bctides.in writer.
+
+The reference files in reference_files/bctides were written by the node by node
+writer, the array-formatted writer must reproduce them byte for byte.
+"""
+
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pytest
+import xarray as xr
+
+pytest.importorskip("rompy.schism")
+
+from rompy.schism.bctides import Bctides
+from rompy.schism.gr3 import load_hgrid
+
+HERE = Path(__file__).parent
+REFERENCE = HERE / "reference_files" / "bctides"
+TNAMES = ["m2", "s2", "k1", "o1"]
+
+CASES = {
+    "tidal_mdt_float": dict(
+        flags=[[5, 5, 2, 2]], mdt=0.3, nodal_corrections=True, tidal_potential=True
+    ),
+    "tidal_mdt_array": dict(flags=[[3, 3, 1, 1]], mdt="array"),
+    "constant_int": dict(flags=[[2, 2, 3, 4]], ethconst=[0.5], vthconst=[-100.0]),
+    "constant_float": dict(flags=[[2, 2, 4, 3]], ethconst=[0.25], vthconst=[1.5]),
+    "flather": dict(flags=[[4, -1, 0, 0]]),
+    "relaxed": dict(flags=[[5, -4, 0, 0]], nodal_corrections=True),
+}
+
+
+def tidal_factors(self):
+    """Deterministic tidal factors standing in for the pyTMD calculation."""
+    n = len(self.tnames)
+    self.amp = list(np.linspace(0.1, 0.4, n))
+    self.freq = list(np.linspace(1.4e-4, 7e-5, n))
+    self.nodal_factor = list(np.linspace(0.95, 1.05, n))
+    self.nodal_phase_correction = list(np.linspace(-20.0, 30.0, n))
+    self.species = [2, 2, 1, 1][:n]
+    self.earth_equil_arg = np.linspace(10.0, 350.0, n)
+
+
+def tidal_data(self, lons, lats, tnames, data_type="h"):
+    """Smoothly varying amplitudes and phases including negative phases."""
+    ncomp = 2 if data_type == "h" else 4
+    i = np.arange(len(tnames))[None, :, None]
+    c = np.arange(ncomp)[None, None, :]
+    base = np.sin(lons[:, None, None] * 3.1 + i) * np.cos(lats[:, None, None] + c)
+    data = np.where(c % 2 == 0, np.abs(base), 400.0 * base)
+    return data
+
+
+def write(tmp_path, monkeypatch, flags, mdt=None, **kwargs):
+    monkeypatch.setattr(Bctides, "_get_tidal_factors", tidal_factors)
+    monkeypatch.setattr(Bctides, "_interpolate_tidal_data", tidal_data)
+    gd = load_hgrid(HERE / "test_data" / "hgrid.gr3")
+    if mdt == "array":
+        nodes = gd.iobn[0]
+        mdt = xr.DataArray(
+            np.cos(gd.x[nodes]) * 0.5,
+            dims="node",
+            coords={"x": ("node", gd.x[nodes] + 0.01), "y": ("node", gd.y[nodes])},
+        )
+    bctides = Bctides(gd, flags=flags, mdt=mdt, **kwargs)
+    bctides.tnames = TNAMES
+    bctides._start_time = datetime(2023, 1, 1)
+    bctides._rnday = 2.0
+    return bctides.write_bctides(tmp_path / "bctides.in")
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_bctides_reference(case, tmp_path, monkeypatch):
+    output = write(tmp_path, monkeypatch, **CASES[case])
+    reference = REFERENCE / f"{case}.in"
+    assert Path(output).read_bytes() == reference.read_bytes()
@@ -119,3 +119,35 @@ def test_SCHISMGrid3D(tmpdir):
 #     with open("wwmbnd_ref.gr3", "r") as f:
 #         wwmbnd_ref_lines = f.readlines()
 #     assert wwmbnd_lines == wwmbnd_ref_lines
+
+
+def test_SCHISMGrid_cache(tmp_path):
+    def make_grid(drag):
+        return SCHISMGrid(
+            hgrid=DataBlob(source=here / "test_data/hgrid.gr3"),
+            drag=drag,
+            cache_dir=tmp_path / "cache",
+        )
+
+    names = ["drag.gr3", "diffmin.gr3", "wwmbnd.gr3", "vgrid.in", "tvd.prop"]
+
+    def cached_files():
+        return sorted(p for p in (tmp_path / "cache").iterdir() if p.is_file())
+
+    make_grid(1).get(tmp_path / "run1")
+    cached = cached_files()
+    assert len(cached) == 9
+    # Parsed mesh used to generate tvd.prop, kept apart from the derived files
+    assert len(list((tmp_path / "cache" / "meshes").glob("hgrid-*.npz"))) == 1
+
+    make_grid(1).get(tmp_path / "run2")
+    assert cached_files() == cached
+    for name in names:
+        run1, run2 = tmp_path / "run1" / name, tmp_path / "run2" / name
+        assert run2.read_bytes() == run1.read_bytes()
+        assert run2.stat().st_nlink == 2
+
+    # Changing a generator parameter only regenerates the affected file
+    make_grid(2).get(tmp_path / "run3")
+    assert len(cached_files()) == 10
+    assert "2.00000000" in (tmp_path / "run3" / "drag.gr3").read_text()
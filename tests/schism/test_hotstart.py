@@ -163,3 +163,30 @@ def test_hotstart_with_time_range(tmp_path, grid3d, hycom_path):
 
     # Verify the output file exists
     assert Path(output_path).exists()
+
+
+def test_hotstart_chunked_plan(tmp_path, grid3d, hycom_path):
+    """Test chunked evaluation and persisted interpolation plans."""
+    import numpy as np
+    import xarray as xr
+
+    kwargs = dict(
+        source=SourceFile(uri=hycom_path),
+        temp_var="temperature",
+        salt_var="salinity",
+        coords={"x": "xlon", "y": "ylat", "t": "time", "z": "depth"},
+    )
+    full = SCHISMDataHotstart(output_filename="full.nc", **kwargs)
+    chunked = SCHISMDataHotstart(
+        output_filename="chunked.nc",
+        chunk_size=100,
+        plan_dir=tmp_path / "plans",
+        **kwargs,
+    )
+    full_path = full.get(tmp_path, grid3d, time=time_range)
+    chunked_path = chunked.get(tmp_path, grid3d, time=time_range)
+    assert len(list((tmp_path / "plans").glob("trilinear-*.npz"))) == 1
+
+    with xr.open_dataset(full_path) as ds0, xr.open_dataset(chunked_path) as ds1:
+        assert not np.isnan(ds1.tr_nd).any()
+        np.testing.assert_allclose(ds0.tr_nd, ds1.tr_nd, rtol=1e-10)
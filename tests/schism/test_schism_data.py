@@ -1,5 +1,7 @@
 import logging
 import os
+import subprocess
+import sys
 from pathlib import Path
 
 import pytest
@@ -13,7 +15,7 @@ pytest.importorskip("rompy.schism")
 import xarray as xr
 
 from rompy.core.data import DataBlob
-from rompy.core.source import SourceFile, SourceIntake
+from rompy.core.source import SOURCE_CACHE, SourceFile, SourceIntake
 from rompy.schism import SCHISMGrid
 from rompy.schism.data import SCHISMDataBoundary, SCHISMDataSflux, SfluxAir
 
@@ -162,3 +164,186 @@ def test_oceandataboundary3d(tmp_path, grid3d, hycom_bnd_temp_3d):
         # assert len(bnd.nOpenBndNodes) == len(boundary_nodes)
 
         assert bnd.time_series.isnull().sum() == 0
+
+
+def test_schismdata_workers(tmp_path, grid2d, grid_atmos_source):
+    from rompy.core.parallel import TaskErrors
+    from rompy.core.time import TimeRange
+    from rompy.schism.data import SCHISMData
+
+    data = SCHISMData(
+        atmos=SCHISMDataSflux(
+            air_1=SfluxAir(
+                source=grid_atmos_source,
+                uwind_name="u10",
+                vwind_name="v10",
+                filter={"sort": {"coords": ["latitude"]}},
+            )
+        ),
+        wave=DataBlob(source=HERE / "test_data" / "missing.nc"),
+        workers=2,
+    )
+    # The failing wave component doesn't stop the atmospheric forcing
+    with pytest.raises(TaskErrors) as excinfo:
+        data.get(
+            tmp_path, grid2d, TimeRange(start="2023-01-01", end="2023-01-02", dt=3600)
+        )
+    assert list(excinfo.value.errors) == ["wave"]
+    assert (tmp_path / "sflux" / "sflux_inputs.txt").exists()
+
+
+
+def test_boundary_conditions_grouped(tmp_path, grid3d, hycom_bnd_temp_3d, monkeypatch):
+    from rompy.core.parallel import run_tasks
+    from rompy.core.time import TimeRange
+    from rompy.schism.data import SCHISMDataBoundaryConditions
+
+    def source(*variables, z="depth"):
+        return SCHISMDataBoundary(
+            source=hycom_bnd_temp_3d.source,
+            variables=list(variables),
+            coords={"t": "time", "y": "ylat", "x": "xlon", "z": z},
+        )
+
+    opened = []
+    open_dataset = SourceFile._open
+
+    def counting_open(self):
+        opened.append(self.uri)
+        return open_dataset(self)
+
+    monkeypatch.setattr(SourceFile, "_open", counting_open)
+    # Count every open, the source cache would reuse the handles of earlier tests
+    monkeypatch.setattr(SOURCE_CACHE, "max_open", 0)
+    time = TimeRange(start="2023-01-01", end="2023-01-02", dt=3600)
+    ntasks, nopen = {}, {}
+    for group_sources in [False, True]:
+        sources = {
+            "elev_boundary_0": (source("surf_el", z=None), "elev2D"),
+            "vel_boundary_0": (source("water_u", "water_v"), "uv3D"),
+            "temp_boundary_0": (source("temperature"), "TEM_3D"),
+            "salt_boundary_0": (source("salinity"), "SAL_3D"),
+        }
+        bc = SCHISMDataBoundaryConditions(group_sources=group_sources)
+        outdir = tmp_path / str(group_sources)
+        outdir.mkdir()
+        opened.clear()
+        tasks = bc._source_tasks(sources, outdir, grid3d, time)
+        files = {}
+        for result in run_tasks(tasks).values():
+            files.update(result)
+        ntasks[group_sources], nopen[group_sources] = len(tasks), len(opened)
+        assert sorted(files) == sorted(sources)
+
+    # The 2D elevation source has no z coordinate so isn't grouped with the others
+    assert ntasks == {False: 4, True: 2}
+    assert nopen[True] == 2 < nopen[False]
+    for name in ["elev2D", "uv3D", "TEM_3D", "SAL_3D"]:
+        grouped = xr.open_dataset(tmp_path / "True" / f"{name}.th.nc")
+        separate = xr.open_dataset(tmp_path / "False" / f"{name}.th.nc")
+        xr.testing.assert_identical(grouped, separate)
+
+
+RSS_SCRIPT = """
+import resource, sys
+from rompy.core.source import SourceFile
+from rompy.schism.data import SfluxAir
+
+def write(src, dest):
+    air = SfluxAir(source=SourceFile(uri=src), uwind_name="u10", vwind_name="v10")
+    air.ds.to_netcdf(dest)
+
+# Warm up on a small file so imports and allocator pools aren't counted
+write(sys.argv[1], sys.argv[3])
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+write(sys.argv[2], sys.argv[3])
+after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print((after - before) * 1024)
+"""
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="ru_maxrss is in kilobytes on linux")
+def test_sflux_air_proxy_memory(tmp_path):
+    """The constant proxy variables don't take memory before they are written."""
+    import numpy as np
+    import pandas as pd
+
+    def wind(shape):
+        return xr.Dataset(
+            {
+                name: (("time", "latitude", "longitude"), np.random.rand(*shape))
+                for name in ["u10", "v10"]
+            },
+            coords={
+                "time": pd.date_range("2023-01-01", periods=shape[0], freq="h"),
+                "latitude": np.linspace(-40, -10, shape[1]),
+                "longitude": np.linspace(140, 180, shape[2]),
+            },
+        )
+
+    wind((2, 30, 40)).to_netcdf(tmp_path / "small.nc")
+    ds = wind((24, 300, 400))
+    ds.to_netcdf(tmp_path / "wind.nc")
+    real_size = ds.u10.nbytes + ds.v10.nbytes
+
+    files = [tmp_path / name for name in ["small.nc", "wind.nc", "air.nc"]]
+    result = subprocess.run(
+        [sys.executable, "-c", RSS_SCRIPT, *files],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    growth = int(result.stdout.split()[-1])
+    # Three dense proxies would take another 1.5 times the size of the winds
+    assert growth < 1.5 * real_size
+    out = xr.open_dataset(tmp_path / "air.nc")
+    assert float(out.prmsl.max()) == float(out.prmsl.min()) == -999
+    assert float(out.spfh.max()) == float(out.spfh.min()) == 0.01
+
+
+@pytest.mark.parametrize("split, sizes", [("day", [24, 24, 1]), (20, [20, 20, 9])])
+def test_sflux_split(tmp_path, split, sizes):
+    import numpy as np
+    import pandas as pd
+
+    times = pd.date_range("2023-01-01", "2023-01-03", freq="h")
+    shape = (times.size, 3, 4)
+    xr.Dataset(
+        {
+            name: (("time", "latitude", "longitude"), np.random.rand(*shape))
+            for name in ["u10", "v10"]
+        },
+        coords={
+            "time": times,
+            "latitude": np.linspace(-40, -38, shape[1]),
+            "longitude": np.linspace(140, 143, shape[2]),
+        },
+    ).to_netcdf(tmp_path / "wind.nc")
+
+    def air(**kwargs):
+        return SfluxAir(
+            id="air_1",
+            source=SourceFile(uri=tmp_path / "wind.nc"),
+            uwind_name="u10",
+            vwind_name="v10",
+            **kwargs,
+        )
+
+    (tmp_path / "single").mkdir()
+    single = xr.open_dataset(air().get(tmp_path / "single"))
+    outfiles = air(split=split, dtype="float32").get(tmp_path)
+    assert [f.name for f in outfiles] == ["air_1.0001.nc", "air_1.0002.nc", "air_1.0003.nc"]
+
+    parts = [xr.open_dataset(f) for f in outfiles]
+    assert [part.time.size for part in parts] == sizes
+    for part in parts:
+        # Each file has its own base date for SCHISM to read the relative times
+        basedate = pd.Timestamp(part.time.values[0])
+        assert list(part.time.attrs["base_date"][:4]) == [
+            basedate.year, basedate.month, basedate.day, basedate.hour
+        ]
+        assert part.time.encoding["units"].startswith(f"days since {basedate:%Y-%m-%d}")
+        assert part.u10.encoding["dtype"] == "float32"
+    for name in ["u10", "prmsl"]:
+        merged = xr.concat([part[name] for part in parts], dim="time")
+        xr.testing.assert_allclose(merged, single[name], rtol=1e-6)
@@ -303,3 +303,60 @@ class TestFactoryFunctions:
         assert configs[0].salt_type == TracerType.EXTERNAL
         assert configs[0].inflow_relax == 0.9
         assert configs[0].outflow_relax == 0.8
+
+
+class TestBctidesTidalExtraction:
+    """Tests for the batched and cached tidal constant extraction."""
+
+    @pytest.fixture
+    def grid(self):
+        from types import SimpleNamespace
+
+        x = np.linspace(150.0, 151.0, 10)
+        y = np.linspace(-30.0, -29.0, 10)
+        return SimpleNamespace(
+            x=x, y=y, nob=2, iobn=[np.array([0, 1, 2]), np.array([5, 6, 7, 8])]
+        )
+
+    @pytest.fixture
+    def calls(self, monkeypatch):
+        calls = []
+
+        def extract(self, lons, lats, constituents, data_type, method):
+            calls.append((len(lons), data_type))
+            ncomp = 2 if data_type == "h" else 4
+            values = np.arange(len(constituents))[None, :, None] + lons[:, None, None]
+            return np.repeat(values, ncomp, axis=-1)
+
+        monkeypatch.setattr(Bctides, "_extract_tidal_data", extract)
+        return calls
+
+    def test_single_extraction_for_all_boundaries(self, grid, calls):
+        bctides = Bctides(grid, flags=[[3, 3, 0, 0], [5, 0, 0, 0]])
+        elev = bctides._boundary_tidal_data(2, "h", 0)
+        vel = bctides._boundary_tidal_data(2, "uv", 1)
+        assert calls == [(7, "h"), (3, "uv")]
+        assert list(elev) == [0, 1] and list(vel) == [0]
+        for ibnd, nodes in enumerate(grid.iobn):
+            assert elev[ibnd].shape == (nodes.size, len(bctides.tnames), 2)
+            np.testing.assert_array_equal(elev[ibnd][:, 0, 0], grid.x[nodes])
+
+    def test_cached_extraction(self, grid, calls, tmp_path):
+        lons, lats = grid.x[:4], grid.y[:4]
+        kwargs = dict(constituents=["m2", "s2", "k1"], tidal_cache_dir=tmp_path)
+        bctides = Bctides(grid, **kwargs)
+        expected = bctides._interpolate_tidal_data(lons, lats, bctides.tnames, "uv")
+        assert len(list(tmp_path.glob("tides-uv-*.npz"))) == 1
+
+        bctides = Bctides(grid, **kwargs)
+        tnames = bctides.tnames[::-1]
+        cached = bctides._interpolate_tidal_data(lons, lats, tnames, "uv")
+        assert len(calls) == 1
+        np.testing.assert_array_equal(cached, expected[:, ::-1, :])
+
+        # Different boundary nodes or settings aren't read from the cache
+        bctides._interpolate_tidal_data(lons + 0.1, lats, tnames, "uv")
+        Bctides(grid, extrapolate_tides=True, **kwargs)._interpolate_tidal_data(
+            lons, lats, tnames, "uv"
+        )
+        assert len(calls) == 3
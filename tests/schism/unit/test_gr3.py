@@ -0,0 +1,191 @@
+"""
+Unit tests for the bulk gr3 reader and writer.
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("rompy.schism")
+
+from pylib import read_schism_hgrid
+
+from rompy.core.cache import FileCache
+from rompy.schism.gr3 import (
+    MESH_CACHE_SUBDIR,
+    Gr3Mesh,
+    load_gr3,
+    load_hgrid,
+    load_hgrid_npz,
+    read_gr3,
+    save_hgrid,
+    write_gr3,
+    write_rows,
+)
+
+MIXED_GR3 = """mixed mesh
+3 5
+1 0.0 0.0 -1.0
+2 1.0 0.0 -2.0
+3 1.0 1.0 -3.0
+4 0.0 1.0 -4.0
+5 2.0 0.5 -5.0
+1 4 1 2 3 4
+2 3 2 5 3
+3 3 5 3 2
+1 = Number of open boundaries
+2 = Total number of open boundary nodes
+2 = Number of nodes for open boundary 1
+1
+4
+1 = Number of land boundaries
+3 = Total number of land boundary nodes
+3 0 = Number of nodes for land boundary 1
+1
+2
+5
+"""
+
+
+@pytest.fixture
+def mixed_gr3(tmp_path):
+    path = tmp_path / "hgrid.gr3"
+    path.write_text(MIXED_GR3)
+    return path
+
+
+def test_read_gr3_matches_pylibs(hgrid_path):
+    mesh = read_gr3(hgrid_path, chunk_size=1000)
+    gd = read_schism_hgrid(str(hgrid_path))
+    assert (mesh.ne, mesh.np) == (gd.ne, gd.np)
+    np.testing.assert_array_equal(mesh.x, gd.x)
+    np.testing.assert_array_equal(mesh.y, gd.y)
+    np.testing.assert_array_equal(mesh.values, gd.dp)
+    np.testing.assert_array_equal(mesh.i34, gd.i34)
+    np.testing.assert_array_equal(mesh.elnode[:, :3], gd.elnode[:, :3])
+    assert len(mesh.open_boundaries) == gd.nob
+    np.testing.assert_array_equal(mesh.open_boundaries[0], gd.iobn[0])
+
+
+def test_read_gr3_mixed_elements(mixed_gr3):
+    mesh = read_gr3(mixed_gr3, chunk_size=2)
+    np.testing.assert_array_equal(mesh.i34, [4, 3, 3])
+    np.testing.assert_array_equal(mesh.elnode[0], [0, 1, 2, 3])
+    np.testing.assert_array_equal(mesh.elnode[1], [1, 4, 2, -1])
+    np.testing.assert_array_equal(mesh.open_boundaries[0], [0, 3])
+    np.testing.assert_array_equal(mesh.land_boundaries[0], [0, 1, 4])
+    assert mesh.land_types == [0]
+
+
+def test_read_gr3_invalid_boundary_node(tmp_path):
+    path = tmp_path / "hgrid.gr3"
+    path.write_text(MIXED_GR3.replace("\n4\n1 = Number of land", "\n6\n1 = Number of land"))
+    with pytest.raises(ValueError):
+        read_gr3(path)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 100])
+def test_write_gr3_roundtrip(mixed_gr3, tmp_path, chunk_size):
+    mesh = read_gr3(mixed_gr3)
+    dest = write_gr3(
+        tmp_path / "out.gr3",
+        mesh,
+        mesh.values,
+        description="mixed mesh",
+        footer="\n",
+        chunk_size=chunk_size,
+    )
+    legacy = ["mixed mesh", "3 5"]
+    legacy += [
+        f"{i+1} {x:.8f} {y:.8f} {v:.8f}"
+        for i, (x, y, v) in enumerate(zip(mesh.x, mesh.y, mesh.values))
+    ]
+    legacy += ["1 4 1 2 3 4", "2 3 2 5 3", "3 3 5 3 2", ""]
+    assert dest.read_text() == "\n".join(legacy) + "\n"
+
+    out = read_gr3(dest)
+    np.testing.assert_array_equal(out.values, mesh.values)
+    np.testing.assert_array_equal(out.elnode, mesh.elnode)
+
+
+def test_write_gr3_constant_value(mixed_gr3, tmp_path):
+    mesh = read_gr3(mixed_gr3)
+    out = read_gr3(write_gr3(tmp_path / "drag.gr3", mesh, 0.0025, chunk_size=2))
+    np.testing.assert_array_equal(out.values, np.full(mesh.np, 0.0025))
+
+
+def test_write_rows_index_only(tmp_path):
+    path = tmp_path / "tvd.prop"
+    with open(path, "w") as f:
+        write_rows(f, "%d 1\n", [], 5, chunk_size=2)
+    assert path.read_text() == "".join(f"{i} 1\n" for i in range(1, 6))
+
+
+def test_load_hgrid_cache(hgrid_path, tmp_path):
+    from rompy.schism import gr3
+
+    gr3._HGRIDS.clear()
+    gd = load_hgrid(hgrid_path, cache_dir=tmp_path)
+    cached = list((tmp_path / MESH_CACHE_SUBDIR).glob("hgrid-*.npz"))
+    assert len(cached) == 1
+
+    # Arrays are shared read-only, attributes can be replaced on each copy
+    other = load_hgrid(hgrid_path)
+    assert other.x is gd.x
+    with pytest.raises(ValueError):
+        gd.x[:] = 0.0
+    gd.x = np.zeros_like(gd.x)
+    assert other.x.any() and load_hgrid(hgrid_path).x.any()
+
+    # The mesh cache is not managed by the derived files cache
+    FileCache(tmp_path, max_size=0).evict()
+    assert cached[0].is_file()
+
+    gr3._HGRIDS.clear()
+    loaded = load_hgrid(hgrid_path, cache_dir=tmp_path)
+    expected = load_hgrid_npz(cached[0])
+    for name, value in vars(expected).items():
+        if isinstance(value, np.ndarray) and value.dtype != object:
+            np.testing.assert_array_equal(getattr(loaded, name), value)
+    for name in ["ne", "np", "ns", "nob", "nlb"]:
+        assert getattr(loaded, name) == getattr(gd, name)
+    np.testing.assert_array_equal(loaded.isidenode, gd.isidenode)
+    np.testing.assert_array_equal(loaded.iobn[0], gd.iobn[0])
+    for lbn, ref in zip(loaded.ilbn, gd.ilbn):
+        np.testing.assert_array_equal(lbn, ref)
+    np.testing.assert_array_equal(loaded.bndinfo.sind, gd.bndinfo.sind)
+
+
+def test_save_hgrid_roundtrip(hgrid_path, tmp_path):
+    gd = load_hgrid(hgrid_path)
+    mesh = Gr3Mesh.from_hgrid(load_hgrid_npz(save_hgrid(gd, tmp_path / "m.npz")))
+    np.testing.assert_array_equal(mesh.elnode, read_gr3(hgrid_path).elnode)
+    assert len(mesh.land_boundaries) == gd.nlb
+
+
+def test_save_hgrid_non_array_attributes(hgrid_path, tmp_path):
+    gd = load_hgrid(hgrid_path)
+    gd.source_file = str(hgrid_path)
+    gd.names = ["open", "land"]
+    gd.nodes = [[1, 2, 3], [4, 5]]
+    gd.unset = None
+    loaded = load_hgrid_npz(save_hgrid(gd, tmp_path / "m.npz"))
+    assert loaded.source_file == str(hgrid_path)
+    assert loaded.names == ["open", "land"]
+    assert [n.tolist() for n in loaded.nodes] == [[1, 2, 3], [4, 5]]
+    assert loaded.unset is None
+    assert set(vars(loaded)) == set(vars(gd))
+
+
+def test_save_hgrid_unsupported_attribute(hgrid_path, tmp_path):
+    gd = load_hgrid(hgrid_path)
+    gd.options = {"a": 1}
+    with pytest.raises(TypeError):
+        save_hgrid(gd, tmp_path / "m.npz")
+    assert not (tmp_path / "m.npz").exists()
+
+
+def test_load_gr3_shared(hgrid_path):
+    mesh = load_gr3(hgrid_path)
+    assert load_gr3(hgrid_path).x is mesh.x
+    assert not mesh.elnode.flags.writeable
+    np.testing.assert_array_equal(mesh.elnode, read_gr3(hgrid_path).elnode)
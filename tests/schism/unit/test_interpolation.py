@@ -0,0 +1,171 @@
+"""
+Unit tests for the vectorised SCHISM interpolation helpers.
+"""
+
+import time
+
+import numpy as np
+import pytest
+from scipy.interpolate import interp1d
+
+from rompy.schism.interpolation import (
+    TrilinearPlan,
+    VerticalRemap,
+    boundary_zcor,
+    trilinear_plan,
+)
+
+
+def loop_boundary_zcor(depths, sigma, ztot):
+    """Reference per-node implementation of the boundary zcor table."""
+    all_zcors = []
+    for depth in depths:
+        if ztot.size > 0 and depth > ztot[0]:
+            applicable_z = ztot[(ztot > ztot[0]) & (ztot < depth)]
+            all_zcors.append(np.r_[ztot[0] * sigma, applicable_z])
+        else:
+            all_zcors.append(depth * sigma)
+    nvrt = np.array([z.size for z in all_zcors])
+    zcor = np.zeros((len(depths), nvrt.max()))
+    for i, node_zcor in enumerate(all_zcors):
+        zcor[i, : nvrt[i]] = node_zcor
+    return zcor, nvrt
+
+
+def loop_vertical_remap(data, src_z, zcor, nvrt):
+    """Reference per-profile implementation using scipy interp1d."""
+    ntime, nnodes, _, ncomp = data.shape
+    out = np.zeros((ntime, nnodes, zcor.shape[1], ncomp))
+    for t in range(ntime):
+        for n in range(nnodes):
+            for c in range(ncomp):
+                interp = interp1d(
+                    src_z,
+                    data[t, n, :, c],
+                    kind="linear",
+                    bounds_error=False,
+                    fill_value="extrapolate",
+                )
+                out[t, n, : nvrt[n], c] = interp(zcor[n, : nvrt[n]])
+    return out
+
+
+def synthetic_boundary(nnodes, nlevels, ntime, ncomp, seed=42):
+    rng = np.random.default_rng(seed)
+    src_z = np.r_[0.0, np.cumsum(rng.uniform(1.0, 100.0, nlevels - 1))]
+    depths = rng.uniform(-5.0, 1.2 * src_z[-1], nnodes)
+    sigma = np.linspace(-1.0, 0.0, 20)
+    ztot = -np.sort(rng.uniform(100.0, src_z[-1], 8))[::-1]
+    data = rng.normal(size=(ntime, nnodes, nlevels, ncomp))
+    return src_z, depths, sigma, ztot, data
+
+
+@pytest.mark.parametrize("ztot", [np.array([]), np.array([-50.0, -30.0, -20.0])])
+def test_boundary_zcor(ztot):
+    depths = np.array([-1.0, 0.0, 5.0, 25.0, 60.0, 300.0])
+    sigma = np.linspace(-1.0, 0.0, 5)
+    zcor, nvrt = boundary_zcor(depths, sigma, ztot)
+    zcor_ref, nvrt_ref = loop_boundary_zcor(depths, sigma, ztot)
+    np.testing.assert_array_equal(nvrt, nvrt_ref)
+    np.testing.assert_array_equal(zcor, zcor_ref)
+
+
+def test_boundary_zcor_depth_dependent_levels():
+    ztot = np.array([10.0, 20.0, 30.0])
+    zcor, nvrt = boundary_zcor(np.array([5.0, 25.0, 40.0]), np.array([-1.0, 0.0]), ztot)
+    np.testing.assert_array_equal(nvrt, [2, 3, 4])
+    np.testing.assert_array_equal(zcor[1], [-10.0, 0.0, 20.0, 0.0])
+    np.testing.assert_array_equal(zcor[2], [-10.0, 0.0, 20.0, 30.0])
+
+
+@pytest.mark.parametrize("ncomp", [1, 2])
+def test_vertical_remap_matches_interp1d(ncomp):
+    src_z, depths, sigma, ztot, data = synthetic_boundary(30, 12, 5, ncomp)
+    zcor, nvrt = boundary_zcor(depths, sigma, ztot)
+    remap = VerticalRemap(src_z, zcor, nvrt)
+    out = remap(data, chunk_size=2)
+    expected = loop_vertical_remap(data, src_z, zcor, nvrt)
+    np.testing.assert_allclose(out, expected, rtol=1e-10, atol=1e-10)
+
+
+def test_vertical_remap_unsorted_source_levels():
+    src_z, depths, sigma, ztot, data = synthetic_boundary(10, 8, 3, 1)
+    order = np.random.default_rng(0).permutation(src_z.size)
+    zcor, nvrt = boundary_zcor(depths, sigma, ztot)
+    out = VerticalRemap(src_z[order], zcor, nvrt)(data[:, :, order, :])
+    expected = VerticalRemap(src_z, zcor, nvrt)(data)
+    np.testing.assert_allclose(out, expected)
+
+
+def test_vertical_remap_node_mismatch():
+    remap = VerticalRemap(np.array([0.0, 1.0]), np.zeros((4, 3)))
+    with pytest.raises(ValueError):
+        remap(np.zeros((2, 5, 2, 1)))
+
+
+@pytest.mark.skipif(
+    "not config.getoption('--run-slow')",
+    reason="Only run when --run-slow is given",
+)
+def test_vertical_remap_benchmark():
+    """Benchmark against the interp1d loop on 5k nodes x 40 levels x 720 steps.
+
+    The loop cost is linear in the number of time steps so it is timed on a subset
+    of the steps and scaled up to the full boundary.
+
+    """
+    nnodes, nlevels, ntime, nloop = 5000, 40, 720, 2
+    src_z, depths, sigma, ztot, data = synthetic_boundary(nnodes, nlevels, ntime, 1)
+
+    t0 = time.perf_counter()
+    zcor, nvrt = boundary_zcor(depths, sigma, ztot)
+    remap = VerticalRemap(src_z, zcor, nvrt)
+    out = remap(data)
+    elapsed = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    zcor_ref, nvrt_ref = loop_boundary_zcor(depths, sigma, ztot)
+    expected = loop_vertical_remap(data[:nloop], src_z, zcor_ref, nvrt_ref)
+    elapsed_loop = (time.perf_counter() - t0) * ntime / nloop
+
+    np.testing.assert_allclose(out[:nloop], expected, rtol=1e-10, atol=1e-10)
+    print(
+        f"\nVertical remap {nnodes} nodes x {nlevels} levels x {ntime} steps: "
+        f"vectorised {elapsed:.2f}s, interp1d loop ~{elapsed_loop:.0f}s "
+        f"(x{elapsed_loop / elapsed:.0f})"
+    )
+    assert elapsed < elapsed_loop
+
+
+def test_trilinear_plan_linear_field(tmp_path):
+    """Trilinear interpolation reproduces a linear field on any axis ordering."""
+    sx = np.linspace(150.0, 155.0, 11)[::-1]
+    sy = np.linspace(-30.0, -20.0, 21)
+    sz = np.array([0.0, 5.0, 10.0, 50.0, 100.0])
+    z, y, x = np.meshgrid(sz, sy, sx, indexing="ij")
+    cv = 2.0 * x - 3.0 * y + 0.5 * z
+
+    rng = np.random.default_rng(0)
+    lx = rng.uniform(150.0, 155.0, 50)
+    ly = rng.uniform(-30.0, -20.0, 50)
+    lz = rng.uniform(0.0, 100.0, (4, 50))
+    plan = TrilinearPlan.build(lx, ly, lz, sx, sy, sz)
+    assert plan.shape == (4, 50)
+
+    out = np.concatenate(
+        [plan.interpolate(plan.corners(cv, nodes), nodes) for nodes in plan.chunks(7)],
+        axis=1,
+    )
+    np.testing.assert_allclose(out, 2.0 * lx - 3.0 * ly + 0.5 * lz)
+
+    loaded = TrilinearPlan.load(plan.save(tmp_path / "plan.npz"))
+    for name in TrilinearPlan.fields:
+        np.testing.assert_array_equal(getattr(loaded, name), getattr(plan, name))
+
+
+def test_trilinear_plan_cache(tmp_path):
+    args = (np.array([0.5]), np.array([0.5]), np.array([[0.5]]))
+    grid = (np.array([0.0, 1.0]), np.array([0.0, 1.0]), np.array([0.0, 1.0]))
+    plan = trilinear_plan(*args, *grid, cache_dir=tmp_path)
+    assert trilinear_plan(*args, *grid) is plan
+    assert len(list(tmp_path.glob("trilinear-*.npz"))) == 1
@@ -87,3 +87,57 @@ def test_grid_minmax(grid):
 def test_equivalence(regulargrid, grid):
     assert np.array_equal(regulargrid.x, grid.x)
     assert np.array_equal(regulargrid.y, grid.y)
+
+
+def test_regulargrid_cached_coordinates(regulargrid):
+    assert regulargrid.x is regulargrid.x
+    assert not regulargrid.x.flags.writeable
+    x = regulargrid.x
+    regulargrid.dx = 2
+    assert regulargrid.x is not x
+    assert regulargrid.x[0, -1] == 18
+
+
+@pytest.mark.parametrize("rot", [0, 20, -135])
+def test_regulargrid_analytic_extent(rot):
+    grid = RegularGrid(x0=110, y0=-30, dx=0.5, dy=0.3, nx=15, ny=10, rot=rot)
+    x, y = grid._gen_reg_cgrid()
+    assert grid.bbox(buffer=0.1) == pytest.approx(
+        [x.min() - 0.1, y.min() - 0.1, x.max() + 0.1, y.max() + 0.1]
+    )
+    hull = BaseGrid._get_convex_hull(grid)
+    assert grid.boundary().equals(hull)
+    assert np.allclose(grid.boundary().exterior.coords, hull.exterior.coords)
+
+
+@pytest.mark.skipif(
+    "not config.getoption('--run-slow')",
+    reason="Only run when --run-slow is given",
+)
+def test_regulargrid_benchmark():
+    """Benchmark bbox, boundary and coordinate access on a 2000x2000 grid."""
+    import time
+
+    grid = RegularGrid(x0=110, y0=-30, dx=0.01, dy=0.01, nx=2000, ny=2000, rot=20)
+
+    t0 = time.perf_counter()
+    bbox = grid.bbox()
+    grid.boundary()
+    for _ in range(4):
+        grid.x, grid.y
+    elapsed = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    minx, maxx = [f(grid._gen_reg_cgrid()[0]) for f in (np.nanmin, np.nanmax)]
+    miny, maxy = [f(grid._gen_reg_cgrid()[1]) for f in (np.nanmin, np.nanmax)]
+    BaseGrid._get_convex_hull(grid)
+    for _ in range(4):
+        grid._gen_reg_cgrid(), grid._gen_reg_cgrid()
+    elapsed_uncached = time.perf_counter() - t0
+
+    assert bbox == pytest.approx([minx, miny, maxx, maxy])
+    print(
+        f"\nRegularGrid 2000x2000: cached {elapsed:.2f}s, "
+        f"uncached {elapsed_uncached:.2f}s (x{elapsed_uncached / elapsed:.0f})"
+    )
+    assert elapsed < elapsed_uncached
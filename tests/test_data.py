@@ -142,6 +142,34 @@ def test_source_file():
     assert isinstance(source.open(), xr.Dataset)
 
 
+def test_source_open_cached(monkeypatch, nc_data_source, grid):
+    calls = []
+    open_dataset = xr.open_dataset
+
+    def counting_open_dataset(*args, **kwargs):
+        calls.append(args)
+        return open_dataset(*args, **kwargs)
+
+    monkeypatch.setattr(xr, "open_dataset", counting_open_dataset)
+    nc_data_source._filter_grid(grid)
+    ds = nc_data_source.ds
+    # Adding variables to the returned dataset doesn't alter the cached one
+    ds["new"] = ds["data"] * 2
+    assert "new" not in nc_data_source.ds
+    assert nc_data_source.ds.latitude.size == 4
+    nc_data_source.source.open()
+    assert len(calls) == 1
+
+
+def test_source_open_reopens_changed_file(tmp_path):
+    source = rompy.core.source.SourceFile(uri=tmp_path / "test.nc")
+    xr.Dataset({"a": ("x", [1.0, 2.0])}).to_netcdf(tmp_path / "test.nc")
+    assert source.open().a.values.tolist() == [1.0, 2.0]
+    xr.Dataset({"a": ("x", [3.0, 4.0, 5.0])}).to_netcdf(tmp_path / "new.nc")
+    os.replace(tmp_path / "new.nc", tmp_path / "test.nc")
+    assert source.open().a.values.tolist() == [3.0, 4.0, 5.0]
+
+
 def test_source_csv():
     source = rompy.core.source.SourceTimeseriesCSV(filename=HERE / "data" / "wind.csv")
     assert isinstance(source.open(), xr.Dataset)
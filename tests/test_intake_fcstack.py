@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+pytest.importorskip("intake")
+
+from rompy.intake import NetCDFFCStackSource
+
+CYCLES = ["20230101T00", "20230101T12", "20230102T00"]
+
+
+@pytest.fixture
+def fcstack(tmp_path):
+    for cycle in CYCLES:
+        init = pd.Timestamp(cycle)
+        ds = xr.Dataset(
+            {"hs": (("time", "site"), np.full((25, 3), init.day * 100 + init.hour))},
+            coords={"time": pd.date_range(init, periods=25, freq="h")},
+        )
+        outdir = tmp_path / cycle[:8] / cycle[-2:]
+        outdir.mkdir(parents=True)
+        ds.to_netcdf(outdir / f"ww3.{cycle}.nc")
+    return dict(
+        urlpath=str(tmp_path) + "/{fcdate}/{hr}",
+        fn_fmt="ww3.{fcdate}T{hr}.nc",
+        fmt_fields={"fcdate": ["20230101", "20230102"], "hr": ["00", "12"]},
+    )
+
+
+def test_fcstack(fcstack):
+    ds = NetCDFFCStackSource(**fcstack).to_dask()
+    assert ds.hs.dims == ("init", "lead", "site")
+    np.testing.assert_array_equal(ds.init, pd.to_datetime(CYCLES))
+    assert ds.lead.values.tolist() == list(range(25))
+    assert ds.time.isel(init=1, lead=2).values == np.datetime64("2023-01-01T14")
+    assert float(ds.hs.isel(init=2, lead=0, site=0)) == 200
+
+
+def test_fcstack_filters(fcstack):
+    filters = {"rename": {"hs": "swh"}}
+    ds = NetCDFFCStackSource(**fcstack, ds_filters=filters).to_dask()
+    assert list(ds.data_vars) == ["swh"]
+
+
+def test_fcstack_hindcast(fcstack):
+    ds = NetCDFFCStackSource(**fcstack, hindcast=True).to_dask()
+    assert set(ds.hs.dims) == {"time", "site"}
+    times = pd.date_range("2023-01-01T00", "2023-01-03T00", freq="h")
+    np.testing.assert_array_equal(ds.time, times)
+    hs = ds.hs.isel(site=0).to_series()
+    assert hs["2023-01-01T11"] == 100
+    assert hs["2023-01-01T12"] == 112
+    assert hs["2023-01-03T00"] == 200
+
+
+def test_fcstack_no_cycles(fcstack):
+    fcstack["fmt_fields"] = {"fcdate": ["20240101"], "hr": ["00"]}
+    with pytest.raises(ValueError):
+        NetCDFFCStackSource(**fcstack).to_dask()
@@ -156,6 +156,35 @@ def test_boundspecsegmentxy_from_sides(tmp_path, time, grid):
     bnd.get(destdir=tmp_path, grid=grid, time=time)
 
 
+@pytest.mark.parametrize("file_type", ["tpar", "spec2d"])
+def test_boundspecsegmentxy_segment_files(tmp_path, time, grid, file_type):
+    bnd = BoundspecSegmentXY(
+        id="westaus",
+        source=SourceFile(
+            uri=HERE / "data/aus-20230101.nc",
+            kwargs=dict(engine="netcdf4"),
+        ),
+        sel_method="idw",
+        sel_method_kwargs={"tolerance": 3.0},
+        location={"model_type": "side", "side": "west"},
+        file_type=file_type,
+    )
+    filenames, cmd = bnd.get(destdir=tmp_path, grid=grid, time=time)
+    xbnd, ybnd = bnd._boundary_points(grid=grid)
+    assert len(filenames) == len(xbnd) - 1
+    assert cmd.count("BOUNDSPEC") == len(filenames)
+    ds = bnd._sel_boundary(grid).sortby("dir")
+    ds_seg = ds.isel(site=slice(0, 2)).mean("site")
+    if file_type == "tpar":
+        lines = filenames[0].read_text().splitlines()
+        assert lines[0] == "TPAR"
+        assert len(lines) == ds.time.size + 1
+        hs = float(ds_seg.spec.hs().isel(time=0))
+        assert lines[1].split()[1] == f"{hs:0.2f}"
+    else:
+        assert read_swan(filenames[0]).time.size == ds.time.size
+
+
 def test_source_wavespectra_ploting(tmp_path):
     Boundnest1(
         id="westaus",
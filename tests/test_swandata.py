@@ -88,3 +88,178 @@ def test_swandata_write(tmp_path, nc_data_source):
 
 def test_bathy_write(tmp_path, nc_bathy):
     nc_bathy.get(tmp_path)
+
+
+def savetxt_inpgrid(ds, output_file, z1, z2=None, fmt="%.2f"):
+    """Time step by time step writer the block writer must reproduce."""
+    with open(output_file, "wt") as f:
+        for ti, windtime in enumerate(ds.time.values):
+            f.write(f"{pd.to_datetime(windtime).strftime('%Y%m%d.%H%M%S')}\n")
+            for z in [z1, z2] if z2 else [z1]:
+                np.savetxt(f, np.squeeze(ds[z].isel(time=ti).values), fmt=fmt)
+
+
+def savetxt_bottom(ds, output_file, z, fmt="%4.2f"):
+    with open(output_file, "w") as stream:
+        for t in ds.time:
+            data = ds[z].sel(time=t).fillna(-99.0).values
+            np.savetxt(fname=stream, X=data, fmt=fmt, delimiter="\t")
+
+
+@pytest.fixture
+def wind_ds():
+    shape = (7, 5, 6)
+    u10 = np.random.randn(*shape).astype("float32") * 10
+    u10[0, 1, 2] = np.nan
+    return xr.Dataset(
+        {
+            "u10": (("time", "lat", "lon"), u10),
+            "v10": (("time", "lat", "lon"), np.random.randn(*shape) * 10),
+        },
+        coords={
+            "time": pd.date_range("2000-01-01", periods=shape[0], freq="h"),
+            "lat": np.arange(shape[1]),
+            "lon": np.arange(shape[2]),
+        },
+    )
+
+
+@pytest.mark.parametrize("block_size", [1, 70, 10_000])
+@pytest.mark.parametrize("workers", [1, 2])
+def test_to_inpgrid_matches_savetxt(tmp_path, monkeypatch, wind_ds, block_size, workers):
+    from rompy.swan import data
+
+    monkeypatch.setattr(data, "BLOCK_SIZE", block_size)
+    wind_ds.swan.to_inpgrid(
+        tmp_path / "wind.grd", z1="u10", z2="v10", x="lon", y="lat", workers=workers
+    )
+    savetxt_inpgrid(wind_ds, tmp_path / "ref.grd", "u10", "v10")
+    assert (tmp_path / "wind.grd").read_text() == (tmp_path / "ref.grd").read_text()
+
+
+def test_to_inpgrid_squeezes_single_row(tmp_path, wind_ds):
+    ds = wind_ds.isel(lat=[0])
+    ds.swan.to_inpgrid(tmp_path / "wind.grd", z1="u10", x="lon", y="lat")
+    savetxt_inpgrid(ds, tmp_path / "ref.grd", "u10")
+    assert (tmp_path / "wind.grd").read_text() == (tmp_path / "ref.grd").read_text()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_dset_to_swan_matches_savetxt(tmp_path, monkeypatch, wind_ds, workers):
+    from rompy.swan import data
+
+    monkeypatch.setattr(data, "BLOCK_SIZE", 50)
+    data.dset_to_swan(wind_ds, tmp_path / "u10.grd", ["u10"], workers=workers)
+    savetxt_bottom(wind_ds, tmp_path / "ref.grd", "u10")
+    assert (tmp_path / "u10.grd").read_text() == (tmp_path / "ref.grd").read_text()
+
+
+@pytest.mark.parametrize(
+    "fmt, values",
+    [
+        ("%08.2f", [[1.5, -0.2], [12.3, 7.0]]),
+        ("%-8.2f", [[1.5, -0.2], [12.3, 7.0]]),
+        ("%+6.1f", [[1.5, -0.2], [12.3, 7.0]]),
+        ("%.3f", [[999999999999.999, 99.9999], [9.9996, -999.9999]]),
+        ("%4.2f", [[0.0, -0.0], [99.995001, 1e-9]]),
+    ],
+)
+def test_format_slabs_matches_savetxt(fmt, values):
+    from io import StringIO
+
+    from rompy.swan.data import format_slabs
+
+    arrays = [np.array(values), -np.array(values)]
+    stream = StringIO()
+    for array in arrays:
+        np.savetxt(stream, array, fmt=fmt, delimiter=" ")
+    assert format_slabs(fmt, [a[None] for a in arrays]) == stream.getvalue()
+
+
+def read_unformatted(filename):
+    """Read sequential unformatted Fortran records of float32 values."""
+    buffer = np.fromfile(filename, dtype="<i4")
+    records, i = [], 0
+    while i < buffer.size:
+        nbytes = buffer[i]
+        records.append(buffer[i + 1 : i + 1 + nbytes // 4].view("<f4"))
+        assert buffer[i + 1 + nbytes // 4] == nbytes
+        i += nbytes // 4 + 2
+    return records
+
+
+def test_to_inpgrid_unformatted(tmp_path, wind_ds):
+    inpgrid, readinp = wind_ds.swan.to_inpgrid(
+        tmp_path / "wind.bin",
+        z1="u10",
+        z2="v10",
+        x="lon",
+        y="lat",
+        format="unformatted",
+    )
+    assert readinp.endswith("'wind.bin' 4 0 0 0 UNFORMATTED")
+    records = read_unformatted(tmp_path / "wind.bin")
+    assert len(records) == 2 * wind_ds.time.size
+    for ti in range(wind_ds.time.size):
+        for i, z in enumerate(["u10", "v10"]):
+            expected = wind_ds[z].isel(time=ti).values.astype("float32").ravel()
+            np.testing.assert_array_equal(records[2 * ti + i], expected)
+
+
+def test_to_bottom_grid_unformatted(tmp_path, wind_ds):
+    ds = wind_ds.isel(time=0, drop=True)
+    inpgrid, readinp = ds.swan.to_bottom_grid(
+        tmp_path / "bottom.bin", x="lon", y="lat", z="u10", format="unformatted"
+    )
+    assert readinp.endswith("'bottom.bin' 4 UNFORMATTED")
+    records = read_unformatted(tmp_path / "bottom.bin")
+    expected = ds["u10"].fillna(-99.0).values.astype("float32").ravel()
+    assert len(records) == 1
+    np.testing.assert_array_equal(records[0], expected)
+
+
+def test_swandata_write_unformatted(tmp_path, nc_data_source):
+    swangrid = SwanGrid(x0=0, y0=0, dx=1, dy=1, nx=10, ny=10)
+    config = nc_data_source.get(tmp_path, swangrid, format="unformatted")
+    assert "READINP WIND 1.0 'wind.bin' 4 0 0 0 UNFORMATTED" in config
+    assert len(read_unformatted(tmp_path / "wind.bin")) == 20
+
+
+@pytest.fixture
+def wave_ds():
+    shape = (6, 11, 11)
+    hs = np.random.rand(*shape) * 3
+    hs[:, 0, 0] = np.nan
+    return xr.Dataset(
+        {
+            "sig_wav_ht": (("time", "lat", "lon"), hs),
+            "pk_wav_per": (("time", "lat", "lon"), np.random.rand(*shape) * 15),
+            "pk_wav_dir": (("time", "lat", "lon"), np.random.rand(*shape) * 360),
+        },
+        coords={
+            "time": pd.date_range("2000-01-01", periods=shape[0], freq="3h"),
+            "lat": np.arange(shape[1], dtype="float64"),
+            "lon": np.arange(shape[2], dtype="float64"),
+        },
+    )
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_to_tpar_boundary(tmp_path, wave_ds, workers):
+    from shapely.geometry import Polygon
+
+    boundary = Polygon([(0, 0), (10, 0), (10, 10), (0, 10)])
+    bound_string = wave_ds.swan.to_tpar_boundary(
+        tmp_path, boundary, interval=2.0, workers=workers
+    )
+    # The last point at the corner (0, 0) is all nan and is skipped
+    assert bound_string.count(".TPAR") == 18
+    assert len(list(tmp_path.glob("*.TPAR"))) == 18
+    lines = (tmp_path / "0.TPAR").read_text().splitlines()
+    assert lines[0] == "TPAR"
+    assert len(lines) == wave_ds.time.size + 1
+    t0 = wave_ds.sel(lon=2.0, lat=0.0).isel(time=0)
+    assert lines[1] == (
+        f"20000101.000000 {float(t0.sig_wav_ht):0.2f} {float(t0.pk_wav_per):0.2f} "
+        f"{float(t0.pk_wav_dir):0.1f} 20.00"
+    )
@@ -83,3 +83,160 @@ def test_grid_from_component(grid):
     )
     grid2 = SwanGrid.from_component(regular_grid_component)
     assert grid == grid2
+
+
+def spectra_sites(nsites, seed=0):
+    import xarray as xr
+
+    rng = np.random.default_rng(seed)
+    lon = rng.uniform(-1, 10, nsites)
+    lat = rng.uniform(-1, 10, nsites)
+    return xr.Dataset(
+        {"efth": (("site", "freq", "dir"), rng.random((nsites, 3, 4)))},
+        coords={
+            "site": np.arange(nsites),
+            "lon": ("site", lon),
+            "lat": ("site", lat),
+            "freq": [0.05, 0.1, 0.2],
+            "dir": [0, 90, 180, 270],
+        },
+    )
+
+
+def loop_nearby_sites(grid, lon, lat, dist_thres):
+    """Site indices and projected positions from the original per-segment loop."""
+    bx, by = grid.boundary_points()
+    inds, xs, ys = [], [], []
+    for i in range(bx.size - 1):
+        p1, p2 = (bx[i], by[i]), (bx[i + 1], by[i + 1])
+        a = p2[1] - p1[1]
+        b = -1.0 * (p2[0] - p1[0])
+        c = p2[0] * p1[1] - p2[1] * p1[0]
+        for ind, p3 in enumerate(zip(lon, lat)):
+            dist = abs(a * p3[0] + b * p3[1] + c) / np.sqrt(a**2 + b**2)
+            if dist < dist_thres:
+                inds.append(ind)
+                xs.append((b * (b * p3[0] - a * p3[1]) - a * c) / (a**2 + b**2))
+                ys.append((a * (-b * p3[0] + a * p3[1]) - b * c) / (a**2 + b**2))
+    return np.array(inds), np.array(xs), np.array(ys)
+
+
+def inside_bbox(grid, ds, buffer):
+    x0, y0, x1, y1 = grid.bbox(buffer=buffer)
+    inside = (ds.lon > x0) & (ds.lon < x1) & (ds.lat > y0) & (ds.lat < y1)
+    return ds.isel(site=np.flatnonzero(inside.values))
+
+
+def test_boundary_points_spacing(grid):
+    polygon = grid.boundary()
+    xbnd, ybnd = grid.boundary_points(spacing=0.7)
+    points = [polygon.boundary.interpolate(i * 0.7) for i in range(xbnd.size)]
+    assert xbnd == pytest.approx([p.x for p in points])
+    assert ybnd == pytest.approx([p.y for p in points])
+
+
+def test_nearby_spectra(grid):
+    ds = spectra_sites(500)
+    ds_boundary = grid.nearby_spectra(ds, dist_thres=0.3, plot=False)
+    ds_inside = inside_bbox(grid, ds, 0.3)
+    inds, xs, ys = loop_nearby_sites(
+        grid, ds_inside.lon.values, ds_inside.lat.values, 0.3
+    )
+    assert ds_boundary.site.values == pytest.approx(ds_inside.site.values[inds])
+    assert ds_boundary.lon.values == pytest.approx(xs)
+    assert ds_boundary.lat.values == pytest.approx(ys)
+    assert ds_boundary.lon_original.values == pytest.approx(
+        ds_inside.lon.values[inds]
+    )
+
+
+@pytest.mark.skipif(
+    "not config.getoption('--run-slow')",
+    reason="Only run when --run-slow is given",
+)
+def test_nearby_spectra_benchmark():
+    """Benchmark against the per-segment loop with 10k spectral sites."""
+    import time
+
+    grid = SwanGrid(x0=0, y0=0, nx=50, ny=50, dx=0.18, dy=0.18)
+    ds = spectra_sites(10_000)
+
+    t0 = time.perf_counter()
+    ds_boundary = grid.nearby_spectra(ds, dist_thres=0.05, plot=False)
+    elapsed = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    ds_inside = inside_bbox(grid, ds, 0.05)
+    lon, lat = ds_inside.lon.values, ds_inside.lat.values
+    inds, xs, ys = loop_nearby_sites(grid, lon, lat, 0.05)
+    elapsed_loop = time.perf_counter() - t0
+
+    assert ds_boundary.site.size == inds.size
+    print(
+        f"\nnearby_spectra 10k sites: vectorised {elapsed:.3f}s, "
+        f"loop {elapsed_loop:.2f}s (x{elapsed_loop / elapsed:.0f})"
+    )
+    assert elapsed < elapsed_loop
+
+
+RGF = """\
+* Deltares, RGFGRID Version 4.16.01
+Coordinate System = Spherical
+Missing Value = -999.000
+       4       3
+ 0 0 0
+ ETA=    1   1.00000000000000000E+02   1.00100000000000000E+02
+             1.00200000000000000E+02   1.00300000000000000E+02
+ ETA=    2   1.00000000000000000E+02   1.00100000000000000E+02
+             1.00200000000000000E+02  -9.99000000000000000E+02
+ ETA=    3   1.00000000000000000E+02   1.00100000000000000E+02
+             1.00200000000000000E+02   1.00300000000000000E+02
+ ETA=    1  -3.00000000000000000E+01  -3.00000000000000000E+01
+            -3.00000000000000000E+01  -3.00000000000000000E+01
+ ETA=    2  -2.99000000000000000E+01  -2.99000000000000000E+01
+            -2.99000000000000000E+01  -9.99000000000000000E+02
+ ETA=    3  -2.98000000000000000E+01  -2.98000000000000000E+01
+            -2.98000000000000000E+01  -2.98000000000000000E+01
+"""
+
+
+def test_read_curvilinear_grid(tmp_path):
+    from rompy.swan.grid import read_curvilinear_grid
+
+    gridfile = tmp_path / "grid.grd"
+    gridfile.write_text(RGF)
+    x, y = read_curvilinear_grid(gridfile)
+    assert x.shape == y.shape == (3, 4)
+    assert x[0] == pytest.approx([100.0, 100.1, 100.2, 100.3])
+    assert y[:, 0] == pytest.approx([-30.0, -29.9, -29.8])
+    assert np.isnan(x[1, 3]) and np.isnan(y[1, 3])
+    assert not x.flags.writeable
+    assert (tmp_path / "grid.grd.npz").is_file()
+    # Loaded from the sidecar in a new process
+    from rompy.swan.grid import _read_curvilinear_grid
+
+    _read_curvilinear_grid.cache_clear()
+    x2, y2 = read_curvilinear_grid(gridfile)
+    np.testing.assert_array_equal(x, x2)
+    np.testing.assert_array_equal(y, y2)
+
+
+def test_read_curvilinear_grid_coordinate_blocks(tmp_path):
+    from rompy.swan.grid import read_curvilinear_grid
+
+    gridfile = tmp_path / "grid.txt"
+    gridfile.write_text("x-coordinates\n1 2 3\n1 2 3\ny-coordinates\n5 5 5\n6 6 6\n")
+    x, y = read_curvilinear_grid(gridfile, sidecar=False)
+    np.testing.assert_array_equal(x, [[1, 2, 3], [1, 2, 3]])
+    np.testing.assert_array_equal(y, [[5, 5, 5], [6, 6, 6]])
+    assert not (tmp_path / "grid.txt.npz").exists()
+
+
+def test_swangrid_curvilinear(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "grid.grd").write_text(RGF)
+    grid = SwanGrid(
+        grid_type="CURV", gridfile="grid.grd", x0=0, y0=0, dx=1, dy=1, nx=4, ny=3
+    )
+    assert grid.x.shape == (3, 4)
+    assert grid.bbox() == pytest.approx([100.0, -30.0, 100.3, -29.8])